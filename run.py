@@ -21,7 +21,31 @@ if os.path.exists(venv_path):
 # Agregar el directorio src al path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from main import main
-
 if __name__ == "__main__":
+    # Modo batch sin interfaz: python run.py batch --input-dir logos/ --output out/
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        from src.batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+    
+    # Benchmarks del motor: python run.py benchmark run --output base.json
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark':
+        from src.benchmark import main as benchmark_main
+        sys.exit(benchmark_main(sys.argv[2:]))
+    
+    # Simulación del plan de render: python run.py plan logo.png --bg-color "#FFFFFF"
+    if len(sys.argv) > 1 and sys.argv[1] == 'plan':
+        from src.render_plan import main as plan_main
+        sys.exit(plan_main(sys.argv[2:]))
+    
+    # Servidor residente: python run.py serve --port 8765 --socket /tmp/icons.sock
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from src.server import main as serve_main
+        sys.exit(serve_main(sys.argv[2:]))
+    
+    # Autocomprobación de salida reproducible: python run.py verify logo.png --save digests.json
+    if len(sys.argv) > 1 and sys.argv[1] == 'verify':
+        from src.reproducible import main as verify_main
+        sys.exit(verify_main(sys.argv[2:]))
+    
+    from main import main
     main()
@@ -0,0 +1,262 @@
+"""
+API asyncio para Flutter Icon Generator
+Ejecuta la generación en un executor sin bloquear el event loop, con cancelación
+(deshaciendo las salidas parciales) y un límite de concurrencia compartido
+"""
+
+import os
+import shutil
+import asyncio
+import inspect
+import tempfile
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from .icon_generator import IconGenerator, GeneratedFile
+
+
+class AsyncIconGenerator:
+    """
+    Generador de iconos para servicios asyncio (aiohttp, FastAPI...)
+
+    Cada paso de IconGenerator.iter_generate (render, codificación y escritura
+    de una salida) corre en el executor, así que el event loop nunca hace
+    trabajo de CPU ni E/S de archivos. Las ejecuciones simultáneas de todas
+    las corrutinas que comparten esta instancia se limitan a max_concurrency.
+
+    Si una ejecución no termina (cancelación, error o cierre anticipado del
+    iterador) se eliminan los archivos nuevos que llegó a escribir y los que
+    ya existían vuelven a su contenido anterior.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 2,
+        executor: Optional[Executor] = None,
+        **generator_options
+    ):
+        """
+        Args:
+            max_concurrency: Generaciones simultáneas como máximo
+            executor: Executor para el trabajo bloqueante (por defecto, un
+                ThreadPoolExecutor propio con max_concurrency hilos)
+            **generator_options: Opciones de IconGenerator (workers, incremental,
+                png_optimization...) aplicadas a cada ejecución
+        """
+        self.max_concurrency = max_concurrency
+        self.generator_options = generator_options
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix='icon-gen'
+        )
+        # Se crea dentro del event loop en el primer uso (Python 3.8/3.9 lo ligan al crearlo)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def iter_generate(
+        self,
+        input_path: str,
+        output_dir: str,
+        bg_color: Optional[str] = None,
+        android_scale: float = 0.8,
+        ios_scale: float = 0.85,
+        platforms: Optional[List[str]] = None
+    ) -> AsyncIterator[GeneratedFile]:
+        """
+        Versión asíncrona de IconGenerator.iter_generate
+
+        Para garantizar la limpieza si el consumidor sale del bucle antes de
+        terminar, llamar a aclose() del iterador (o usar contextlib.aclosing).
+
+        Returns:
+            Iterador asíncrono de GeneratedFile, uno por salida en cuanto queda escrita
+        """
+        generator = IconGenerator(output_dir, **self.generator_options)
+        return self._stream(generator, input_path, bg_color, android_scale, ios_scale, platforms)
+
+    async def _stream(
+        self,
+        generator: IconGenerator,
+        input_path: str,
+        bg_color: Optional[str],
+        android_scale: float,
+        ios_scale: float,
+        platforms: Optional[List[str]]
+    ) -> AsyncIterator[GeneratedFile]:
+        """Ejecuta generator.iter_generate paso a paso en el executor"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            # Carpetas y salidas previas: la limpieza solo borra lo que cree esta
+            # ejecución y restaura lo que sobrescriba
+            existing_dirs, backup = await loop.run_in_executor(
+                self._executor, _snapshot, generator,
+                (input_path, bg_color, android_scale, ios_scale, platforms)
+            )
+            stream = generator.iter_generate(input_path, bg_color, android_scale, ios_scale, platforms)
+            delivered: List[GeneratedFile] = []
+            step = None
+            finished = False
+            try:
+                while True:
+                    step = loop.run_in_executor(self._executor, next, stream, None)
+                    # shield: al cancelar, el paso en curso termina antes de cerrar
+                    record = await asyncio.shield(step)
+                    step = None
+                    if record is None:
+                        finished = True
+                        break
+                    delivered.append(record)
+                    yield record
+            finally:
+                if not finished:
+                    await self._discard(stream, generator, delivered, step, existing_dirs, backup)
+                elif backup is not None:
+                    await loop.run_in_executor(self._executor, shutil.rmtree, backup[0], True)
+
+    async def generate_all(
+        self,
+        input_path: str,
+        output_dir: str,
+        bg_color: Optional[str] = None,
+        android_scale: float = 0.8,
+        ios_scale: float = 0.85,
+        platforms: Optional[List[str]] = None,
+        progress: Optional[Callable[[GeneratedFile], object]] = None
+    ) -> dict:
+        """
+        Versión asíncrona de IconGenerator.generate_all
+
+        Args:
+            progress: Callback opcional (función o corrutina) con cada GeneratedFile
+
+        Returns:
+            Diccionario con rutas de archivos generados
+        """
+        generator = IconGenerator(output_dir, **self.generator_options)
+        records = []
+        stream = self._stream(generator, input_path, bg_color, android_scale, ios_scale, platforms)
+        try:
+            async for record in stream:
+                records.append(record)
+                if progress:
+                    result = progress(record)
+                    if inspect.isawaitable(result):
+                        await result
+        finally:
+            await stream.aclose()
+        return generator.collect_results(records)
+
+    async def _discard(
+        self,
+        stream,
+        generator: IconGenerator,
+        delivered: List[GeneratedFile],
+        step: Optional[asyncio.Future],
+        existing_dirs: Set[str],
+        backup: Optional[Tuple[str, Dict[str, str]]]
+    ):
+        """Cierra una ejecución interrumpida y deshace lo que escribió"""
+        if step is not None:
+            # Esperar al paso en curso: el generador no puede cerrarse mientras corre
+            await asyncio.wait({step})
+            if not step.cancelled() and step.exception() is None and step.result() is not None:
+                delivered.append(step.result())
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self._executor, _close_and_clean, stream, generator, delivered, existing_dirs, backup
+        )
+
+    def close(self):
+        """Libera el executor propio (no espera a las tareas en curso)"""
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> 'AsyncIconGenerator':
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+def _list_dirs(root: str) -> Set[str]:
+    """Carpetas existentes bajo root (incluida root)"""
+    return {os.path.abspath(dirpath) for dirpath, _, _ in os.walk(root)}
+
+
+def _snapshot(generator: IconGenerator, plan_args: tuple) -> Tuple[Set[str], Optional[Tuple[str, Dict[str, str]]]]:
+    """
+    Carpetas existentes y copia de seguridad de las salidas que la ejecución sobrescribirá
+
+    La copia son enlaces duros (o copias si el sistema de archivos no los
+    admite) en una carpeta temporal junto a output_dir: las escrituras
+    reemplazan el archivo (os.replace), así que el enlace conserva el
+    contenido anterior sin copiar bytes.
+
+    Returns:
+        (carpetas existentes, (carpeta de la copia, ruta -> copia) o None si no hay nada que guardar)
+    """
+    existing_dirs = _list_dirs(generator.output_dir)
+    if not generator.sink.direct:
+        return existing_dirs, None
+    paths = [
+        os.path.abspath(planned.path) for planned in generator.compile_plan(*plan_args).files
+        if os.path.isfile(planned.path)
+    ]
+    if not paths:
+        return existing_dirs, None
+
+    output_dir = os.path.abspath(generator.output_dir)
+    backup_dir = tempfile.mkdtemp(prefix='.icon-backup-', dir=os.path.dirname(output_dir))
+    saved = {}
+    try:
+        for index, path in enumerate(paths):
+            target = os.path.join(backup_dir, str(index))
+            try:
+                os.link(path, target)
+            except OSError:
+                shutil.copy2(path, target)
+            saved[path] = target
+    except BaseException:
+        shutil.rmtree(backup_dir, ignore_errors=True)
+        raise
+    return existing_dirs, (backup_dir, saved)
+
+
+def _close_and_clean(
+    stream,
+    generator: IconGenerator,
+    delivered: List[GeneratedFile],
+    existing_dirs: Set[str],
+    backup: Optional[Tuple[str, Dict[str, str]]] = None
+):
+    """
+    Cierra el iterador síncrono, restaura las salidas que ya existían y borra
+    los archivos nuevos y las carpetas que creó
+    """
+    stream.close()
+    saved = backup[1] if backup is not None else {}
+    for path, target in saved.items():
+        try:
+            os.replace(target, path)
+        except OSError:
+            pass
+    for record in delivered + generator.undelivered:
+        if record.written and os.path.abspath(record.path) not in saved:
+            try:
+                os.remove(record.path)
+            except OSError:
+                pass
+    if backup is not None:
+        shutil.rmtree(backup[0], ignore_errors=True)
+
+    # De abajo arriba: solo carpetas nuevas que hayan quedado vacías
+    for dirpath, _, _ in os.walk(generator.output_dir, topdown=False):
+        directory = os.path.abspath(dirpath)
+        if directory not in existing_dirs:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
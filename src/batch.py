@@ -0,0 +1,297 @@
+"""
+Modo batch (sin interfaz) para Flutter Icon Generator
+Genera los iconos de cientos de imágenes en una sola invocación
+"""
+
+import os
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Dict, Callable, Union
+
+from .icon_generator import IconGenerator
+from .disk_cache import DiskCache, DEFAULT_MAX_BYTES
+
+ALL_PLATFORMS = ['android', 'ios', 'web', 'windows', 'macos']
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp', '.svg', '.svgz')
+
+
+@dataclass
+class BatchJob:
+    """Un trabajo del batch: una imagen origen y sus parámetros de generación"""
+    source: str
+    output_dir: str
+    bg_color: Optional[str] = None
+    android_scale: float = 0.8
+    ios_scale: float = 0.85
+    platforms: Optional[List[str]] = None
+
+
+@dataclass
+class ManifestError:
+    """Fila del manifiesto que no se pudo interpretar: se reporta como error sin abortar el batch"""
+    row: str                      # 'marcas.csv (línea 3)' o 'marcas.json (entrada 2)'
+    error: str
+    source: Optional[str] = None
+
+
+def _parse_platforms(value) -> Optional[List[str]]:
+    """Acepta lista o texto separado por comas/punto y coma/espacios"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = value.replace(';', ',').replace(' ', ',').split(',')
+    platforms = [p.strip().lower() for p in value if p.strip()]
+    unknown = [p for p in platforms if p not in ALL_PLATFORMS]
+    if unknown:
+        raise ValueError(f"Plataformas desconocidas: {', '.join(unknown)}")
+    return platforms
+
+
+def _job_from_row(row: dict, base_dir: str, defaults: dict) -> BatchJob:
+    """Construye un BatchJob desde una fila del manifiesto"""
+    if not isinstance(row, dict):
+        raise ValueError("La entrada debe ser un objeto")
+    source = row.get('source')
+    if not source:
+        raise ValueError("Falta la columna 'source'")
+    source = os.path.join(base_dir, source)
+
+    output_dir = row.get('output_dir') or os.path.join(
+        defaults.get('output_root', 'output'),
+        os.path.splitext(os.path.basename(source))[0]
+    )
+
+    return BatchJob(
+        source=source,
+        output_dir=os.path.join(base_dir, output_dir),
+        bg_color=row.get('bg_color') or defaults.get('bg_color'),
+        android_scale=float(row.get('android_scale') or defaults.get('android_scale', 0.8)),
+        ios_scale=float(row.get('ios_scale') or defaults.get('ios_scale', 0.85)),
+        platforms=_parse_platforms(row.get('platforms')) or defaults.get('platforms'),
+    )
+
+
+def _row_or_error(row, base_dir: str, defaults: dict, where: str) -> Union[BatchJob, ManifestError]:
+    """BatchJob de una fila o, si no es válida, el ManifestError que la reporta"""
+    try:
+        return _job_from_row(row, base_dir, defaults)
+    except (ValueError, TypeError) as e:
+        source = row.get('source') if isinstance(row, dict) else None
+        return ManifestError(where, f"{type(e).__name__}: {e}", source if isinstance(source, str) else None)
+
+
+def load_manifest(manifest_path: str, **defaults) -> Iterator[Union[BatchJob, ManifestError]]:
+    """
+    Lee un manifiesto CSV (con cabecera) o JSON (lista de objetos) de forma perezosa
+
+    Columnas: source, bg_color, android_scale, ios_scale, platforms, output_dir.
+    Las rutas relativas se resuelven respecto al directorio del manifiesto.
+    Una fila no válida produce un ManifestError en su lugar (run_batch la
+    reporta como error y sigue con las demás).
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    name = os.path.basename(manifest_path)
+
+    if manifest_path.lower().endswith('.json'):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+        for index, row in enumerate(rows, start=1):
+            yield _row_or_error(row, base_dir, defaults, f"{name} (entrada {index})")
+        return
+
+    with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            yield _row_or_error(row, base_dir, defaults, f"{name} (línea {line_no})")
+
+
+def jobs_from_directory(input_dir: str, output_root: str, **defaults) -> Iterator[BatchJob]:
+    """Un trabajo por imagen del directorio; la salida va a output_root/<nombre>"""
+    for entry in sorted(os.scandir(input_dir), key=lambda e: e.name):
+        if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+            yield _job_from_row(
+                {'source': entry.path},
+                '',
+                dict(defaults, output_root=output_root)
+            )
+
+
+def _run_job(
+    job: BatchJob,
+    memory_budget_mb: Optional[float] = None,
+    disk_cache: Optional[DiskCache] = None
+) -> dict:
+    """Ejecuta un trabajo en el worker; nunca lanza, devuelve el estado"""
+    start = time.perf_counter()
+    status = {'source': job.source, 'output_dir': job.output_dir}
+    try:
+        generator = IconGenerator(
+            job.output_dir,
+            memory_budget_mb=memory_budget_mb,
+            disk_cache=disk_cache
+        )
+        results = generator.generate_all(
+            input_path=job.source,
+            bg_color=job.bg_color,
+            android_scale=job.android_scale,
+            ios_scale=job.ios_scale,
+            platforms=job.platforms
+        )
+        status.update(status='ok', total=results['total'])
+        if 'memory' in results:
+            status['memory'] = results['memory']
+        if disk_cache is not None:
+            status['cache_hits'] = disk_cache.hits
+    except Exception as e:
+        status.update(status='error', error=f"{type(e).__name__}: {e}")
+    status['seconds'] = round(time.perf_counter() - start, 3)
+    return status
+
+
+def run_batch(
+    jobs: Iterable[Union[BatchJob, ManifestError]],
+    report_path: str,
+    workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+    memory_budget_mb: Optional[float] = None,
+    disk_cache: Optional[DiskCache] = None
+) -> Dict[str, int]:
+    """
+    Procesa los trabajos en un pool de procesos acotado
+
+    Los trabajos se consumen de forma perezosa y nunca hay más de max_pending
+    en vuelo, así que la memoria no crece con el tamaño del batch. El estado de
+    cada trabajo se escribe en report_path (JSON Lines) en cuanto termina; una
+    imagen defectuosa o una fila del manifiesto no válida solo marcan su
+    trabajo como error.
+
+    Args:
+        jobs: Iterable de BatchJob (o ManifestError, que se reporta sin ejecutar)
+        report_path: Archivo de reporte JSON Lines
+        workers: Número de procesos (por defecto, núcleos disponibles)
+        max_pending: Trabajos en vuelo como máximo (por defecto, 2 por worker)
+        progress: Callback opcional con el estado de cada trabajo terminado
+        memory_budget_mb: Presupuesto de memoria por trabajo (el reporte
+                          incluye entonces sus picos por plataforma)
+        disk_cache: Caché persistente de salidas compartida por los trabajos
+
+    Returns:
+        Resumen {'ok': n, 'error': n}
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    summary = {'ok': 0, 'error': 0}
+
+    report_dir = os.path.dirname(report_path)
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+
+    with open(report_path, 'w', encoding='utf-8') as report, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Dict[Future, BatchJob] = {}
+
+        def write(status):
+            summary[status['status']] += 1
+            report.write(json.dumps(status, ensure_ascii=False) + '\n')
+            report.flush()
+            if progress:
+                progress(status)
+
+        def record(done):
+            for future in done:
+                job = pending.pop(future)
+                try:
+                    status = future.result()
+                except Exception as e:
+                    # El worker murió (p. ej. OOM); se registra y se continúa
+                    status = {
+                        'source': job.source,
+                        'output_dir': job.output_dir,
+                        'status': 'error',
+                        'error': f"{type(e).__name__}: {e}",
+                    }
+                write(status)
+
+        for job in jobs:
+            if isinstance(job, ManifestError):
+                write({
+                    'source': job.source,
+                    'output_dir': None,
+                    'row': job.row,
+                    'status': 'error',
+                    'error': job.error,
+                })
+                continue
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                record(done)
+            pending[pool.submit(_run_job, job, memory_budget_mb, disk_cache)] = job
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            record(done)
+
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos del modo batch"""
+    parser = argparse.ArgumentParser(
+        prog='flutter-icon-generator batch',
+        description='Genera iconos Flutter para muchas imágenes sin interfaz gráfica'
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--manifest', help='Manifiesto CSV o JSON con un trabajo por fila')
+    source.add_argument('--input-dir', help='Directorio con imágenes origen')
+    parser.add_argument('--output', default='output', help='Carpeta raíz de salida')
+    parser.add_argument('--report', default=None, help='Reporte JSON Lines (por defecto <output>/batch_report.jsonl)')
+    parser.add_argument('--workers', type=int, default=None, help='Número de procesos')
+    parser.add_argument('--bg-color', default=None, help='Color de fondo por defecto (hex)')
+    parser.add_argument('--android-scale', type=float, default=0.8)
+    parser.add_argument('--ios-scale', type=float, default=0.85)
+    parser.add_argument('--platforms', default=None, help='Plataformas separadas por comas')
+    parser.add_argument('--memory-mb', type=float, default=None, help='Presupuesto de memoria por trabajo en MB')
+    parser.add_argument('--cache', action='store_true', help='Usa la caché persistente de renders (carpeta de configuración)')
+    parser.add_argument('--cache-dir', default=None, help='Carpeta de la caché persistente (p. ej. un volumen compartido)')
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help='Tamaño máximo de la caché en MB')
+    args = parser.parse_args(argv)
+
+    defaults = {
+        'bg_color': args.bg_color,
+        'android_scale': args.android_scale,
+        'ios_scale': args.ios_scale,
+        'platforms': _parse_platforms(args.platforms),
+    }
+
+    if args.manifest:
+        jobs = load_manifest(args.manifest, output_root=os.path.abspath(args.output), **defaults)
+    else:
+        jobs = jobs_from_directory(args.input_dir, args.output, **defaults)
+
+    report_path = args.report or os.path.join(args.output, 'batch_report.jsonl')
+
+    def progress(status):
+        mark = "OK " if status['status'] == 'ok' else "ERR"
+        detail = f"{status.get('total', 0)} archivos" if status['status'] == 'ok' else status['error']
+        name = os.path.basename(status['source']) if status['source'] else status['row']
+        print(f"[{mark}] {name}: {detail}", flush=True)
+
+    disk_cache = None
+    if args.cache or args.cache_dir:
+        disk_cache = DiskCache(args.cache_dir, args.cache_mb * 1024 * 1024)
+
+    summary = run_batch(
+        jobs, report_path, workers=args.workers, progress=progress,
+        memory_budget_mb=args.memory_mb, disk_cache=disk_cache
+    )
+    print(f"\nBatch completado: {summary['ok']} correctos, {summary['error']} con error")
+    print(f"Reporte: {report_path}")
+    return 0 if summary['error'] == 0 else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
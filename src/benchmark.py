@@ -0,0 +1,346 @@
+"""
+Benchmarks del motor de generación de Flutter Icon Generator
+Mide generate_all y cada generate_*_icons sobre una matriz de imágenes sintéticas
+y compara contra una línea base JSON para detectar regresiones
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import statistics
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from PIL import Image, ImageDraw
+
+from .icon_generator import IconGenerator
+
+try:
+    import resource
+except ImportError:  # Windows: sin medición de RSS pico
+    resource = None
+
+BASELINE_VERSION = 1
+
+DEFAULT_SIZES = (512, 2048, 8192)
+TARGETS = (
+    'generate_all',
+    'generate_android_icons',
+    'generate_ios_icons',
+    'generate_web_icons',
+    'generate_windows_icons',
+    'generate_macos_icons',
+)
+
+# Métricas comparadas y diferencia absoluta mínima para considerarla regresión
+METRICS = {
+    'wall': 0.005,
+    'cpu': 0.005,
+    'peak_rss_mb': 2.0,
+}
+
+BENCH_BG_COLOR = '#3366CC'
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    """Una imagen origen sintética de la matriz"""
+    size: int
+    alpha: bool
+    square: bool
+    bg: bool
+
+    @property
+    def name(self) -> str:
+        return '-'.join((
+            str(self.size),
+            'alpha' if self.alpha else 'opaque',
+            'square' if self.square else 'wide',
+            'bg' if self.bg else 'nobg',
+        ))
+
+    @property
+    def dimensions(self):
+        return (self.size, self.size) if self.square else (self.size, self.size // 2)
+
+    @property
+    def source_name(self) -> str:
+        # El fondo no cambia la imagen origen: se comparte entre casos
+        width, height = self.dimensions
+        return f"source_{width}x{height}_{'rgba' if self.alpha else 'rgb'}.png"
+
+
+def build_matrix(sizes=DEFAULT_SIZES) -> List[BenchCase]:
+    """Matriz tamaño x opaco/alpha x cuadrada/no cuadrada x con/sin fondo"""
+    return [
+        BenchCase(size, alpha, square, bg)
+        for size in sizes
+        for alpha in (False, True)
+        for square in (True, False)
+        for bg in (False, True)
+    ]
+
+
+def make_source(case: BenchCase, path: str):
+    """Crea una imagen origen determinista (degradados + forma con alpha)"""
+    width, height = case.dimensions
+    red = Image.linear_gradient('L').resize((width, height))
+    green = red.transpose(Image.Transpose.ROTATE_90).resize((width, height))
+    blue = Image.radial_gradient('L').resize((width, height))
+    image = Image.merge('RGB', (red, green, blue))
+
+    if case.alpha:
+        mask = Image.new('L', (width, height), 0)
+        ImageDraw.Draw(mask).ellipse(
+            (width // 10, height // 10, width * 9 // 10, height * 9 // 10),
+            fill=255
+        )
+        image.putalpha(mask)
+
+    image.save(path, 'PNG', compress_level=1)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """RSS pico del proceso en MB (None si la plataforma no lo permite)"""
+    # En Linux ru_maxrss se hereda del padre a través de fork/exec; VmHWM no
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KB, macOS en bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def _measure(source_path: str, bg_color: Optional[str], target: str, repeat: int, work_dir: str) -> dict:
+    """
+    Mide un objetivo en el proceso actual (pensado para un proceso nuevo por medición)
+
+    Para los generate_*_icons la decodificación queda fuera del tiempo medido.
+    """
+    output_dir = os.path.join(work_dir, 'output')
+    walls, cpus = [], []
+    for _ in range(repeat):
+        shutil.rmtree(output_dir, ignore_errors=True)
+        generator = IconGenerator(output_dir)
+
+        if target == 'generate_all':
+            call = lambda: generator.generate_all(source_path, bg_color=bg_color)
+        else:
+            source_img = generator._load_source(source_path)
+            method = getattr(generator, target)
+            if target == 'generate_ios_icons':
+                call = lambda: method(source_img)
+            else:
+                call = lambda: method(source_img, bg_color)
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        call()
+        walls.append(time.perf_counter() - wall_start)
+        cpus.append(time.process_time() - cpu_start)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    return {
+        'wall': round(statistics.median(walls), 4),
+        'cpu': round(statistics.median(cpus), 4),
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def run_suite(
+    sizes=DEFAULT_SIZES,
+    targets=TARGETS,
+    repeat: int = 3,
+    progress=None
+) -> dict:
+    """
+    Ejecuta la matriz completa
+
+    Cada medición corre en un proceso nuevo para que el RSS pico sea el suyo.
+
+    Returns:
+        Línea base con entorno, matriz y resultados por '<caso>:<objetivo>'
+    """
+    cases = build_matrix(sizes)
+    results = {}
+    context = multiprocessing.get_context('spawn')
+
+    with tempfile.TemporaryDirectory(prefix='icon_bench_') as work_dir:
+        for case in cases:
+            source_path = os.path.join(work_dir, case.source_name)
+            if not os.path.exists(source_path):
+                make_source(case, source_path)
+
+            bg_color = BENCH_BG_COLOR if case.bg else None
+            for target in targets:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    result = pool.submit(
+                        _measure, source_path, bg_color, target, repeat,
+                        os.path.join(work_dir, 'run')
+                    ).result()
+                key = f'{case.name}:{target}'
+                results[key] = result
+                if progress:
+                    progress(key, result)
+
+    return {
+        'version': BASELINE_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'pillow': Image.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'repeat': repeat,
+        'matrix': {
+            'sizes': list(sizes),
+            'targets': list(targets),
+            'cases': [asdict(case) for case in cases],
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10) -> List[dict]:
+    """
+    Compara dos ejecuciones y devuelve las regresiones
+
+    Una métrica regresa si supera a la base en más de threshold (relativo) y
+    en más del mínimo absoluto de METRICS (evita ruido en medidas pequeñas).
+    """
+    regressions = []
+    for key, base in baseline['results'].items():
+        now = current['results'].get(key)
+        if now is None:
+            continue
+        for metric, min_delta in METRICS.items():
+            before, after = base.get(metric), now.get(metric)
+            if before is None or after is None:
+                continue
+            if after - before > min_delta and after > before * (1 + threshold):
+                regressions.append({
+                    'case': key,
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'change': round(after / before - 1, 3) if before else None,
+                })
+    return regressions
+
+
+def _format_result(result: dict) -> str:
+    rss = result['peak_rss_mb']
+    rss_text = f"{rss:8.1f} MB" if rss is not None else '       n/d'
+    return f"wall {result['wall']:8.3f}s  cpu {result['cpu']:8.3f}s  rss {rss_text}"
+
+
+def _load_json(path: str) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != BASELINE_VERSION:
+        raise ValueError(f"{path}: versión de línea base no soportada")
+    return data
+
+
+def _save_json(path: str, data: dict):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def _parse_list(value: Optional[str], cast=str) -> Optional[list]:
+    if not value:
+        return None
+    return [cast(item.strip()) for item in value.split(',') if item.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos de los benchmarks"""
+    parser = argparse.ArgumentParser(
+        prog='flutter-icon-generator benchmark',
+        description='Benchmarks del motor de generación de iconos'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_suite_args(command):
+        command.add_argument('--sizes', default=None, help='Lados de las imágenes separados por comas (por defecto 512,2048,8192)')
+        command.add_argument('--targets', default=None, help='Métodos a medir separados por comas (por defecto todos)')
+        command.add_argument('--repeat', type=int, default=3, help='Repeticiones por medición (se guarda la mediana)')
+
+    run = commands.add_parser('run', help='Ejecuta la matriz y guarda los resultados')
+    add_suite_args(run)
+    run.add_argument('--output', default='benchmark_baseline.json', help='Archivo JSON de resultados')
+
+    cmp = commands.add_parser('compare', help='Compara contra una línea base y marca regresiones')
+    cmp.add_argument('baseline', help='Línea base JSON')
+    cmp.add_argument('current', nargs='?', help='Resultados JSON (si se omite, se ejecuta la matriz de la base)')
+    cmp.add_argument('--threshold', type=float, default=0.10, help='Regresión relativa tolerada (0.10 = 10%%)')
+    cmp.add_argument('--save', default=None, help='Guarda la ejecución actual en este JSON')
+    add_suite_args(cmp)
+    args = parser.parse_args(argv)
+
+    targets = _parse_list(args.targets)
+    unknown = [t for t in targets or [] if t not in TARGETS]
+    if unknown:
+        parser.error(f"Objetivos desconocidos: {', '.join(unknown)}")
+
+    def progress(key, result):
+        print(f"{key:<48} {_format_result(result)}", flush=True)
+
+    if args.command == 'run':
+        data = run_suite(
+            sizes=_parse_list(args.sizes, int) or DEFAULT_SIZES,
+            targets=targets or TARGETS,
+            repeat=args.repeat,
+            progress=progress
+        )
+        _save_json(args.output, data)
+        print(f"\nResultados: {args.output}")
+        return 0
+
+    baseline = _load_json(args.baseline)
+    if args.current:
+        current = _load_json(args.current)
+    else:
+        matrix = baseline['matrix']
+        current = run_suite(
+            sizes=_parse_list(args.sizes, int) or matrix['sizes'],
+            targets=targets or matrix['targets'],
+            repeat=args.repeat,
+            progress=progress
+        )
+    if args.save:
+        _save_json(args.save, current)
+
+    regressions = compare(baseline, current, args.threshold)
+    if not regressions:
+        print(f"\nSin regresiones (umbral {args.threshold:.0%})")
+        return 0
+
+    print(f"\n{len(regressions)} regresiones (umbral {args.threshold:.0%}):")
+    for reg in regressions:
+        change = f"+{reg['change']:.0%}" if reg['change'] is not None else ''
+        print(f"  {reg['case']:<48} {reg['metric']:<12} {reg['baseline']} -> {reg['current']} {change}")
+    return 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+"""
+Manifiesto de build para regeneración incremental
+Registra el hash del origen, los parámetros de cada salida y el hash de cada archivo
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, Iterable, Optional
+
+MANIFEST_FILENAME = '.flutter_icons_manifest.json'
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data: bytes) -> str:
+    """SHA-256 en hex de un bloque de bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str) -> Optional[str]:
+    """SHA-256 en hex del contenido de un archivo (None si no existe)"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """Manifiesto de las salidas generadas en un directorio"""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_FILENAME)
+        # ruta relativa -> {'inputs': huella de entradas, 'hash': hash del archivo}
+        self.previous: Dict[str, dict] = {}
+        self.outputs: Dict[str, dict] = {}
+        self.load()
+
+    def load(self):
+        """Carga el manifiesto anterior (si existe y es de esta versión)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.previous = data.get('outputs', {})
+        except (OSError, ValueError):
+            self.previous = {}
+
+    def relpath(self, path: str) -> str:
+        """Ruta relativa al directorio de salida con separadores '/'"""
+        return os.path.relpath(path, self.output_dir).replace(os.sep, '/')
+
+    @staticmethod
+    def fingerprint(*parts) -> str:
+        """Huella estable de las entradas de una salida"""
+        return hash_bytes(json.dumps(parts, sort_keys=True, default=list).encode('utf-8'))
+
+    def is_up_to_date(self, path: str, inputs: str) -> bool:
+        """True si la salida existe, sus entradas no cambiaron y no fue modificada"""
+        entry = self.previous.get(self.relpath(path))
+        if not entry or entry.get('inputs') != inputs:
+            return False
+        return hash_file(path) == entry.get('hash')
+
+    def record(self, path: str, inputs: Optional[str] = None):
+        """Registra una salida (ya escrita) con su hash actual"""
+        rel = self.relpath(path)
+        entry = self.previous.get(rel)
+        file_hash = hash_file(path)
+        if inputs is None:
+            inputs = file_hash
+        if entry and entry.get('inputs') == inputs and entry.get('hash') == file_hash:
+            self.outputs[rel] = entry
+        else:
+            self.outputs[rel] = {'inputs': inputs, 'hash': file_hash}
+
+    def remove_stale(self, current_paths: Iterable[str]) -> list:
+        """
+        Elimina las salidas del manifiesto anterior que ya no se generan
+
+        Solo se tocan archivos registrados en el manifiesto anterior.
+
+        Returns:
+            Lista de rutas eliminadas
+        """
+        current = {self.relpath(p) for p in current_paths}
+        removed = []
+        for rel in self.previous:
+            if rel in current:
+                continue
+            path = os.path.join(self.output_dir, *rel.split('/'))
+            if os.path.isfile(path):
+                os.remove(path)
+                removed.append(path)
+                self._remove_empty_dirs(os.path.dirname(path))
+        return removed
+
+    def _remove_empty_dirs(self, directory: str):
+        """Borra directorios vacíos hasta llegar al directorio de salida"""
+        root = os.path.abspath(self.output_dir)
+        directory = os.path.abspath(directory)
+        while directory != root and directory.startswith(root) and not os.listdir(directory):
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
+
+    def save(self, source_hash: str, params: dict):
+        """Guarda el manifiesto de forma atómica (no lo toca si no cambió)"""
+        data = {
+            'version': MANIFEST_VERSION,
+            'source': source_hash,
+            'params': params,
+            'outputs': self.outputs,
+        }
+        content = json.dumps(data, indent=2, sort_keys=True)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                if f.read() == content:
+                    return
+        except OSError:
+            pass
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, self.path)
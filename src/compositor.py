@@ -0,0 +1,61 @@
+"""
+Composición de iconos para Flutter Icon Generator
+Centrado sobre el fondo y aplanado del alpha sin imágenes intermedias
+"""
+
+from PIL import Image
+from typing import Optional, Tuple
+
+
+def composite(
+    content: Image.Image,
+    canvas_size: Tuple[int, int],
+    position: Tuple[int, int],
+    bg_color: Tuple[int, int, int, int] = (255, 255, 255, 0),
+    flatten: Optional[Tuple[int, int, int]] = None
+) -> Tuple[Image.Image, Optional[Image.Image]]:
+    """
+    Coloca el contenido sobre un canvas de fondo y, opcionalmente, lo aplana
+
+    Las mezclas se hacen en sitio sobre los buffers de destino con paste: la
+    máscara es la banda alpha del propio RGBA (sin split()) y el único buffer
+    que se reserva es el de cada resultado.
+
+    Args:
+        content: Contenido ya redimensionado
+        canvas_size: Tamaño del canvas (ancho, alto)
+        position: Esquina superior izquierda del contenido
+        bg_color: Color de fondo (RGBA)
+        flatten: Color RGB sobre el que aplanar el alpha (None = no aplanar)
+
+    Returns:
+        Tupla (canvas RGBA, canvas aplanado RGB o None)
+    """
+    canvas = Image.new('RGBA', canvas_size, bg_color)
+    if content.mode == 'RGBA':
+        canvas.paste(content, position, mask=content)
+    else:
+        canvas.paste(content, position)
+
+    flat = flatten_alpha(canvas, flatten) if flatten is not None else None
+    return canvas, flat
+
+
+def flatten_alpha(icon: Image.Image, color: Tuple[int, int, int]) -> Image.Image:
+    """Aplana un icono RGBA sobre un color RGB"""
+    flat = Image.new('RGB', icon.size, color)
+    # Un RGBA como máscara usa su banda alpha sin separarla
+    flat.paste(icon, mask=icon)
+    return flat
+
+
+def fit_size(
+    source_size: Tuple[int, int],
+    content_max_size: Tuple[int, int],
+    is_vector: bool = False
+) -> Tuple[int, int]:
+    """Tamaño del contenido que cabe en content_max_size (aspect ratio; un raster no se amplía)"""
+    scale_factor = min(content_max_size[0] / source_size[0], content_max_size[1] / source_size[1])
+    if not is_vector:
+        scale_factor = min(scale_factor, 1.0)
+    return int(source_size[0] * scale_factor), int(source_size[1] * scale_factor)
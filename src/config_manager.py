@@ -8,6 +8,23 @@ import os
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, asdict
 
+
+def get_config_dir() -> str:
+    """Directorio de configuración según el sistema operativo (se crea si no existe)"""
+    # En Windows: %APPDATA%/FlutterIconGenerator
+    # En macOS/Linux: ~/.config/flutter_icon_generator
+    
+    if os.name == 'nt':  # Windows
+        app_data = os.environ.get('APPDATA', os.path.expanduser('~'))
+        config_dir = os.path.join(app_data, 'FlutterIconGenerator')
+    else:  # macOS/Linux
+        config_dir = os.path.expanduser('~/.config/flutter_icon_generator')
+    
+    # Crear directorio si no existe
+    os.makedirs(config_dir, exist_ok=True)
+    return config_dir
+
+
 @dataclass
 class AppConfig:
     """Configuración de la aplicación"""
@@ -45,18 +62,7 @@ class ConfigManager:
     
     def _get_config_dir(self) -> str:
         """Obtiene el directorio de configuración según el sistema operativo"""
-        # En Windows: %APPDATA%/FlutterIconGenerator
-        # En macOS/Linux: ~/.config/flutter_icon_generator
-        
-        if os.name == 'nt':  # Windows
-            app_data = os.environ.get('APPDATA', os.path.expanduser('~'))
-            config_dir = os.path.join(app_data, 'FlutterIconGenerator')
-        else:  # macOS/Linux
-            config_dir = os.path.expanduser('~/.config/flutter_icon_generator')
-        
-        # Crear directorio si no existe
-        os.makedirs(config_dir, exist_ok=True)
-        return config_dir
+        return get_config_dir()
     
     def load(self) -> AppConfig:
         """Carga la configuración desde el archivo"""
@@ -0,0 +1,240 @@
+"""
+Caché persistente en disco para Flutter Icon Generator
+Guarda los archivos ya codificados (PNG/ICO) por huella de sus entradas para
+reutilizarlos entre ejecuciones, espacios de trabajo y máquinas
+"""
+
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .config_manager import get_config_dir
+
+# Versión del formato de la caché (subcarpeta): cambiarla deja atrás las entradas viejas
+CACHE_FORMAT = 'v1'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Al pasarse del límite se baja hasta esta fracción (evita limpiar en cada inserción)
+_EVICT_TARGET = 0.9
+# Temporales de escrituras interrumpidas que se pueden borrar
+_STALE_TMP_SECONDS = 3600
+_TMP_PREFIX = '.tmp-'
+
+
+def default_cache_dir() -> str:
+    """Carpeta de la caché dentro del directorio de configuración de la aplicación"""
+    return os.path.join(get_config_dir(), 'render_cache')
+
+
+class DiskCache:
+    """
+    Caché de bytes en disco con límite de tamaño y expulsión LRU
+
+    Cada entrada es un archivo con la huella como nombre (en subcarpetas por
+    sus dos primeros caracteres). Las inserciones escriben un temporal en la
+    misma carpeta y lo renombran (os.replace), así que varios procesos o
+    máquinas pueden compartir la carpeta (un volumen montado) sin ver nunca
+    una entrada a medias. La fecha de modificación marca el último uso.
+
+    El tamaño y el número de entradas se cuentan recorriendo la carpeta una
+    vez y después se siguen con las inserciones de esta instancia.
+
+    Args:
+        directory: Carpeta de la caché (por defecto, dentro de la configuración)
+        max_bytes: Tamaño máximo en bytes de todas las entradas
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.root = os.path.join(self.directory, CACHE_FORMAT)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        # Bytes y entradas en disco según el último recuento (None = sin contar todavía)
+        self._bytes: Optional[int] = None
+        self._count: Optional[int] = None
+        # Bytes y entradas añadidos desde el último take_counts (copias en workers)
+        self._added_bytes = 0
+        self._added_entries = 0
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        # Los workers reconstruyen la caché sobre la misma carpeta (estadísticas propias)
+        return (DiskCache, (self.directory, self.max_bytes))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Bytes de una entrada (None si no existe) y la marca como recién usada"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            # No existe o la expulsó otro proceso entre medias
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> bool:
+        """
+        Inserta una entrada de forma atómica (False si no cabe o no se pudo escribir)
+
+        Si otro proceso inserta la misma huella a la vez, gana el último
+        renombrado; el contenido es el mismo.
+        """
+        if len(data) > self.max_bytes:
+            return False
+        path = self._path(key)
+        try:
+            previous_size = os.stat(path).st_size
+        except OSError:
+            previous_size = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=_TMP_PREFIX, dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            return False
+
+        added_bytes = len(data) - (previous_size or 0)
+        added_entries = 1 if previous_size is None else 0
+        with self._lock:
+            self.writes += 1
+            self._added_bytes += added_bytes
+            self._added_entries += added_entries
+            if self._bytes is not None:
+                self._bytes += added_bytes
+                self._count += added_entries
+            over = self._bytes is None or self._bytes > self.max_bytes
+        if over:
+            self._evict()
+        return True
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(último uso, bytes, ruta) de cada entrada; borra temporales abandonados"""
+        entries = []
+        now = time.time()
+        try:
+            shards = list(os.scandir(self.root))
+        except OSError:
+            return entries
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            try:
+                files = list(os.scandir(shard.path))
+            except OSError:
+                continue
+            for entry in files:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if entry.name.startswith(_TMP_PREFIX):
+                    if now - stat.st_mtime > _STALE_TMP_SECONDS:
+                        _remove(entry.path)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        """Recuenta lo que hay en disco y expulsa las entradas menos usadas si sobra"""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            entries_left = len(entries)
+            if total > self.max_bytes:
+                target = int(self.max_bytes * _EVICT_TARGET)
+                for _, size, path in sorted(entries):
+                    if total <= target:
+                        break
+                    if _remove(path):
+                        self.evictions += 1
+                        entries_left -= 1
+                    total -= size
+            self._bytes = total
+            self._count = entries_left
+
+    def clear(self):
+        """Borra todas las entradas"""
+        with self._lock:
+            for _, _, path in self._entries():
+                _remove(path)
+            self._bytes = 0
+            self._count = 0
+
+    def take_counts(self) -> Dict[str, int]:
+        """Contadores desde la llamada anterior (los devuelve un worker al terminar una tarea)"""
+        with self._lock:
+            counts = {
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'bytes': self._added_bytes,
+                'entries': self._added_entries,
+            }
+            self.hits = self.misses = self.writes = self.evictions = 0
+            self._added_bytes = self._added_entries = 0
+        return counts
+
+    def merge_counts(self, counts: Dict[str, int]):
+        """Suma los contadores de una copia de la caché en un worker"""
+        with self._lock:
+            self.hits += counts['hits']
+            self.misses += counts['misses']
+            self.writes += counts['writes']
+            self.evictions += counts['evictions']
+            if counts['evictions']:
+                # Lo expulsado en el worker no se conoce: se recuenta cuando haga falta
+                self._bytes = self._count = None
+            elif self._bytes is not None:
+                self._bytes += counts['bytes']
+                self._count += counts['entries']
+
+    def stats(self) -> dict:
+        """
+        Aciertos, fallos, inserciones y expulsiones de esta instancia y tamaño en disco
+
+        El tamaño es el seguido desde el último recuento (la carpeta solo se
+        recorre si aún no se había contado).
+        """
+        if self._bytes is None:
+            self._evict()
+        lookups = self.hits + self.misses
+        return {
+            'directory': self.directory,
+            'entries': self._count,
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'writes': self.writes,
+            'evictions': self.evictions,
+        }
+
+
+def _remove(path: str) -> bool:
+    """Borra un archivo si sigue existiendo (otro proceso puede haberlo expulsado)"""
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
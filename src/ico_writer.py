@@ -0,0 +1,89 @@
+"""
+Ensamblador de archivos ICO para Flutter Icon Generator
+Empaqueta capas ya renderizadas sin volver a redimensionarlas: las de 256 px
+van comprimidas en PNG y las pequeñas como DIB de 32 bits con alpha
+"""
+
+import io
+import struct
+from typing import BinaryIO, Callable, List, Optional, Union
+
+from PIL import Image
+
+from .output_sink import replace_file
+
+# Las capas de este lado o mayores se guardan como PNG (Windows Vista+)
+PNG_MIN_SIDE = 256
+
+_ICONDIR = struct.Struct('<HHH')
+_ICONDIRENTRY = struct.Struct('<BBBBHHII')
+_BITMAPINFOHEADER = struct.Struct('<IiiHHIIiiII')
+
+
+def _encode_png(layer: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    layer.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def _encode_dib(layer: Image.Image) -> bytes:
+    """DIB de 32 bits BGRA (filas de abajo arriba) seguido de la máscara AND de 1 bit"""
+    width, height = layer.size
+    header = _BITMAPINFOHEADER.pack(
+        _BITMAPINFOHEADER.size, width, height * 2,  # alto doble: color + máscara
+        1, 32, 0, 0, 0, 0, 0, 0
+    )
+    pixels = layer.tobytes('raw', 'BGRA', 0, -1)
+    # Máscara para visores sin alpha: 1 = transparente; filas alineadas a 32 bits
+    mask = layer.getchannel('A').point(lambda a: 255 if a == 0 else 0).convert('1')
+    mask_stride = ((width + 31) // 32) * 4
+    return header + pixels + mask.tobytes('raw', '1', mask_stride, -1)
+
+
+def build_ico(
+    layers: List[Image.Image],
+    png_encoder: Optional[Callable[[Image.Image], bytes]] = None
+) -> bytes:
+    """
+    Construye un ICO con una entrada por capa, en el orden recibido
+
+    Args:
+        layers: Renders de cada tamaño (RGBA o RGB; como máximo 256 px de lado)
+        png_encoder: Codificador para las entradas PNG (por defecto, PNG de Pillow)
+
+    Returns:
+        Bytes del archivo ICO
+    """
+    encode_png = png_encoder or _encode_png
+    entries = []
+    for layer in layers:
+        if layer.width > 256 or layer.height > 256:
+            raise ValueError(f"Capa ICO demasiado grande: {layer.width}x{layer.height}")
+        if layer.mode != 'RGBA':
+            layer = layer.convert('RGBA')
+        if max(layer.size) >= PNG_MIN_SIDE:
+            entries.append((layer.size, encode_png(layer)))
+        else:
+            entries.append((layer.size, _encode_dib(layer)))
+
+    offset = _ICONDIR.size + _ICONDIRENTRY.size * len(entries)
+    parts = [_ICONDIR.pack(0, 1, len(entries))]
+    for (width, height), data in entries:
+        # 0 en el directorio significa 256
+        parts.append(_ICONDIRENTRY.pack(width % 256, height % 256, 0, 0, 1, 32, len(data), offset))
+        offset += len(data)
+    parts.extend(data for _, data in entries)
+    return b''.join(parts)
+
+
+def write_ico(
+    layers: List[Image.Image],
+    target: Union[str, BinaryIO],
+    png_encoder: Optional[Callable[[Image.Image], bytes]] = None
+):
+    """Escribe build_ico(layers) en una ruta o un objeto archivo"""
+    data = build_ico(layers, png_encoder)
+    if isinstance(target, str):
+        replace_file(target, lambda f: f.write(data))
+    else:
+        target.write(data)
@@ -4,15 +4,65 @@ Soporta Android, iOS, Web, Windows y macOS con todos los tamaños necesarios
 Fase 3: Multiplataforma completa + Integración flutter_launcher_icons
 """
 
+import io
 import os
 import json
+import time
 import yaml
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from PIL import Image
-from typing import Tuple, Optional, List, Dict
+from typing import Tuple, Optional, List, Dict, NamedTuple, Iterator, Callable
+
+from .image_pyramid import ImagePyramid
+from .write_pipeline import WritePipeline, IconWriteError
+from .build_manifest import BuildManifest, hash_file, hash_bytes
+from .png_optimizer import PngOptimizer
+from .source_loader import load_source, DECODE_MAX_SIDE, MAX_SOURCE_PIXELS
+from .svg_source import SvgSource, is_svg
+from .compositor import composite, flatten_alpha, fit_size
+from .tracing import Tracer, NO_SPAN, PHASE
+from .output_sink import OutputSink, DirectorySink, MemorySink, replace_file
+from .ico_writer import write_ico
+from .render_plan import RenderPlan, PlannedFile, base_key, schedule_jobs, release_points
+from .memory_budget import MemoryBudget, TrackedRenderCache
+from .lru_cache import image_nbytes
+from .disk_cache import DiskCache
+from .source_cache import SourceCache
+from .reproducible import encode_png, encoder_id, strip_ancillary_chunks, PNG_COMPRESS_LEVEL
+
+# Calidades de render: 'final' (LANCZOS, zlib por defecto) y 'draft' (iteración rápida)
+QUALITY_TIERS = ('final', 'draft')
+# Borrador: BILINEAR con reducción previa por bloques y zlib nivel 1
+DRAFT_REDUCING_GAP = 2.0
+DRAFT_COMPRESS_LEVEL = 1
+
+
+class _DeferredRender(NamedTuple):
+    """Render pendiente (modo paralelo): solo la clave, se ejecuta en un worker"""
+    key: tuple
+
+
+class GeneratedFile(NamedTuple):
+    """Un archivo de salida ya escrito (lo produce IconGenerator.iter_generate)"""
+    platform: Optional[str]          # None para el YAML de flutter_launcher_icons
+    kind: str                        # 'png', 'ico', 'json' o 'yaml'
+    size: Optional[Tuple[int, int]]  # Tamaño del icono en píxeles (capa mayor en ICO)
+    path: str
+    bytes: int
+    sha256: str
+    render_seconds: float            # Render del icono (0 si salió de la caché)
+    encode_seconds: float            # Codificación PNG/ICO
+    written: bool                    # False si el archivo ya estaba al día y no se tocó
+    index: int = 0                   # Posición dentro de la lista de su plataforma
+
 
 class IconGenerator:
     """Generador de iconos multiplataforma para Flutter"""
     
+    # Versión del motor de render: cambiarla invalida las salidas incrementales
+    RENDER_VERSION = 2
+    
     # Configuración de tamaños para Android
     ANDROID_SIZES = {
         'mipmap-mdpi': 48,
@@ -48,14 +98,198 @@ class IconGenerator:
         (512, 1), (512, 2),
     ]
     
-    def __init__(self, output_dir: str = "output"):
+    def __init__(
+        self,
+        output_dir: str = "output",
+        use_pyramid: bool = True,
+        link_duplicates: bool = False,
+        workers: int = 1,
+        write_threads: int = 2,
+        incremental: bool = False,
+        png_optimization: Optional[str] = None,
+        decode_max_side: Optional[int] = DECODE_MAX_SIDE,
+        max_source_pixels: int = MAX_SOURCE_PIXELS,
+        trace: bool = False,
+        sink: Optional[OutputSink] = None,
+        memory_budget_mb: Optional[float] = None,
+        quality: str = 'final',
+        reproducible: bool = False,
+        disk_cache: Optional[DiskCache] = None,
+        source_cache: Optional[SourceCache] = None,
+        fsync: bool = False
+    ):
         self.output_dir = output_dir
+        # fsync de cada salida antes de renombrarla (en los hilos de escritura)
+        self.fsync = fsync
+        # Destino de las salidas (por defecto, la carpeta output_dir); con otro
+        # destino output_dir solo es la raíz de las rutas de los resultados
+        self.sink = sink if sink is not None else DirectorySink(output_dir, fsync)
+        if self.sink.direct and os.path.abspath(self.sink.root) != os.path.abspath(output_dir):
+            raise ValueError("Un DirectorySink debe apuntar a output_dir")
+        if incremental and not self.sink.direct:
+            raise ValueError("El modo incremental requiere escribir en una carpeta (DirectorySink)")
+        if quality not in QUALITY_TIERS:
+            raise ValueError(f"Calidad desconocida: {quality} (opciones: {', '.join(QUALITY_TIERS)})")
+        if quality == 'draft' and png_optimization:
+            raise ValueError("La calidad 'draft' ya usa la compresión más rápida (sin png_optimization)")
+        # 'draft' cambia LANCZOS por BILINEAR y comprime con zlib nivel 1
+        self.quality = quality
+        # Salida reproducible: PNG sin metadatos con parámetros fijos y JSON con claves ordenadas
+        self.reproducible = reproducible
+        # Caché persistente de salidas codificadas (compartible entre ejecuciones y máquinas)
+        self.disk_cache = disk_cache
+        self._cache_inputs: Dict[str, str] = {}
+        # Orígenes decodificados compartidos con otros consumidores del proceso (vista previa)
+        self.source_cache = source_cache
+        self.use_pyramid = use_pyramid
+        self.link_duplicates = link_duplicates
+        # Número de procesos para generate_all (1 = secuencial)
+        self.workers = workers
+        # Hilos de codificación/escritura PNG en modo secuencial (0 = en línea)
+        self.write_threads = write_threads
+        # Regeneración incremental con manifiesto de build en output_dir
+        self.incremental = incremental
+        # Preset de optimización PNG ('fast', 'balanced', 'max'; None = por defecto)
+        self.png_optimization = png_optimization
+        self._png_optimizer = PngOptimizer(png_optimization) if png_optimization else None
+        self._encode_stats: Dict[str, dict] = {}
+        # Decodificación acotada: lado máximo necesario (None = completa) y límite de píxeles
+        self.decode_max_side = decode_max_side
+        self.max_source_pixels = max_source_pixels
+        # Trazado por etapas (None = desactivado, sin coste apreciable)
+        self.tracer: Optional[Tracer] = Tracer() if trace else None
+        self._trace_platform: Optional[str] = None
+        # Presupuesto de memoria por ejecución en MB (None = sin límite ni medición)
+        self.memory_budget_mb = memory_budget_mb
+        self._memory: Optional[MemoryBudget] = None
+        # Informe de memoria de la última ejecución (picos por plataforma)
+        self.memory_report: Optional[dict] = None
+        
+        # Pirámide de la última imagen origen usada
+        self._pyramid: Optional[ImagePyramid] = None
+        
+        # Caché de renders por contenido (activa solo durante generate_all)
+        self._render_cache: Optional[Dict[tuple, Image.Image]] = None
+        self._saved_renders: Dict[int, str] = {}
+        
+        # Trabajos diferidos (png/ico) mientras se compila el plan de render
+        self._pending_jobs: Optional[List[tuple]] = None
+        # Carpetas y archivos de texto capturados al compilar el plan (sin tocar el disco)
+        self._plan_dirs: Optional[List[str]] = None
+        self._plan_texts: Optional[Dict[str, Tuple[str, Optional[str]]]] = None
+        
+        # Pipeline de escritura (activo solo durante generate_all)
+        self._write_pipeline: Optional[WritePipeline] = None
+        
+        # Registros de archivos escritos pendientes de entregar (solo durante iter_generate)
+        self._records: Optional[deque] = None
+        # Archivos escritos que no llegaron a entregarse (iter_generate cerrado antes de tiempo)
+        self.undelivered: List[GeneratedFile] = []
         
     def hex_to_rgb(self, hex_color: str) -> Tuple[int, int, int]:
         """Convierte color hex a RGB tuple"""
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
     
+    def _render_options(self) -> dict:
+        """Opciones que afectan a los bytes de salida (huella incremental)"""
+        options = {
+            'version': self.RENDER_VERSION,
+            'pyramid': self.use_pyramid,
+            'png': self.png_optimization,
+            'decode': self.decode_max_side,
+        }
+        if self.quality != 'final':
+            # Solo fuera de 'final': las huellas de las salidas finales no cambian
+            options['quality'] = self.quality
+        if self.reproducible:
+            # Otra versión de Pillow/zlib puede cambiar los bytes: regenerar
+            options['reproducible'] = encoder_id()
+        return options
+    
+    def _worker_options(self) -> dict:
+        """Argumentos para reconstruir este generador en un proceso worker"""
+        return {
+            'output_dir': self.output_dir,
+            'use_pyramid': self.use_pyramid,
+            'link_duplicates': self.link_duplicates,
+            'incremental': self.incremental,
+            'png_optimization': self.png_optimization,
+            'memory_budget_mb': self.memory_budget_mb,
+            'quality': self.quality,
+            'reproducible': self.reproducible,
+            'disk_cache': self.disk_cache,
+            'fsync': self.fsync,
+        }
+    
+    def _span(self, stage: str, output_path: Optional[str] = None, **tags):
+        """
+        Span de trazado de una etapa, etiquetado con plataforma y tamaño
+        
+        Con el trazado desactivado devuelve un contexto vacío compartido.
+        """
+        if self.tracer is None:
+            return NO_SPAN
+        if output_path is not None:
+            tags['file'] = os.path.basename(output_path)
+            tags.setdefault('platform', self._platform_of(output_path))
+        tags.setdefault('platform', self._trace_platform)
+        return self.tracer.span(stage, **tags)
+    
+    def _relative(self, output_path: str) -> str:
+        """Ruta de una salida relativa a output_dir, con '/' (la que recibe el destino)"""
+        return os.path.relpath(output_path, self.output_dir).replace(os.sep, '/')
+    
+    def _makedirs(self, directory: str):
+        """Crea una carpeta de salida en el destino (al compilar el plan solo la anota)"""
+        if self._plan_dirs is not None:
+            self._plan_dirs.append(directory)
+            return
+        self.sink.makedirs(self._relative(directory))
+    
+    def _platform_of(self, output_path: str) -> Optional[str]:
+        """Plataforma de una salida (primer directorio bajo output_dir)"""
+        parts = os.path.relpath(output_path, self.output_dir).split(os.sep)
+        return parts[0] if len(parts) > 1 else None
+    
+    def _load_source(self, input_path: str) -> Image.Image:
+        """
+        Decodifica la imagen origen en RGBA (acotada a decode_max_side)
+        
+        Los SVG no se rasterizan aquí: se devuelve un SvgSource que
+        create_centered_image rasteriza a cada tamaño de contenido.
+        """
+        with self._span('decode', file=os.path.basename(input_path)):
+            if self.source_cache is not None:
+                return self.source_cache.source(input_path, self.decode_max_side, self.max_source_pixels)
+            if is_svg(input_path):
+                return SvgSource.from_file(input_path)
+            return load_source(input_path, self.decode_max_side, self.max_source_pixels)
+    
+    def _new_render_cache(self) -> Dict[tuple, Image.Image]:
+        """Caché de renders de una ejecución (una subclase puede compartirla entre ejecuciones)"""
+        if self._memory is not None:
+            return TrackedRenderCache(self._memory)
+        return {}
+    
+    def _get_pyramid(self, source_img: Image.Image) -> ImagePyramid:
+        """Obtiene (o construye una sola vez) la pirámide de la imagen origen"""
+        if self._pyramid is None or self._pyramid.source is not source_img:
+            with self._span('pyramid', size=source_img.size):
+                if self.source_cache is not None:
+                    self._pyramid = self.source_cache.pyramid(source_img)
+                else:
+                    self._pyramid = ImagePyramid(source_img)
+            if self._memory is not None:
+                for level in self._pyramid.levels[1:]:
+                    self._memory.hold_fixed(level)
+        return self._pyramid
+    
+    def _sample_memory(self, output_path: str):
+        """Registra el uso de memoria actual en el pico de la plataforma de una salida"""
+        if self._memory is not None:
+            self._memory.sample(self._platform_of(output_path))
+    
     def create_centered_image(
         self,
         source_img: Image.Image,
@@ -66,40 +300,368 @@ class IconGenerator:
         """
         Crea una imagen centrada en un canvas del tamaño especificado
         
+        Args:
+            source_img: Imagen origen (raster o SvgSource)
+            canvas_size: Tamaño del canvas (ancho, alto)
+            content_max_size: Tamaño máximo del contenido
+            bg_color: Color de fondo (RGBA)
+        """
+        resized_img = self._fit_content(source_img, content_max_size)
+        with self._span('composite', size=canvas_size):
+            canvas, _ = composite(resized_img, canvas_size, _centered(canvas_size, resized_img.size), bg_color)
+        return canvas
+    
+    def _fit_content(
+        self,
+        source_img: Image.Image,
+        content_max_size: Tuple[int, int]
+    ) -> Image.Image:
+        """Redimensiona el origen para que quepa en content_max_size (aspect ratio)"""
+        # Calcular escala manteniendo aspect ratio
+        # (un SVG puede ampliarse sin pérdida, no se limita a su tamaño intrínseco)
+        is_vector = isinstance(source_img, SvgSource)
+        new_width, new_height = fit_size(source_img.size, content_max_size, is_vector)
+        
+        # Vectorial: rasterizar directamente al tamaño final
+        # Raster: redimensionar con alta calidad desde el nivel de pirámide más cercano
+        if is_vector:
+            with self._span('resize', size=(new_width, new_height)):
+                return source_img.render((new_width, new_height))
+        
+        if self.use_pyramid:
+            resample_src, box = self._get_pyramid(source_img).level_for((new_width, new_height))
+        else:
+            resample_src, box = source_img, None
+        with self._span('resize', size=(new_width, new_height)):
+            if self.quality == 'draft':
+                return resample_src.resize(
+                    (new_width, new_height),
+                    Image.Resampling.BILINEAR,
+                    box=box,
+                    reducing_gap=DRAFT_REDUCING_GAP
+                )
+            return resample_src.resize(
+                (new_width, new_height), 
+                Image.Resampling.LANCZOS,
+                box=box
+            )
+    
+    def _render_icon(
+        self,
+        source_img: Image.Image,
+        canvas_size: Tuple[int, int],
+        content_max_size: Tuple[int, int],
+        bg_color: Tuple[int, int, int, int] = (255, 255, 255, 0),
+        flatten: Optional[Tuple[int, int, int]] = None
+    ) -> Image.Image:
+        """
+        Renderiza un icono usando la caché por contenido si está activa
+        
+        La clave es (canvas, contenido, fondo, aplanado): tamaños que coinciden
+        entre plataformas se renderizan una sola vez por generate_all.
+        
         Args:
             source_img: Imagen origen
             canvas_size: Tamaño del canvas (ancho, alto)
             content_max_size: Tamaño máximo del contenido
             bg_color: Color de fondo (RGBA)
+            flatten: Color RGB sobre el que aplanar el alpha (None = mantener RGBA)
         """
-        # Crear canvas transparente
-        canvas = Image.new("RGBA", canvas_size, bg_color)
+        key = (canvas_size, content_max_size, bg_color, flatten)
+        if self._pending_jobs is not None:
+            return _DeferredRender(key)
+        if self._render_cache is not None and key in self._render_cache:
+            return self._render_cache[key]
         
-        # Calcular escala manteniendo aspect ratio
-        width_ratio = content_max_size[0] / source_img.width
-        height_ratio = content_max_size[1] / source_img.height
-        scale_factor = min(width_ratio, height_ratio, 1.0)
+        rgba_key = (canvas_size, content_max_size, bg_color, None)
+        if flatten is None:
+            icon = self.create_centered_image(source_img, canvas_size, content_max_size, bg_color)
+        elif self._render_cache is not None and rgba_key in self._render_cache:
+            # El aplanado parte del render RGBA ya cacheado
+            with self._span('composite', size=canvas_size):
+                icon = flatten_alpha(self._render_cache[rgba_key], flatten)
+        else:
+            # Centrado, fondo y aplanado en un solo paso
+            resized_img = self._fit_content(source_img, content_max_size)
+            with self._span('composite', size=canvas_size):
+                rgba, icon = composite(
+                    resized_img, canvas_size, _centered(canvas_size, resized_img.size),
+                    bg_color, flatten
+                )
+            if self._render_cache is not None:
+                self._render_cache[rgba_key] = rgba
+        
+        if self._render_cache is not None:
+            self._render_cache[key] = icon
+        return icon
+    
+    def _save_png(self, icon: Image.Image, output_path: str, render_seconds: float = 0.0):
+        """
+        Guarda un render como PNG
         
-        new_width = int(source_img.width * scale_factor)
-        new_height = int(source_img.height * scale_factor)
+        Con link_duplicates, un render ya guardado en esta ejecución se enlaza
+        (hardlink) en vez de codificarse otra vez.
+        """
+        if isinstance(icon, _DeferredRender):
+            self._pending_jobs.append(('png', (icon.key,), output_path))
+            return
+        
+        previous_path = self._saved_renders.get(id(icon))
+        if previous_path and self.link_duplicates and self.sink.direct:
+            # El archivo original debe estar escrito antes de enlazarlo
+            if self._write_pipeline is None or self._write_pipeline.wait_for(previous_path):
+                try:
+                    if os.path.lexists(output_path):
+                        if os.path.samefile(previous_path, output_path):
+                            self._emit(output_path, 'png', size=icon.size, written=False)
+                            return
+                        os.remove(output_path)
+                    os.link(previous_path, output_path)
+                    self._emit(output_path, 'png', size=icon.size, render_seconds=render_seconds)
+                    return
+                except OSError:
+                    pass
+        
+        self._submit_write(
+            output_path,
+            lambda target: self._encode_png(icon, target, output_path),
+            size=icon.size,
+            render_seconds=render_seconds,
+            images=(icon,)
+        )
+        if self._render_cache is not None:
+            self._saved_renders[id(icon)] = output_path
+    
+    def _encode_png(self, icon: Image.Image, target, output_path: str):
+        """Codifica un PNG en target (ruta u objeto archivo), optimizado si hay preset"""
+        if isinstance(target, str):
+            replace_file(target, lambda f: self._encode_png(icon, f, output_path), fsync=self.fsync)
+            return
+        if self._png_optimizer is not None:
+            data, stats = self._png_optimizer.encode(icon)
+            self._encode_stats[output_path] = stats
+            if self.reproducible:
+                data = strip_ancillary_chunks(data)
+        elif self.reproducible:
+            data = encode_png(icon, self._compress_level())
+        elif self.quality == 'draft':
+            icon.save(target, 'PNG', compress_level=DRAFT_COMPRESS_LEVEL)
+            return
+        else:
+            icon.save(target, 'PNG')
+            return
+        target.write(data)
+    
+    def _compress_level(self) -> int:
+        """Nivel zlib de los PNG sin preset de optimización"""
+        return DRAFT_COMPRESS_LEVEL if self.quality == 'draft' else PNG_COMPRESS_LEVEL
+    
+    def _json(self, data: dict) -> str:
+        """Serializa un Contents.json/manifest.json (claves ordenadas si es reproducible)"""
+        return json.dumps(data, indent=2, sort_keys=self.reproducible)
+    
+    def _optimization_report(self, results: dict) -> dict:
+        """Bytes, ahorro y tiempo de codificación PNG por plataforma"""
+        report = {}
+        for platform in ('android', 'ios', 'web', 'windows', 'macos'):
+            stats = [self._encode_stats[p] for p in results[platform] if p in self._encode_stats]
+            if not stats:
+                continue
+            has_baseline = all(s['baseline'] is not None for s in stats)
+            report[platform] = {
+                'files': len(stats),
+                'bytes': sum(s['bytes'] for s in stats),
+                'saved': sum(s['baseline'] - s['bytes'] for s in stats) if has_baseline else None,
+                'seconds': round(sum(s['seconds'] for s in stats), 4),
+            }
+        return report
+    
+    def _save_ico(self, layers: list, output_path: str, render_seconds: float = 0.0):
+        """
+        Guarda un ICO multi-resolución a partir de los renders de cada capa
         
-        # Redimensionar con alta calidad
-        resized_img = source_img.resize(
-            (new_width, new_height), 
-            Image.Resampling.LANCZOS
+        Cada capa se empaqueta tal cual (sin redimensionar ni perder el alpha);
+        la de 256 px va en PNG, con el preset de optimización si lo hay.
+        """
+        if any(isinstance(layer, _DeferredRender) for layer in layers):
+            self._pending_jobs.append(('ico', tuple(layer.key for layer in layers), output_path))
+            return
+        
+        png_encoder = None
+        if self._png_optimizer is not None and self.reproducible:
+            png_encoder = lambda layer: strip_ancillary_chunks(self._png_optimizer.encode(layer)[0])
+        elif self._png_optimizer is not None:
+            png_encoder = lambda layer: self._png_optimizer.encode(layer)[0]
+        elif self.reproducible or self.quality == 'draft':
+            png_encoder = lambda layer: encode_png(layer, self._compress_level())
+        self._submit_write(
+            output_path,
+            lambda target: write_ico(layers, target, png_encoder),
+            stage='ico',
+            size=max(layer.size for layer in layers),
+            render_seconds=render_seconds,
+            images=layers
         )
+    
+    def _submit_write(
+        self,
+        output_path: str,
+        encode,
+        stage: str = 'encode',
+        size: Optional[Tuple[int, int]] = None,
+        render_seconds: float = 0.0,
+        images: tuple = ()
+    ):
+        """
+        Escribe una salida codificada, en el pipeline si está activo
+        
+        Con presupuesto de memoria, las imágenes que retiene la escritura
+        cuentan hasta que termina; si el presupuesto está agotado se espera a
+        las escrituras en vuelo antes de encolar otra (los renders grandes
+        dejan de solaparse con su codificación).
+        """
+        if self._write_pipeline is None:
+            self._write_output(output_path, encode, stage, size, render_seconds)
+            return
+        memory = self._memory
+        if memory is None:
+            self._write_pipeline.submit(
+                output_path,
+                lambda: self._write_output(output_path, encode, stage, size, render_seconds)
+            )
+            return
+        
+        if memory.over() and self._write_pipeline.wait_all():
+            memory.waits += 1
+        for image in images:
+            memory.hold(image)
+        
+        def write():
+            try:
+                self._write_output(output_path, encode, stage, size, render_seconds)
+            finally:
+                for image in images:
+                    memory.release(image)
+        
+        self._write_pipeline.submit(output_path, write)
+    
+    def _write_output(
+        self,
+        output_path: str,
+        encode,
+        stage: str = 'encode',
+        size: Optional[Tuple[int, int]] = None,
+        render_seconds: float = 0.0
+    ):
+        """
+        Codifica y escribe un archivo binario
+        
+        En modo incremental se codifica en memoria y no se toca el archivo si
+        sus bytes no cambian (se conserva su fecha de modificación). Con el
+        trazado activo o durante iter_generate también se codifica en memoria
+        (para medir la codificación y la escritura por separado y para
+        calcular el hash del registro sin releer el archivo).
+        
+        Args:
+            output_path: Ruta destino
+            encode: Función que codifica en una ruta o un objeto archivo
+            stage: Etapa de codificación ('encode' para PNG, 'ico')
+            size: Tamaño del icono (traza y registro)
+            render_seconds: Tiempo de render del icono (registro)
+        """
+        if not self.incremental and self.tracer is None and self._records is None and self.sink.direct:
+            replace_file(output_path, encode, fsync=self.fsync)
+            return
         
-        # Calcular posición centrada
-        pos_x = (canvas_size[0] - new_width) // 2
-        pos_y = (canvas_size[1] - new_height) // 2
+        buffer = io.BytesIO()
+        start = time.perf_counter()
+        with self._span(stage, output_path, size=size):
+            encode(buffer)
+        encode_seconds = time.perf_counter() - start
+        data = buffer.getvalue()
+        self._sample_memory(output_path)
+        with self._span('io', output_path, bytes=len(data)):
+            written = self._store(output_path, data)
+        cache_key = self._cache_inputs.get(output_path)
+        if cache_key is not None:
+            self.disk_cache.put(cache_key, data)
+        
+        self._emit(
+            output_path, 'ico' if stage == 'ico' else 'png', data, size,
+            render_seconds, encode_seconds, written
+        )
+    
+    def _write_text(self, output_path: str, content: str, encoding: Optional[str] = None):
+        """Escribe un archivo de texto (JSON/YAML) respetando el modo incremental"""
+        if self._plan_texts is not None:
+            self._plan_texts[output_path] = (content, encoding)
+            return
+        kind = 'yaml' if output_path.endswith('.yaml') else 'json'
+        with self._span('io', output_path):
+            if self.incremental or not self.sink.direct:
+                data = content.encode(encoding or 'utf-8')
+                self._emit(output_path, kind, data, written=self._store(output_path, data))
+                return
+            replace_file(output_path, lambda f: f.write(content), 'w', encoding, self.fsync)
+        # El modo texto puede traducir saltos de línea: el registro se calcula del archivo
+        self._emit(output_path, kind)
+    
+    def _store(self, output_path: str, data: bytes) -> bool:
+        """Guarda bytes ya codificados en el destino (True si se escribieron)"""
+        if not self.sink.direct:
+            return self.sink.write(self._relative(output_path), data)
+        if self.incremental:
+            return self._write_if_changed(output_path, data)
+        replace_file(output_path, lambda f: f.write(data), fsync=self.fsync)
+        return True
+    
+    def _write_if_changed(self, output_path: str, data: bytes) -> bool:
+        """Escribe los bytes solo si difieren del archivo existente (True si escribió)"""
+        try:
+            with open(output_path, 'rb') as f:
+                if f.read() == data:
+                    return False
+        except OSError:
+            pass
+        replace_file(output_path, lambda f: f.write(data), fsync=self.fsync)
+        return True
+    
+    def _emit(
+        self,
+        output_path: str,
+        kind: str,
+        data: Optional[bytes] = None,
+        size: Optional[Tuple[int, int]] = None,
+        render_seconds: float = 0.0,
+        encode_seconds: float = 0.0,
+        written: bool = True
+    ):
+        """
+        Registra un archivo escrito para iter_generate (no hace nada fuera de él)
         
-        # Pegar la imagen
-        if resized_img.mode == 'RGBA':
-            canvas.paste(resized_img, (pos_x, pos_y), mask=resized_img)
+        Sin data, bytes y hash se leen del archivo (enlaces, salidas al día, texto).
+        Lo que el destino descarta (p. ej. el YAML en un proyecto Flutter) no
+        se registra: no cuenta en los resultados ni en el total.
+        """
+        if self._records is None:
+            return
+        if not written and not self.sink.direct:
+            return
+        if data is None:
+            nbytes, digest = os.path.getsize(output_path), hash_file(output_path)
         else:
-            canvas.paste(resized_img, (pos_x, pos_y))
-            
-        return canvas
+            nbytes, digest = len(data), hash_bytes(data)
+        self._records.append(GeneratedFile(
+            platform=self._platform_of(output_path),
+            kind=kind,
+            size=size,
+            path=output_path,
+            bytes=nbytes,
+            sha256=digest,
+            render_seconds=round(render_seconds, 6),
+            encode_seconds=round(encode_seconds, 6),
+            written=written,
+        ))
     
     def generate_android_icons(
         self,
@@ -123,72 +685,49 @@ class IconGenerator:
         
         # Crear directorios
         for folder in self.ANDROID_SIZES.keys():
-            os.makedirs(os.path.join(android_dir, folder), exist_ok=True)
+            self._makedirs(os.path.join(android_dir, folder))
+        
+        # Con fondo: canvas opaco y aplanado a RGB sobre el mismo color
+        bg = self._get_bg_color_rgba(bg_color)
+        flatten = self._get_bg_color_rgb(bg_color)
         
         # Generar iconos launcher
         for folder, size in self.ANDROID_SIZES.items():
-            # Icono con fondo
-            if bg_color:
-                rgb = self.hex_to_rgb(bg_color)
-                bg = rgb + (255,)
-                icon = self.create_centered_image(
-                    source_img,
-                    (size, size),
-                    (int(size * scale_factor), int(size * scale_factor)),
-                    bg
-                )
-                # Convertir a RGB si no tiene transparencia
-                if icon.mode == 'RGBA':
-                    background = Image.new('RGB', icon.size, rgb)
-                    background.paste(icon, mask=icon.split()[-1])
-                    icon = background
-            else:
-                icon = self.create_centered_image(
-                    source_img,
-                    (size, size),
-                    (int(size * scale_factor), int(size * scale_factor))
-                )
+            icon = self._render_icon(
+                source_img,
+                (size, size),
+                (int(size * scale_factor), int(size * scale_factor)),
+                bg,
+                flatten
+            )
             
             output_path = os.path.join(android_dir, folder, 'ic_launcher.png')
-            icon.save(output_path, 'PNG')
+            self._save_png(icon, output_path)
             generated_files.append(output_path)
         
         # Generar foreground adaptativo (432x432)
         adaptive_size = 432
-        adaptive_icon = self.create_centered_image(
+        adaptive_icon = self._render_icon(
             source_img,
             (adaptive_size, adaptive_size),
             (int(adaptive_size * 0.75), int(adaptive_size * 0.75))
         )
         adaptive_path = os.path.join(android_dir, 'ic_launcher_foreground.png')
-        adaptive_icon.save(adaptive_path, 'PNG')
+        self._save_png(adaptive_icon, adaptive_path)
         generated_files.append(adaptive_path)
         
         # Generar icono maestro 1024x1024
         master_size = 1024
-        if bg_color:
-            rgb = self.hex_to_rgb(bg_color)
-            bg = rgb + (255,)
-            master_icon = self.create_centered_image(
-                source_img,
-                (master_size, master_size),
-                (int(master_size * 0.9), int(master_size * 0.9)),
-                bg
-            )
-            # Convertir a RGB
-            if master_icon.mode == 'RGBA':
-                background = Image.new('RGB', master_icon.size, rgb)
-                background.paste(master_icon, mask=master_icon.split()[-1])
-                master_icon = background
-        else:
-            master_icon = self.create_centered_image(
-                source_img,
-                (master_size, master_size),
-                (int(master_size * 0.9), int(master_size * 0.9))
-            )
+        master_icon = self._render_icon(
+            source_img,
+            (master_size, master_size),
+            (int(master_size * 0.9), int(master_size * 0.9)),
+            bg,
+            flatten
+        )
         
         master_path = os.path.join(android_dir, 'ic_launcher_1024x1024.png')
-        master_icon.save(master_path, 'PNG')
+        self._save_png(master_icon, master_path)
         generated_files.append(master_path)
         
         return generated_files
@@ -210,14 +749,14 @@ class IconGenerator:
         """
         generated_files = []
         ios_dir = os.path.join(self.output_dir, 'ios', 'AppIcon.appiconset')
-        os.makedirs(ios_dir, exist_ok=True)
+        self._makedirs(ios_dir)
         
         # Generar Contents.json
         contents = self._generate_ios_contents_json()
         contents_path = os.path.join(ios_dir, 'Contents.json')
-        with open(contents_path, 'w') as f:
-            import json
-            json.dump(contents, f, indent=2)
+        with self._span('json', contents_path):
+            content = self._json(contents)
+        self._write_text(contents_path, content)
         generated_files.append(contents_path)
         
         # Generar iconos
@@ -225,21 +764,16 @@ class IconGenerator:
             actual_size = int(size * scale)
             filename = f"Icon-App-{size}x{size}@{scale}x.png"
             
-            icon = self.create_centered_image(
+            # Convertir a RGB para iOS (sin transparencia)
+            icon = self._render_icon(
                 source_img,
                 (actual_size, actual_size),
-                (int(actual_size * scale_factor), int(actual_size * scale_factor))
+                (int(actual_size * scale_factor), int(actual_size * scale_factor)),
+                flatten=(255, 255, 255)
             )
             
             output_path = os.path.join(ios_dir, filename)
-            
-            # Convertir a RGB para iOS (sin transparencia)
-            if icon.mode == 'RGBA':
-                background = Image.new('RGB', icon.size, (255, 255, 255))
-                background.paste(icon, mask=icon.split()[-1])
-                icon = background
-            
-            icon.save(output_path, 'PNG')
+            self._save_png(icon, output_path)
             generated_files.append(output_path)
         
         return generated_files
@@ -308,33 +842,27 @@ class IconGenerator:
         """
         generated_files = []
         web_dir = os.path.join(self.output_dir, 'web')
-        os.makedirs(web_dir, exist_ok=True)
+        self._makedirs(web_dir)
         
         # Generar favicon.ico (multi-resolución)
         favicon_images = []
         for size in [16, 32, 48]:
-            icon = self.create_centered_image(
+            icon = self._render_icon(
                 source_img,
                 (size, size),
                 (int(size * scale_factor), int(size * scale_factor)),
                 self._get_bg_color_rgba(bg_color)
             )
-            if icon.mode == 'RGBA':
-                icon = icon.convert('RGB')
             favicon_images.append(icon)
         
         # Guardar favicon.ico
         favicon_path = os.path.join(web_dir, 'favicon.ico')
-        favicon_images[0].save(
-            favicon_path,
-            format='ICO',
-            sizes=[(img.width, img.height) for img in favicon_images]
-        )
+        self._save_ico(favicon_images, favicon_path)
         generated_files.append(favicon_path)
         
         # Generar iconos PWA
         for size in self.WEB_SIZES:
-            icon = self.create_centered_image(
+            icon = self._render_icon(
                 source_img,
                 (size, size),
                 (int(size * scale_factor), int(size * scale_factor)),
@@ -342,14 +870,15 @@ class IconGenerator:
             )
             
             output_path = os.path.join(web_dir, f'icon-{size}x{size}.png')
-            icon.save(output_path, 'PNG')
+            self._save_png(icon, output_path)
             generated_files.append(output_path)
         
         # Generar manifest.json para PWA
         manifest = self._generate_web_manifest(bg_color)
         manifest_path = os.path.join(web_dir, 'manifest.json')
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest, f, indent=2)
+        with self._span('json', manifest_path):
+            content = self._json(manifest)
+        self._write_text(manifest_path, content)
         generated_files.append(manifest_path)
         
         return generated_files
@@ -393,37 +922,36 @@ class IconGenerator:
         """
         generated_files = []
         windows_dir = os.path.join(self.output_dir, 'windows')
-        os.makedirs(windows_dir, exist_ok=True)
+        self._makedirs(windows_dir)
         
         # Generar iconos individuales
         icons_for_ico = []
         for size in self.WINDOWS_SIZES:
-            icon = self.create_centered_image(
+            content_size = (int(size * scale_factor), int(size * scale_factor))
+            icon = self._render_icon(
                 source_img,
                 (size, size),
-                (int(size * scale_factor), int(size * scale_factor)),
+                content_size,
                 self._get_bg_color_rgba(bg_color)
             )
             
-            # Guardar PNG individual
+            # Guardar PNG individual (aplanado sobre el fondo)
             png_path = os.path.join(windows_dir, f'app_icon_{size}.png')
-            if icon.mode == 'RGBA':
-                icon_rgb = Image.new('RGB', icon.size, self._get_bg_color_rgb(bg_color) or (255, 255, 255))
-                icon_rgb.paste(icon, mask=icon.split()[-1])
-                icon_rgb.save(png_path, 'PNG')
-            else:
-                icon.save(png_path, 'PNG')
+            icon_rgb = self._render_icon(
+                source_img,
+                (size, size),
+                content_size,
+                self._get_bg_color_rgba(bg_color),
+                self._get_bg_color_rgb(bg_color) or (255, 255, 255)
+            )
+            self._save_png(icon_rgb, png_path)
             generated_files.append(png_path)
             
-            icons_for_ico.append(icon.convert('RGB') if icon.mode == 'RGBA' else icon)
+            icons_for_ico.append(icon)
         
         # Generar app_icon.ico (multi-resolución)
         ico_path = os.path.join(windows_dir, 'app_icon.ico')
-        icons_for_ico[0].save(
-            ico_path,
-            format='ICO',
-            sizes=[(img.width, img.height) for img in icons_for_ico]
-        )
+        self._save_ico(icons_for_ico, ico_path)
         generated_files.append(ico_path)
         
         return generated_files
@@ -447,13 +975,14 @@ class IconGenerator:
         """
         generated_files = []
         macos_dir = os.path.join(self.output_dir, 'macos', 'Runner', 'Assets.xcassets', 'AppIcon.appiconset')
-        os.makedirs(macos_dir, exist_ok=True)
+        self._makedirs(macos_dir)
         
         # Generar Contents.json
         contents = self._generate_macos_contents_json()
         contents_path = os.path.join(macos_dir, 'Contents.json')
-        with open(contents_path, 'w') as f:
-            json.dump(contents, f, indent=2)
+        with self._span('json', contents_path):
+            content = self._json(contents)
+        self._write_text(contents_path, content)
         generated_files.append(contents_path)
         
         # Generar iconos
@@ -461,23 +990,17 @@ class IconGenerator:
             actual_size = int(size * scale)
             filename = f'app_icon_{size}x{size}{"@2x" if scale == 2 else ""}.png'
             
-            icon = self.create_centered_image(
+            # Convertir a RGB para macOS
+            icon = self._render_icon(
                 source_img,
                 (actual_size, actual_size),
                 (int(actual_size * scale_factor), int(actual_size * scale_factor)),
-                self._get_bg_color_rgba(bg_color)
+                self._get_bg_color_rgba(bg_color),
+                self._get_bg_color_rgb(bg_color) or (255, 255, 255)
             )
             
             output_path = os.path.join(macos_dir, filename)
-            
-            # Convertir a RGB para macOS
-            if icon.mode == 'RGBA':
-                bg_rgb = self._get_bg_color_rgb(bg_color) or (255, 255, 255)
-                background = Image.new('RGB', icon.size, bg_rgb)
-                background.paste(icon, mask=icon.split()[-1])
-                icon = background
-            
-            icon.save(output_path, 'PNG')
+            self._save_png(icon, output_path)
             generated_files.append(output_path)
         
         return generated_files
@@ -565,11 +1088,11 @@ class IconGenerator:
         Returns:
             Ruta al archivo generado
         """
-        yaml_content = self.generate_flutter_launcher_icons_yaml(image_path, platforms, bg_color)
         yaml_path = os.path.join(self.output_dir, 'flutter_launcher_icons.yaml')
+        with self._span('yaml', yaml_path):
+            yaml_content = self.generate_flutter_launcher_icons_yaml(image_path, platforms, bg_color)
         
-        with open(yaml_path, 'w', encoding='utf-8') as f:
-            f.write(yaml_content)
+        self._write_text(yaml_path, yaml_content, encoding='utf-8')
         
         return yaml_path
     
@@ -579,11 +1102,14 @@ class IconGenerator:
         bg_color: Optional[str] = None,
         android_scale: float = 0.8,
         ios_scale: float = 0.85,
-        platforms: List[str] = None
+        platforms: List[str] = None,
+        progress: Optional[Callable[[GeneratedFile], None]] = None
     ) -> dict:
         """
         Genera todos los iconos para las plataformas especificadas
         
+        Recolecta los registros de iter_generate en el diccionario de resultados.
+        
         Args:
             input_path: Ruta a la imagen origen
             bg_color: Color de fondo en hex (opcional)
@@ -591,16 +1117,464 @@ class IconGenerator:
             ios_scale: Factor de escala para iOS
             platforms: Lista de plataformas ('android', 'ios', 'web', 'windows', 'macos')
                       Si es None, genera para todas
+            progress: Callback opcional con cada GeneratedFile en cuanto se escribe
             
         Returns:
             Diccionario con rutas de archivos generados
         """
+        records = []
+        for record in self.iter_generate(input_path, bg_color, android_scale, ios_scale, platforms):
+            records.append(record)
+            if progress:
+                progress(record)
+        return self.collect_results(records)
+    
+    def collect_results(self, records: List[GeneratedFile]) -> dict:
+        """Diccionario de resultados de generate_all a partir de los registros de iter_generate"""
+        results = {
+            'android': [],
+            'ios': [],
+            'web': [],
+            'windows': [],
+            'macos': [],
+            'yaml': None,
+            'total': len(records)
+        }
+        for record in sorted(records, key=lambda r: r.index):
+            if record.platform is None:
+                results['yaml'] = record.path
+            else:
+                results[record.platform].append(record.path)
+        
+        if self._png_optimizer is not None:
+            results['optimization'] = self._optimization_report(results)
+        if self.memory_report is not None:
+            results['memory'] = self.memory_report
+        if self.disk_cache is not None:
+            results['disk_cache'] = self.disk_cache.stats()
+        
+        return results
+    
+    def compile_plan(
+        self,
+        input_path: str,
+        bg_color: Optional[str] = None,
+        android_scale: float = 0.8,
+        ios_scale: float = 0.85,
+        platforms: List[str] = None
+    ) -> RenderPlan:
+        """
+        Compila el plan de render de generate_all sin decodificar ni escribir nada
+        
+        Recorre los generate_*_icons en modo planificación: los renders quedan
+        como claves, las carpetas y los JSON/YAML se capturan en memoria.
+        
+        Args:
+            Los mismos que generate_all
+            
+        Returns:
+            RenderPlan con las salidas en orden; plan.estimate() da bytes y
+            tiempo estimados y plan.format_report() el informe de simulación
+        """
+        if platforms is None:
+            platforms = ['android', 'ios', 'web', 'windows', 'macos']
+        
+        self._pending_jobs, self._plan_dirs, self._plan_texts = [], [], {}
+        try:
+            results = self._generate_platforms(None, bg_color, android_scale, ios_scale, platforms)
+            results['yaml'] = self.save_flutter_launcher_icons_yaml(
+                'assets/icon/icon.png',  # Ruta sugerida en proyecto Flutter
+                platforms,
+                bg_color
+            )
+            jobs = {path: (kind, keys) for kind, keys, path in self._pending_jobs}
+            directories, texts = self._plan_dirs, self._plan_texts
+        finally:
+            self._pending_jobs, self._plan_dirs, self._plan_texts = None, None, None
+        
+        def planned_text(platform: Optional[str], path: str, index: int) -> PlannedFile:
+            content, encoding = texts[path]
+            kind = 'yaml' if path.endswith('.yaml') else 'json'
+            return PlannedFile(platform, kind, path, index, (), content.encode(encoding or 'utf-8'), encoding)
+        
+        files = []
+        for platform in ('android', 'ios', 'web', 'windows', 'macos'):
+            for index, path in enumerate(results[platform]):
+                if path in jobs:
+                    kind, keys = jobs[path]
+                    files.append(PlannedFile(platform, kind, path, index, keys))
+                else:
+                    files.append(planned_text(platform, path, index))
+        files.append(planned_text(None, results['yaml'], 0))
+        
+        return RenderPlan(input_path, files, directories, self.decode_max_side, self.use_pyramid)
+    
+    def iter_generate(
+        self,
+        input_path: str,
+        bg_color: Optional[str] = None,
+        android_scale: float = 0.8,
+        ios_scale: float = 0.85,
+        platforms: List[str] = None
+    ) -> Iterator[GeneratedFile]:
+        """
+        Genera los iconos entregando cada archivo en cuanto queda escrito
+        
+        Primero se compila el plan de render (compile_plan, sin decodificar la
+        imagen) y luego se ejecuta trabajo a trabajo; cada archivo terminado se entrega
+        como GeneratedFile, así el consumidor puede copiar o subir mientras
+        continúa el render. El orden de entrega es el de finalización; index
+        da la posición de cada archivo en la lista de su plataforma.
+        
+        Args:
+            Los mismos que generate_all
+            
+        Yields:
+            GeneratedFile por cada salida (incluidas las que ya estaban al día)
+        """
         if platforms is None:
             platforms = ['android', 'ios', 'web', 'windows', 'macos']
         
-        # Cargar imagen
-        source_img = Image.open(input_path).convert("RGBA")
+        with self._span('generate_all', category=PHASE, platforms=platforms):
+            yield from self._iter_generate(input_path, bg_color, android_scale, ios_scale, platforms)
+    
+    def _iter_generate(
+        self,
+        input_path: str,
+        bg_color: Optional[str],
+        android_scale: float,
+        ios_scale: float,
+        platforms: List[str]
+    ) -> Iterator[GeneratedFile]:
+        """Cuerpo de iter_generate (plan, render, escritura y manifiesto)"""
+        manifest = BuildManifest(self.output_dir) if self.incremental else None
+        job_inputs = {}
+        source_hash = None
+        plan = self.compile_plan(input_path, bg_color, android_scale, ios_scale, platforms)
+        positions = {planned.path: (planned.platform, planned.index) for planned in plan.files}
         
+        def ready() -> Iterator[GeneratedFile]:
+            # Entrega los registros acumulados con su plataforma y posición planificadas
+            while self._records:
+                record = self._records.popleft()
+                platform, index = positions.get(record.path, (None, 0))
+                yield record._replace(platform=platform, index=index)
+        
+        self._records = deque()
+        self.undelivered = []
+        self._encode_stats = {}
+        if self.memory_budget_mb is not None:
+            self._memory = MemoryBudget(self.memory_budget_mb)
+            self._memory.start()
+            self.memory_report = None
+        try:
+            # Activar caché de renders: cada clave única se renderiza una vez
+            self._render_cache = self._new_render_cache()
+            self._saved_renders = {}
+            if self.workers <= 1 and self.write_threads > 0:
+                self._write_pipeline = WritePipeline(self.write_threads)
+            try:
+                for directory in plan.directories:
+                    self._makedirs(directory)
+                for planned in plan.texts:
+                    if planned.platform is not None:
+                        self._write_planned_text(planned)
+                yield from ready()
+                
+                jobs = plan.jobs
+                
+                if manifest is not None or self.disk_cache is not None:
+                    # Huella de cada salida: origen, opciones de render y claves del trabajo
+                    source_hash = hash_file(input_path)
+                    options = self._render_options()
+                    job_inputs = {
+                        path: BuildManifest.fingerprint(source_hash, options, kind, keys)
+                        for kind, keys, path in jobs
+                    }
+                
+                if manifest is not None:
+                    pending = []
+                    for kind, keys, path in jobs:
+                        if manifest.is_up_to_date(path, job_inputs[path]):
+                            self._emit(path, kind, size=_job_size(keys), written=False)
+                        else:
+                            pending.append((kind, keys, path))
+                    jobs = pending
+                    yield from ready()
+                
+                if self.disk_cache is not None and jobs:
+                    jobs = self._restore_cached(jobs, job_inputs)
+                    self._cache_inputs = {path: job_inputs[path] for _, _, path in jobs}
+                    yield from ready()
+                
+                if jobs:
+                    source_img = self._load_source(input_path)
+                    workers = self.workers
+                    if self._memory is not None:
+                        self._memory.hold_fixed(source_img)
+                        workers = self._budget_workers(source_img, jobs)
+                        self._memory.workers = workers
+                    if workers > 1:
+                        pool_jobs = self._iter_jobs_in_pool(source_img, jobs, workers)
+                        try:
+                            for _ in pool_jobs:
+                                yield from ready()
+                        finally:
+                            # Cierre explícito: cancela lo pendiente y recoge lo ya escrito
+                            pool_jobs.close()
+                    else:
+                        # Orden del plan: cada render se libera tras su último consumidor
+                        jobs = schedule_jobs(jobs)
+                        for position, released in enumerate(release_points(jobs)):
+                            self._run_jobs(source_img, [jobs[position]])
+                            self._release_renders(released)
+                            if self._memory is not None and self._memory.over():
+                                self._evict_renders(jobs[position + 1:position + 2])
+                            yield from ready()
+                
+                if self._write_pipeline is not None:
+                    self._write_pipeline.close()
+                yield from ready()
+            finally:
+                if self._write_pipeline is not None:
+                    self._write_pipeline.close(raise_errors=False)
+                    self._write_pipeline = None
+                self._render_cache = None
+                self._saved_renders = {}
+                self._cache_inputs = {}
+                # El origen y sus niveles no se retienen más allá de la ejecución
+                self._pyramid = None
+                if self._memory is not None:
+                    self._memory.stop()
+                    self.memory_report = self._memory.report()
+                    self._memory = None
+            
+            # Archivo YAML para flutter_launcher_icons (al final: la ejecución ha terminado)
+            for planned in plan.texts:
+                if planned.platform is None:
+                    self._write_planned_text(planned)
+            yield from ready()
+            
+            if manifest is not None:
+                current_paths = [planned.path for planned in plan.files]
+                self._update_manifest(manifest, current_paths, job_inputs, source_hash, {
+                    'bg_color': bg_color,
+                    'android_scale': android_scale,
+                    'ios_scale': ios_scale,
+                    'platforms': platforms,
+                })
+        finally:
+            # Lo que quede en la cola ya está escrito pero no se entregó
+            self.undelivered = list(self._records)
+            self._records = None
+    
+    def _restore_cached(self, jobs: List[tuple], job_inputs: Dict[str, str]) -> List[tuple]:
+        """
+        Copia desde la caché en disco las salidas ya codificadas
+        
+        Returns:
+            Trabajos que no estaban en la caché (se renderizan y se insertan al escribirse)
+        """
+        pending = []
+        for kind, keys, path in jobs:
+            data = self.disk_cache.get(job_inputs[path])
+            if data is None:
+                pending.append((kind, keys, path))
+                continue
+            with self._span('io', path, bytes=len(data)):
+                written = self._store(path, data)
+            self._emit(path, kind, data, _job_size(keys), written=written)
+        return pending
+    
+    def _write_planned_text(self, planned: PlannedFile):
+        """Escribe un JSON/YAML capturado al compilar el plan"""
+        self._write_text(planned.path, planned.data.decode(planned.encoding or 'utf-8'), planned.encoding)
+    
+    def _release_renders(self, keys: List[tuple]):
+        """
+        Libera renders que ya no tienen consumidores en el plan
+        
+        Solo en la caché propia de la ejecución: una caché compartida entre
+        ejecuciones (subclases) los conserva.
+        """
+        if not isinstance(self._render_cache, dict):
+            return
+        for key in keys:
+            icon = self._render_cache.pop(key, None)
+            if icon is not None:
+                self._saved_renders.pop(id(icon), None)
+    
+    def _evict_renders(self, upcoming: List[tuple]):
+        """
+        Presupuesto agotado: suelta los renders en caché que no usa el siguiente trabajo
+        
+        Los que se necesiten más adelante se vuelven a renderizar (más tiempo,
+        menos memoria retenida).
+        """
+        if not isinstance(self._render_cache, dict):
+            return
+        keep = set()
+        for _, keys, _ in upcoming:
+            keep.update(keys)
+            keep.update(base_key(key) for key in keys)
+        evicted = [key for key in self._render_cache if key not in keep]
+        self._release_renders(evicted)
+        self._memory.evictions += len(evicted)
+    
+    def _budget_workers(self, source_img: Image.Image, jobs: List[tuple]) -> int:
+        """
+        Procesos que caben en el presupuesto de memoria (1 = ejecución secuencial)
+        
+        Cada worker retiene una copia del origen con su pirámide (4/3 del
+        origen) y, en el peor caso, el render mayor en RGBA y aplanado.
+        """
+        if self.workers <= 1:
+            return 1
+        source_bytes = image_nbytes(source_img)
+        largest = max(_job_size(keys)[0] * _job_size(keys)[1] for _, keys, _ in jobs) * 4
+        per_worker = source_bytes * 4 // 3 + largest * 2
+        available = self._memory.limit - self._memory.current()
+        return max(1, min(self.workers, available // max(per_worker, 1)))
+    
+    def _update_manifest(
+        self,
+        manifest: BuildManifest,
+        current_paths: List[str],
+        job_inputs: Dict[str, str],
+        source_hash: str,
+        params: dict
+    ):
+        """Registra las salidas actuales, elimina las obsoletas y guarda el manifiesto"""
+        for path in current_paths:
+            manifest.record(path, job_inputs.get(path))
+        manifest.remove_stale(current_paths)
+        manifest.save(source_hash, params)
+    
+    def _run_jobs(self, source_img: Image.Image, jobs: List[tuple]):
+        """Ejecuta trabajos diferidos (png/ico) en este proceso"""
+        for kind, keys, path in jobs:
+            self._trace_platform = self._platform_of(path)
+            start = time.perf_counter()
+            layers = [self._render_icon(source_img, *key) for key in keys]
+            render_seconds = time.perf_counter() - start
+            if self._memory is not None:
+                self._memory.working_set(self._working_set(keys, layers))
+            self._sample_memory(path)
+            if kind == 'ico':
+                self._save_ico(layers, path, render_seconds)
+            else:
+                self._save_png(layers[0], path, render_seconds)
+    
+    def _working_set(self, keys: tuple, layers: list) -> int:
+        """Bytes que un trabajo necesita a la vez: sus renders y las bases RGBA de los aplanados"""
+        images = {id(layer): layer for layer in layers}
+        if isinstance(self._render_cache, dict):
+            for key in keys:
+                base = self._render_cache.get(base_key(key))
+                if base is not None:
+                    images[id(base)] = base
+        return sum(image_nbytes(image) for image in images.values())
+    
+    def _iter_jobs_in_pool(
+        self,
+        source_img: Image.Image,
+        jobs: List[tuple],
+        workers: Optional[int] = None
+    ) -> Iterator[None]:
+        """
+        Ejecuta los trabajos diferidos en un pool de procesos
+        
+        Los PNG se agrupan por clave de render (un único render por clave) y la
+        imagen decodificada se envía una sola vez a cada worker al iniciarlo.
+        Con un destino que no es una carpeta, los workers devuelven los bytes
+        y se escriben en el destino desde este proceso.
+        Avanza una vez por tarea terminada (sus registros quedan en _records);
+        si el consumidor se detiene, las tareas pendientes se cancelan.
+        Con presupuesto de memoria, cada worker recibe su parte y devuelve sus picos.
+        """
+        workers = workers or self.workers
+        options = self._worker_options()
+        if self._memory is not None:
+            options['memory_budget_mb'] = self.memory_budget_mb / workers
+        png_paths: Dict[tuple, List[str]] = {}
+        tasks = []
+        for kind, keys, path in jobs:
+            if kind == 'png':
+                png_paths.setdefault(keys[0], []).append(path)
+            else:
+                tasks.append((kind, keys, [path]))
+        tasks.extend(('png', (key,), paths) for key, paths in png_paths.items())
+        
+        # Renders grandes primero para equilibrar la carga
+        tasks.sort(key=lambda task: max(k[0][0] * k[0][1] for k in task[1]), reverse=True)
+        
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(
+                _source_payload(source_img),
+                options,
+                self.tracer.origin_ns if self.tracer is not None else None,
+                not self.sink.direct
+            )
+        )
+        errors = {}
+        futures = {}
+        
+        def collect(future):
+            # Incorpora archivos, estadísticas, traza y registros de una tarea terminada
+            futures.pop(future)
+            stats, events, records, files, memory, cache_counts = future.result()
+            discarded = set()
+            for relpath, data in files:
+                if not self.sink.write(relpath, data):
+                    discarded.add(relpath)
+            if discarded:
+                # Lo que el destino descarta no cuenta en los resultados
+                records = [record for record in records if self._relative(record.path) not in discarded]
+            if cache_counts is not None:
+                self.disk_cache.merge_counts(cache_counts)
+            if self._memory is not None and memory is not None:
+                self._memory.merge(*memory)
+            self._encode_stats.update(stats)
+            self._records.extend(records)
+            if self.tracer is not None:
+                self.tracer.extend(events)
+        
+        try:
+            futures.update(
+                (pool.submit(_run_render_task, *task, [self._cache_inputs.get(path) for path in task[2]]), task[2])
+                for task in tasks
+            )
+            for future in as_completed(list(futures)):
+                error = future.exception()
+                if error is not None:
+                    errors[futures.pop(future)[0]] = error
+                    continue
+                collect(future)
+                yield
+        finally:
+            # cancel_futures de shutdown requiere Python 3.9: se cancela a mano
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+            # Cierre anticipado: registrar también lo que los workers llegaron a escribir
+            for future in list(futures):
+                if not future.cancelled() and future.exception() is None:
+                    collect(future)
+        
+        if errors:
+            raise IconWriteError(errors)
+    
+    def _generate_platforms(
+        self,
+        source_img: Image.Image,
+        bg_color: Optional[str],
+        android_scale: float,
+        ios_scale: float,
+        platforms: List[str]
+    ) -> dict:
+        """Genera los iconos de cada plataforma seleccionada"""
         results = {
             'android': [],
             'ios': [],
@@ -612,33 +1586,120 @@ class IconGenerator:
         }
         
         # Generar iconos para cada plataforma
-        if 'android' in platforms:
-            results['android'] = self.generate_android_icons(source_img, bg_color, android_scale)
-            results['total'] += len(results['android'])
-        
-        if 'ios' in platforms:
-            results['ios'] = self.generate_ios_icons(source_img, ios_scale)
-            results['total'] += len(results['ios'])
-        
-        if 'web' in platforms:
-            results['web'] = self.generate_web_icons(source_img, bg_color)
-            results['total'] += len(results['web'])
-        
-        if 'windows' in platforms:
-            results['windows'] = self.generate_windows_icons(source_img, bg_color)
-            results['total'] += len(results['windows'])
-        
-        if 'macos' in platforms:
-            results['macos'] = self.generate_macos_icons(source_img, bg_color)
-            results['total'] += len(results['macos'])
-        
-        # Generar archivo YAML para flutter_launcher_icons
-        yaml_path = self.save_flutter_launcher_icons_yaml(
-            'assets/icon/icon.png',  # Ruta sugerida en proyecto Flutter
-            platforms,
-            bg_color
-        )
-        results['yaml'] = yaml_path
-        results['total'] += 1
+        generators = {
+            'android': lambda: self.generate_android_icons(source_img, bg_color, android_scale),
+            'ios': lambda: self.generate_ios_icons(source_img, ios_scale),
+            'web': lambda: self.generate_web_icons(source_img, bg_color),
+            'windows': lambda: self.generate_windows_icons(source_img, bg_color),
+            'macos': lambda: self.generate_macos_icons(source_img, bg_color),
+        }
+        for platform, generate in generators.items():
+            if platform not in platforms:
+                continue
+            self._trace_platform = platform
+            with self._span(platform, category=PHASE):
+                results[platform] = generate()
+            results['total'] += len(results[platform])
+        self._trace_platform = None
         
         return results
+
+
+# Estado por proceso worker del modo paralelo
+_worker_generator: Optional[IconGenerator] = None
+_worker_source: Optional[Image.Image] = None
+
+
+def _centered(canvas_size: Tuple[int, int], content_size: Tuple[int, int]) -> Tuple[int, int]:
+    """Posición que centra el contenido en el canvas"""
+    return ((canvas_size[0] - content_size[0]) // 2, (canvas_size[1] - content_size[1]) // 2)
+
+
+def _job_size(keys: tuple) -> Tuple[int, int]:
+    """Tamaño de un trabajo diferido: el canvas mayor de sus claves de render"""
+    return max((key[0] for key in keys), key=lambda size: size[0] * size[1])
+
+
+def _source_payload(source_img):
+    """Representación serializable de la imagen origen para los workers"""
+    if isinstance(source_img, SvgSource):
+        return source_img
+    return (source_img.mode, source_img.size, source_img.tobytes())
+
+
+def _init_render_worker(
+    source_payload,
+    options: dict,
+    trace_origin_ns: Optional[int] = None,
+    buffered: bool = False
+):
+    """
+    Inicializa un worker: reconstruye la imagen origen una sola vez
+    
+    Con buffered, las salidas quedan en memoria para devolverlas al proceso principal.
+    """
+    global _worker_generator, _worker_source
+    if isinstance(source_payload, SvgSource):
+        _worker_source = source_payload
+    else:
+        _worker_source = Image.frombytes(*source_payload)
+    _worker_generator = IconGenerator(
+        write_threads=0,
+        sink=MemorySink() if buffered else None,
+        **options
+    )
+    if _worker_generator.memory_budget_mb is not None:
+        _worker_generator._memory = MemoryBudget(_worker_generator.memory_budget_mb)
+        _worker_generator._memory.start()
+        _worker_generator._memory.hold_fixed(_worker_source)
+    _worker_generator._render_cache = _worker_generator._new_render_cache()
+    _worker_generator._records = deque()
+    if _worker_generator.disk_cache is not None:
+        # Con fork la copia hereda los contadores del proceso principal
+        _worker_generator.disk_cache.take_counts()
+    if trace_origin_ns is not None:
+        # Mismo origen de tiempos que el proceso principal
+        _worker_generator.tracer = Tracer(trace_origin_ns)
+
+
+def _run_render_task(
+    kind: str,
+    keys: tuple,
+    paths: List[str],
+    cache_keys: Optional[List[Optional[str]]] = None
+) -> Tuple[dict, list, list, list, Optional[tuple], Optional[dict]]:
+    """
+    Renderiza y guarda un trabajo (png: una clave y sus rutas; ico: capas)
+    
+    cache_keys son las huellas con las que cada ruta se inserta en la caché en
+    disco (None si no hay caché).
+    
+    Returns:
+        Tupla (estadísticas de codificación, eventos de traza, registros GeneratedFile,
+        archivos (ruta relativa, bytes) si el worker escribe en memoria,
+        (picos por plataforma, renders soltados) si hay presupuesto de memoria,
+        contadores de la copia de la caché en disco del worker si la hay)
+    """
+    _worker_generator._encode_stats = {}
+    _worker_generator._cache_inputs = {
+        path: key for path, key in zip(paths, cache_keys or ()) if key is not None
+    }
+    _worker_generator._run_jobs(_worker_source, [(kind, keys, path) for path in paths])
+    memory = _worker_generator._memory
+    if memory is not None:
+        evictions = 0
+        if memory.over():
+            evictions = len(_worker_generator._render_cache)
+            _worker_generator._release_renders(list(_worker_generator._render_cache))
+        memory = (dict(memory.platform_peaks), evictions, memory.floor)
+    tracer = _worker_generator.tracer
+    records = list(_worker_generator._records)
+    _worker_generator._records.clear()
+    sink = _worker_generator.sink
+    files = sink.drain() if isinstance(sink, MemorySink) else []
+    disk_cache = _worker_generator.disk_cache
+    cache_counts = disk_cache.take_counts() if disk_cache is not None else None
+    return (
+        _worker_generator._encode_stats, (tracer.drain() if tracer is not None else []),
+        records, files, memory, cache_counts
+    )
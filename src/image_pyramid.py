@@ -0,0 +1,69 @@
+"""
+Pirámide de resolución para Flutter Icon Generator
+Reduce la imagen origen por mitades una sola vez para que cada tamaño
+de icono se remuestree desde el nivel más pequeño que lo contenga
+"""
+
+from PIL import Image
+from typing import List, Tuple
+
+
+class ImagePyramid:
+    """Niveles de reducción sucesiva (1, 1/2, 1/4...) de una imagen origen"""
+
+    def __init__(self, source_img: Image.Image, min_size: int = 16, reducing_gap: float = 2.0):
+        """
+        Construye la pirámide a partir de la imagen origen
+
+        Args:
+            source_img: Imagen origen a resolución completa
+            min_size: Lado mínimo del nivel más pequeño
+            reducing_gap: Margen mínimo entre el nivel elegido y el tamaño destino
+                          (2.0 deja al filtro LANCZOS al menos 2 píxeles por muestra)
+        """
+        self.source = source_img
+        self.reducing_gap = reducing_gap
+        self.levels: List[Image.Image] = [source_img]
+
+        current = source_img
+        for _ in level_sizes(source_img.size, min_size)[1:]:
+            # reduce() promedia bloques 2x2 (con alpha premultiplicado)
+            current = current.reduce(2)
+            self.levels.append(current)
+
+    def level_for(self, target_size: Tuple[int, int]) -> Tuple[Image.Image, Tuple[float, float, float, float]]:
+        """
+        Devuelve el nivel más pequeño que sigue siendo mayor que el tamaño destino
+
+        Args:
+            target_size: Tamaño final (ancho, alto) del remuestreo
+
+        Returns:
+            Tupla (nivel, box) donde box es la región del nivel que corresponde
+            exactamente a la imagen origen completa (corrige niveles de lado impar)
+        """
+        factor_exp = select_level([level.size for level in self.levels], target_size, self.reducing_gap)
+        factor = 2 ** factor_exp
+        box = (0, 0, self.source.width / factor, self.source.height / factor)
+        return self.levels[factor_exp], box
+
+
+def level_sizes(size: Tuple[int, int], min_size: int = 16) -> List[Tuple[int, int]]:
+    """Tamaños de los niveles de la pirámide de una imagen (sin construirla)"""
+    sizes = [size]
+    width, height = size
+    while width // 2 >= min_size and height // 2 >= min_size:
+        # reduce(2) redondea hacia arriba los lados impares
+        width, height = (width + 1) // 2, (height + 1) // 2
+        sizes.append((width, height))
+    return sizes
+
+
+def select_level(sizes: List[Tuple[int, int]], target_size: Tuple[int, int], reducing_gap: float = 2.0) -> int:
+    """Índice del nivel más pequeño que sigue siendo mayor que el tamaño destino"""
+    min_width = target_size[0] * reducing_gap
+    min_height = target_size[1] * reducing_gap
+    for index in range(len(sizes) - 1, -1, -1):
+        if sizes[index][0] >= min_width and sizes[index][1] >= min_height:
+            return index
+    return 0
@@ -0,0 +1,213 @@
+"""
+Vista previa en vivo para Flutter Icon Generator
+Renderiza las vistas previas en un hilo de fondo mientras se mueven los
+controles: con debounce, descartando los renders obsoletos y entregando el
+resultado en el hilo de Tk con root.after
+"""
+
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Optional
+
+from PIL import Image, ImageTk
+
+from .preview_manager import IconPreviewGenerator
+
+
+class DebouncedRenderer:
+    """
+    Ejecuta renders en un hilo de fondo y entrega solo el más reciente
+
+    request() (hilo de Tk) espera delay_ms sin nuevas peticiones antes de
+    encolar el render; una petición nueva deja obsoletas las anteriores: si
+    aún no empezaron no se renderizan, y si están en curso el render puede
+    consultar cancelled() para abandonar. Los resultados se recogen en el
+    hilo de Tk sondeando con root.after solo mientras hay trabajo pendiente,
+    así ninguna llamada a Tk sale del hilo principal.
+
+    Args:
+        root: Ventana raíz de Tk
+        render: Función (params, cancelled) -> resultado (None = abandonado)
+        on_result: Callback en el hilo de Tk con el resultado vigente
+        on_error: Callback en el hilo de Tk si el render vigente falla
+        delay_ms: Espera sin cambios antes de renderizar
+        poll_ms: Intervalo de sondeo de resultados
+    """
+
+    def __init__(
+        self,
+        root: tk.Misc,
+        render: Callable[[Any, Callable[[], bool]], Any],
+        on_result: Callable[[Any], None],
+        on_error: Optional[Callable[[Exception], None]] = None,
+        delay_ms: int = 120,
+        poll_ms: int = 25
+    ):
+        self.root = root
+        self.render = render
+        self.on_result = on_result
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+        self.poll_ms = poll_ms
+        # Petición vigente (solo la escribe el hilo de Tk)
+        self._generation = 0
+        self._submitted = 0
+        # Última petición que el hilo de fondo terminó (renderizada o descartada)
+        self._finished = 0
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._results: 'queue.Queue[tuple]' = queue.Queue()
+        self._debounce_id = None
+        self._poll_id = None
+        self._thread = threading.Thread(target=self._run, name='live-preview', daemon=True)
+        self._thread.start()
+
+    def request(self, params: Any):
+        """Pide un render con estos parámetros (deja obsoletos los anteriores)"""
+        self._generation += 1
+        generation = self._generation
+        if self._debounce_id is not None:
+            self.root.after_cancel(self._debounce_id)
+        self._debounce_id = self.root.after(self.delay_ms, lambda: self._submit(generation, params))
+
+    def cancel(self):
+        """Descarta la petición pendiente y el render en curso"""
+        self._generation += 1
+        if self._debounce_id is not None:
+            self.root.after_cancel(self._debounce_id)
+            self._debounce_id = None
+
+    def close(self):
+        """Detiene el hilo de fondo (el render en curso se abandona)"""
+        self.cancel()
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    def _submit(self, generation: int, params: Any):
+        self._debounce_id = None
+        self._submitted = generation
+        with self._condition:
+            self._pending = (generation, params)
+            self._condition.notify()
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _stale(self, generation: int) -> bool:
+        return generation != self._generation
+
+    def _run(self):
+        """Bucle del hilo de fondo: toma siempre la petición más reciente"""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                generation, params = self._pending
+                self._pending = None
+
+            if not self._stale(generation):
+                try:
+                    result = self.render(params, lambda: self._stale(generation))
+                    if result is not None:
+                        self._results.put((generation, result, None))
+                except Exception as e:
+                    self._results.put((generation, None, e))
+            self._finished = generation
+
+    def _poll(self):
+        """Entrega en el hilo de Tk los resultados vigentes y sigue si queda trabajo"""
+        self._poll_id = None
+        while True:
+            try:
+                generation, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if self._stale(generation):
+                continue
+            if error is None:
+                self.on_result(result)
+            elif self.on_error is not None:
+                self.on_error(error)
+
+        if self._finished < self._submitted or not self._results.empty():
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+
+class LivePreviewPanel:
+    """
+    Panel de la ventana principal con las vistas previas Android, iOS y adaptativa
+
+    Se actualiza en segundo plano con update(); usa el IconPreviewGenerator de
+    la aplicación, así que volver a un ajuste anterior sale de su caché.
+    """
+
+    SIZE = 96
+    LABELS = ("Android", "iOS", "Adaptive")
+
+    def __init__(self, parent, root: tk.Misc, generator: IconPreviewGenerator, delay_ms: int = 120):
+        self.generator = generator
+        self.frame = ttk.LabelFrame(parent, text="Vista previa en vivo", padding="10")
+        self._photos = []
+        self._images = []
+        for column, text in enumerate(self.LABELS):
+            self.frame.columnconfigure(column, weight=1)
+            label = ttk.Label(self.frame, text="Sin imagen", anchor=tk.CENTER)
+            label.grid(row=0, column=column, padx=5)
+            ttk.Label(self.frame, text=text, font=('Helvetica', 8), foreground="gray").grid(row=1, column=column)
+            self._images.append(label)
+        self.renderer = DebouncedRenderer(root, self._render, self._show, self._show_error, delay_ms)
+
+    def update(
+        self,
+        source_img: Optional[Image.Image],
+        bg_color: Optional[str],
+        android_scale: float,
+        ios_scale: float
+    ):
+        """Pide las vistas previas de estos ajustes (None = sin imagen)"""
+        if source_img is None:
+            self.renderer.cancel()
+            self._clear("Sin imagen")
+            return
+        # Redondeo al porcentaje que muestran las etiquetas: más aciertos de caché
+        self.renderer.request((source_img, bg_color, round(android_scale, 2), round(ios_scale, 2)))
+
+    def close(self):
+        self.renderer.close()
+
+    def _render(self, params: tuple, cancelled: Callable[[], bool]) -> Optional[list]:
+        """Hilo de fondo: las tres vistas previas, comprobando la cancelación entre ellas"""
+        source_img, bg_color, android_scale, ios_scale = params
+        steps = (
+            lambda: self.generator.generate_android_preview(source_img, bg_color, android_scale, self.SIZE),
+            lambda: self.generator.generate_ios_preview(source_img, bg_color, ios_scale, self.SIZE),
+            lambda: self.generator.generate_adaptive_preview(source_img, android_scale, self.SIZE),
+        )
+        previews = []
+        for step in steps:
+            if cancelled():
+                return None
+            previews.append(step())
+        return previews
+
+    def _show(self, previews: list):
+        """Hilo de Tk: muestra las vistas previas (PhotoImage solo se crea aquí)"""
+        self._photos = [ImageTk.PhotoImage(preview) for preview in previews]
+        for label, photo in zip(self._images, self._photos):
+            label.config(image=photo, text="")
+
+    def _show_error(self, error: Exception):
+        self._clear("Error")
+
+    def _clear(self, text: str):
+        self._photos = []
+        for label in self._images:
+            label.config(image='', text=text)
@@ -0,0 +1,118 @@
+"""
+Caché LRU acotada por bytes para Flutter Icon Generator
+Guarda imágenes decodificadas y renders reutilizables entre ejecuciones
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from PIL import Image
+
+
+def image_nbytes(value: Any) -> int:
+    """Bytes aproximados de una imagen de Pillow (o de un objeto con .data en bytes)"""
+    if isinstance(value, Image.Image):
+        return value.width * value.height * len(value.getbands())
+    data = getattr(value, 'data', None)
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    return 0
+
+
+class LRUCache:
+    """
+    Caché LRU segura entre hilos con límite de bytes
+
+    Los elementos más grandes que el límite no se guardan. Una consulta con
+    `in` que no encuentra la clave cuenta como fallo (patrón `in` + `[]`).
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = image_nbytes):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, value: Any):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._items:
+                self.bytes -= self._items.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._items[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            found = key in self._items
+            if not found:
+                self.misses += 1
+            return found
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        """Estadísticas de uso (entradas, bytes, aciertos, fallos, expulsiones)"""
+        with self._lock:
+            return {
+                'entries': len(self._items),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+class KeyedView:
+    """
+    Vista tipo dict de una LRUCache con un prefijo de clave
+
+    Permite usar la caché compartida como _render_cache de un IconGenerator:
+    el prefijo identifica la imagen origen y las opciones de render.
+    """
+
+    def __init__(self, cache: LRUCache, prefix: Hashable):
+        self.cache = cache
+        self.prefix = prefix
+
+    def __contains__(self, key: Hashable) -> bool:
+        return (self.prefix, key) in self.cache
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.cache.get((self.prefix, key))
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.cache.put((self.prefix, key), value)
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        return self.cache.get((self.prefix, key), default)
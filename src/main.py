@@ -5,6 +5,9 @@ Fase 3: Multiplataforma completa + Integración flutter_launcher_icons
 
 import os
 import sys
+import queue
+import threading
+import traceback
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, colorchooser
 from PIL import Image, ImageTk
@@ -13,8 +16,15 @@ from PIL import Image, ImageTk
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from src.icon_generator import IconGenerator
 from src.config_manager import ConfigManager, TemplateManager
-from src.preview_manager import PreviewWindow
+from src.preview_manager import PreviewWindow, IconPreviewGenerator
 from src.flutter_integration import FlutterLauncherIconsIntegration
+from src.source_cache import shared_source_cache
+from src.live_preview import LivePreviewPanel
+
+# Lado máximo decodificado para la vista previa (los previews son de 180px)
+PREVIEW_DECODE_SIDE = 512
+# Intervalo de sondeo de la generación en segundo plano (ms)
+GENERATION_POLL_MS = 50
 
 class FlutterIconGeneratorApp:
     def __init__(self, root):
@@ -47,9 +57,20 @@ class FlutterIconGeneratorApp:
         self.platform_windows = tk.BooleanVar(value=True)
         self.platform_macos = tk.BooleanVar(value=True)
         
+        # Trazado por etapas de la generación (diagnóstico de rendimiento)
+        self.trace_enabled = tk.BooleanVar(value=False)
+        self.last_tracer = None
+        
+        # Calidad borrador: render y compresión rápidos para iterar escala y color
+        self.draft_quality = tk.BooleanVar(value=False)
+        
         self.preview_image = None
         self.preview_tk = None
         self.current_image = None
+        # Decodificación compartida por la vista previa, la comparación y la generación
+        self.source_cache = shared_source_cache()
+        # Vistas previas memorizadas durante toda la sesión
+        self.preview_generator = IconPreviewGenerator()
         
         # Crear menú
         self.create_menu()
@@ -295,6 +316,18 @@ class FlutterIconGeneratorApp:
         self.ios_scale_label = ttk.Label(scale_frame, text=f"{self.ios_scale.get():.0%}")
         self.ios_scale_label.grid(row=1, column=2)
         
+        ttk.Checkbutton(
+            config_frame,
+            text="Trazar etapas (diagnóstico de rendimiento)",
+            variable=self.trace_enabled
+        ).grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(10, 0))
+        
+        ttk.Checkbutton(
+            config_frame,
+            text="Borrador rápido (menor calidad, para probar ajustes)",
+            variable=self.draft_quality
+        ).grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
         # --- SECCIÓN 5: CARPETA DE SALIDA ---
         output_frame = ttk.LabelFrame(left_frame, text="5. Carpeta de Salida", padding="10")
         output_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
@@ -320,7 +353,7 @@ class FlutterIconGeneratorApp:
         right_frame = ttk.Frame(main_frame)
         right_frame.grid(row=2, column=1, sticky=(tk.N, tk.S, tk.E, tk.W))
         right_frame.columnconfigure(0, weight=1)
-        right_frame.rowconfigure(1, weight=1)
+        right_frame.rowconfigure(2, weight=1)
         
         # --- BOTONES DE ACCIÓN ---
         btn_frame = ttk.Frame(right_frame)
@@ -367,9 +400,14 @@ class FlutterIconGeneratorApp:
         )
         self.copy_btn.pack(side=tk.LEFT)
         
+        # --- VISTA PREVIA EN VIVO ---
+        # Se renderiza en segundo plano al mover las escalas o cambiar el color
+        self.live_preview = LivePreviewPanel(right_frame, self.root, self.preview_generator)
+        self.live_preview.frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        
         # --- LOG/PROGRESO ---
         log_frame = ttk.LabelFrame(right_frame, text="Progreso", padding="10")
-        log_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        log_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
         
@@ -379,6 +417,15 @@ class FlutterIconGeneratorApp:
         scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
         scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         self.log_text['yscrollcommand'] = scrollbar.set
+        self.log_text.tag_configure('mono', font=('Courier', 9))
+        
+        self.export_trace_btn = ttk.Button(
+            log_frame,
+            text="Exportar traza...",
+            command=self.export_trace,
+            state=tk.DISABLED
+        )
+        self.export_trace_btn.grid(row=1, column=0, sticky=tk.E, pady=(5, 0))
         
         # === FOOTER ===
         footer_label = ttk.Label(
@@ -403,14 +450,20 @@ class FlutterIconGeneratorApp:
         """Actualiza los labels de escala"""
         self.android_scale_label.config(text=f"{self.android_scale.get():.0%}")
         self.ios_scale_label.config(text=f"{self.ios_scale.get():.0%}")
+        self.schedule_live_preview()
         self.save_config()
     
+    def schedule_live_preview(self):
+        """Pide la vista previa en vivo con los ajustes actuales (no bloquea la interfaz)"""
+        bg_color = self.bg_color.get() if self.bg_color.get() else None
+        self.live_preview.update(self.current_image, bg_color, self.android_scale.get(), self.ios_scale.get())
+    
     def select_input_file(self):
         """Abre diálogo para seleccionar imagen"""
         filename = filedialog.askopenfilename(
             title="Seleccionar imagen",
             filetypes=[
-                ("Imágenes", "*.png *.jpg *.jpeg *.gif *.bmp *.tiff"),
+                ("Imágenes", "*.png *.jpg *.jpeg *.gif *.bmp *.tiff *.svg *.svgz"),
                 ("PNG", "*.png"),
                 ("JPEG", "*.jpg *.jpeg"),
                 ("Todos los archivos", "*.*")
@@ -426,7 +479,10 @@ class FlutterIconGeneratorApp:
     def update_preview(self, filepath):
         """Actualiza la vista previa de la imagen"""
         try:
-            self.current_image = Image.open(filepath)
+            # Proxy de la decodificación compartida: no hace falta la resolución completa
+            # para previsualizar y la generación reutiliza el mismo origen
+            self.current_image = self.source_cache.image(filepath, PREVIEW_DECODE_SIDE)
+            original_width, original_height = self.current_image.info['original_size']
             
             max_size = 180
             ratio = min(max_size/self.current_image.width, max_size/self.current_image.height)
@@ -437,17 +493,19 @@ class FlutterIconGeneratorApp:
             
             self.preview_label.config(image=self.preview_tk, text="")
             self.image_info_label.config(
-                text=f"{self.current_image.width}x{self.current_image.height}px | {os.path.basename(filepath)}"
+                text=f"{original_width}x{original_height}px | {os.path.basename(filepath)}"
             )
             
             self.preview_btn.config(state=tk.NORMAL)
+            self.schedule_live_preview()
             
-            self.log(f"Imagen cargada: {os.path.basename(filepath)} ({self.current_image.width}x{self.current_image.height})")
+            self.log(f"Imagen cargada: {os.path.basename(filepath)} ({original_width}x{original_height})")
         except Exception as e:
             self.preview_label.config(text=f"Error al cargar imagen")
             self.image_info_label.config(text=str(e))
             self.current_image = None
             self.preview_btn.config(state=tk.DISABLED)
+            self.schedule_live_preview()
             self.log(f"Error: {str(e)}")
     
     def show_preview_window(self):
@@ -459,7 +517,8 @@ class FlutterIconGeneratorApp:
                 self.current_image,
                 bg_color,
                 self.android_scale.get(),
-                self.ios_scale.get()
+                self.ios_scale.get(),
+                generator=self.preview_generator
             )
     
     def select_output_folder(self):
@@ -555,12 +614,14 @@ class FlutterIconGeneratorApp:
         if color[1]:
             self.bg_color.set(color[1])
             self.color_preview.config(bg=color[1])
+            self.schedule_live_preview()
             self.save_config()
     
     def set_transparent(self):
         """Establece fondo transparente"""
         self.bg_color.set("")
         self.color_preview.config(bg="gray")
+        self.schedule_live_preview()
         self.save_config()
     
     def save_config(self):
@@ -576,12 +637,28 @@ class FlutterIconGeneratorApp:
             window_height=self.root.winfo_height()
         )
     
-    def log(self, message):
+    def log(self, message, tag=None):
         """Agrega mensaje al log"""
-        self.log_text.insert(tk.END, f"{message}\n")
+        self.log_text.insert(tk.END, f"{message}\n", tag)
         self.log_text.see(tk.END)
         self.root.update_idletasks()
     
+    def export_trace(self):
+        """Exporta la traza de la última generación en formato Chrome trace-event"""
+        if self.last_tracer is None:
+            return
+        
+        path = filedialog.asksaveasfilename(
+            title="Exportar traza",
+            initialdir=self.output_path.get(),
+            initialfile="icon_trace.json",
+            defaultextension=".json",
+            filetypes=[("Chrome trace (JSON)", "*.json")]
+        )
+        if path:
+            self.last_tracer.export_chrome_trace(path)
+            self.log(f"\nTraza exportada: {path} (ábrela en chrome://tracing o ui.perfetto.dev)")
+    
     def show_about(self):
         """Muestra diálogo Acerca de"""
         messagebox.showinfo(
@@ -605,6 +682,7 @@ class FlutterIconGeneratorApp:
     def on_closing(self):
         """Maneja el cierre de la aplicación"""
         self.save_config()
+        self.live_preview.close()
         self.root.destroy()
     
     def generate_icons(self):
@@ -638,31 +716,75 @@ class FlutterIconGeneratorApp:
         
         try:
             # Crear generador
-            generator = IconGenerator(self.output_path.get())
-            
-            # Generar iconos
-            bg_color = self.bg_color.get() if self.bg_color.get() else None
-            
-            self.log(f"\nConfiguración:")
-            self.log(f"  Color de fondo: {bg_color if bg_color else 'Transparente'}")
-            self.log(f"  Escala Android: {self.android_scale.get():.0%}")
-            self.log(f"  Escala iOS: {self.ios_scale.get():.0%}")
-            self.log("")
-            
-            results = generator.generate_all(
-                input_path=self.input_path.get(),
-                bg_color=bg_color,
-                android_scale=self.android_scale.get(),
-                ios_scale=self.ios_scale.get(),
-                platforms=platforms
+            quality = 'draft' if self.draft_quality.get() else 'final'
+            generator = IconGenerator(
+                self.output_path.get(),
+                trace=self.trace_enabled.get(),
+                quality=quality,
+                source_cache=self.source_cache
             )
-            
+        except Exception as e:
+            self._generation_failed(e, traceback.format_exc())
+            return
+        
+        # Generar iconos
+        bg_color = self.bg_color.get() if self.bg_color.get() else None
+        
+        self.log(f"\nConfiguración:")
+        self.log(f"  Color de fondo: {bg_color if bg_color else 'Transparente'}")
+        self.log(f"  Escala Android: {self.android_scale.get():.0%}")
+        self.log(f"  Escala iOS: {self.ios_scale.get():.0%}")
+        self.log(f"  Calidad: {'Borrador' if quality == 'draft' else 'Final'}")
+        self.log("")
+        
+        # La generación corre en un hilo de fondo y cada archivo vuelve al hilo
+        # de Tk por una cola que se sondea con root.after: la ventana no se congela
+        events = queue.Queue()
+        params = (self.input_path.get(), bg_color, self.android_scale.get(), self.ios_scale.get(), platforms)
+        
+        def work():
+            try:
+                for record in generator.iter_generate(*params):
+                    events.put(('file', record))
+                events.put(('done', None))
+            except Exception as e:
+                events.put(('error', (e, traceback.format_exc())))
+        
+        threading.Thread(target=work, name='generate-icons', daemon=True).start()
+        self.root.after(GENERATION_POLL_MS, lambda: self._poll_generation(generator, events, [], platforms))
+    
+    def _poll_generation(self, generator, events, records, platforms):
+        """Hilo de Tk: muestra los archivos ya escritos y cierra la generación al terminar"""
+        while True:
+            try:
+                kind, payload = events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'file':
+                # Cada archivo se muestra en cuanto queda escrito
+                records.append(payload)
+                self.log(
+                    f"  ✓ {os.path.relpath(payload.path, self.output_path.get())} "
+                    f"({payload.bytes / 1024:.1f} KB)"
+                )
+            elif kind == 'done':
+                self._finish_generation(generator, generator.collect_results(records), platforms)
+                return
+            else:
+                self._generation_failed(*payload)
+                return
+        self.root.after(GENERATION_POLL_MS, lambda: self._poll_generation(generator, events, records, platforms))
+    
+    def _finish_generation(self, generator, results, platforms):
+        """Hilo de Tk: resumen de la generación terminada"""
+        try:
             # Mostrar resultados
             self.log("\n" + "="*50)
             self.log("GENERACIÓN COMPLETADA!")
             self.log("="*50)
             self.log(f"\nTotal de archivos generados: {results['total']}")
-            self.log(f"Archivo YAML: {os.path.basename(results['yaml'])}")
+            if results['yaml']:
+                self.log(f"Archivo YAML: {os.path.basename(results['yaml'])}")
             
             if results['android']:
                 self.log(f"\n📱 Android ({len(results['android'])} archivos):")
@@ -703,6 +825,15 @@ class FlutterIconGeneratorApp:
             self.log(f"Archivos guardados en: {self.output_path.get()}")
             self.log("="*50)
             
+            # Resumen de la traza por etapa y plataforma
+            self.last_tracer = generator.tracer
+            if generator.tracer is not None:
+                self.log("\n⏱️ Tiempos por etapa:")
+                self.log(generator.tracer.format_summary(), 'mono')
+                self.export_trace_btn.config(state=tk.NORMAL)
+            else:
+                self.export_trace_btn.config(state=tk.DISABLED)
+            
             # Habilitar botón de copiar si hay proyecto Flutter
             if self.flutter_project_path.get() and os.path.exists(self.flutter_project_path.get()):
                 self.copy_btn.config(state=tk.NORMAL)
@@ -716,13 +847,18 @@ class FlutterIconGeneratorApp:
                 os.startfile(self.output_path.get())
             
         except Exception as e:
-            messagebox.showerror("Error", f"Error al generar iconos:\n{str(e)}")
-            self.log(f"\n❌ ERROR: {str(e)}")
-            import traceback
-            self.log(traceback.format_exc())
-        finally:
+            self._generation_failed(e, traceback.format_exc())
+        else:
             # Rehabilitar botón
             self.generate_btn.config(state=tk.NORMAL, text="🚀 GENERAR")
+    
+    def _generation_failed(self, error, details):
+        """Hilo de Tk: informa del error de la generación y rehabilita el botón"""
+        messagebox.showerror("Error", f"Error al generar iconos:\n{str(error)}")
+        self.log(f"\n❌ ERROR: {str(error)}")
+        self.log(details)
+        # Rehabilitar botón
+        self.generate_btn.config(state=tk.NORMAL, text="🚀 GENERAR")
 
 def main():
     """Función principal"""
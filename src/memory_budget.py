@@ -0,0 +1,191 @@
+"""
+Memoria acotada para Flutter Icon Generator
+Contabiliza los buffers de imagen que retiene una ejecución (origen, pirámide,
+renders en caché y escrituras pendientes) más la memoria Python trazada con
+tracemalloc, y registra el pico por plataforma frente a un presupuesto
+
+El presupuesto solo puede recortar lo liberable: renders en caché, escrituras
+solapadas con el render siguiente y número de procesos. El origen decodificado,
+su pirámide y el render en curso son un mínimo fijo (floor_mb en el reporte);
+con un presupuesto menor el pico se queda en ese mínimo, no en el presupuesto.
+"""
+
+import threading
+import tracemalloc
+from typing import Dict, Optional
+
+from .lru_cache import image_nbytes
+
+_MB = 1024 * 1024
+
+# tracemalloc es global al proceso: lo comparten las ejecuciones simultáneas
+# (API asíncrona, servidor) y se detiene cuando termina la última
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_started = False
+
+
+def _start_tracing():
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+
+class MemoryBudget:
+    """
+    Presupuesto de memoria de una ejecución de generate_all
+
+    Los buffers de Pillow no pasan por el asignador de Python (tracemalloc
+    no los ve), así que se cuentan a mano: hold() al retener una imagen y
+    release() al soltarla, con recuento por objeto; son de esta ejecución. El
+    resto (bytes PNG codificados, estructuras) es lo que tracemalloc ha
+    crecido desde start(): es memoria del proceso, así que con ejecuciones
+    simultáneas en el mismo proceso incluye también la de las demás (suele
+    ser menos de 1 MB frente a los buffers de imagen).
+    """
+
+    def __init__(self, limit_mb: float):
+        self.limit = int(limit_mb * _MB)
+        self.peak = 0
+        self.platform_peaks: Dict[str, int] = {}
+        # Veces que se esperó a las escrituras o se soltaron renders por falta de memoria
+        self.waits = 0
+        self.evictions = 0
+        self.workers: Optional[int] = None
+        self._held: Dict[int, list] = {}
+        self._held_bytes = 0
+        # Mínimo no liberable: origen, pirámide y el mayor render retenido a la vez
+        self.floor = 0
+        self._fixed_bytes = 0
+        self._traced_base = 0
+        self._tracing = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Empieza a trazar (compartido con otras ejecuciones) y reinicia los picos"""
+        if not self._tracing:
+            _start_tracing()
+            self._tracing = True
+        self._traced_base = tracemalloc.get_traced_memory()[0]
+        self.peak = 0
+        self.floor = self._fixed_bytes = 0
+        self.platform_peaks = {}
+        self.waits = self.evictions = 0
+
+    def stop(self):
+        """Suelta todo lo retenido y deja de trazar si era la última ejecución"""
+        with self._lock:
+            self._held.clear()
+            self._held_bytes = 0
+        if self._tracing:
+            _stop_tracing()
+            self._tracing = False
+
+    def hold_fixed(self, image) -> None:
+        """Como hold(), para lo que no se puede soltar durante la ejecución (origen, pirámide)"""
+        self.hold(image)
+        with self._lock:
+            self._fixed_bytes += image_nbytes(image)
+            self.floor = max(self.floor, self._fixed_bytes)
+
+    def working_set(self, nbytes: int) -> None:
+        """Registra los bytes de un render en curso (no liberables mientras se usa)"""
+        with self._lock:
+            self.floor = max(self.floor, self._fixed_bytes + nbytes)
+
+    def hold(self, image) -> None:
+        """Cuenta una referencia retenida a una imagen (cada objeto se cuenta una vez)"""
+        with self._lock:
+            entry = self._held.get(id(image))
+            if entry is None:
+                # Se guarda la imagen para que su id no se reutilice mientras se cuenta
+                entry = self._held[id(image)] = [image, 0, image_nbytes(image)]
+                self._held_bytes += entry[2]
+            entry[1] += 1
+
+    def release(self, image) -> None:
+        with self._lock:
+            entry = self._held.get(id(image))
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._held[id(image)]
+                self._held_bytes -= entry[2]
+
+    def current(self) -> int:
+        """Bytes en uso: buffers de imagen retenidos + memoria Python trazada desde start()"""
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        return self._held_bytes + max(0, traced - self._traced_base)
+
+    def over(self) -> bool:
+        return self.current() > self.limit
+
+    def sample(self, platform: Optional[str]) -> int:
+        """Registra el uso actual como candidato a pico (global y de la plataforma)"""
+        used = self.current()
+        with self._lock:
+            self.peak = max(self.peak, used)
+            if platform is not None:
+                self.platform_peaks[platform] = max(self.platform_peaks.get(platform, 0), used)
+        return used
+
+    def merge(self, platform_peaks: Dict[str, int], evictions: int = 0, floor: int = 0):
+        """Incorpora los picos, los renders soltados y el mínimo de un proceso worker"""
+        with self._lock:
+            self.evictions += evictions
+            self.floor = max(self.floor, floor)
+            for platform, used in platform_peaks.items():
+                self.platform_peaks[platform] = max(self.platform_peaks.get(platform, 0), used)
+                self.peak = max(self.peak, used)
+
+    def report(self) -> dict:
+        """
+        Resumen en MB: presupuesto, mínimo no liberable, pico global y por plataforma
+
+        within_budget es False si el pico superó el presupuesto (p. ej. porque
+        el presupuesto está por debajo de floor_mb).
+        """
+        return {
+            'budget_mb': round(self.limit / _MB, 1),
+            'floor_mb': round(self.floor / _MB, 1),
+            'peak_mb': round(self.peak / _MB, 1),
+            'within_budget': self.peak <= self.limit,
+            'platforms': {p: round(v / _MB, 1) for p, v in sorted(self.platform_peaks.items())},
+            'workers': self.workers,
+            'waits': self.waits,
+            'evictions': self.evictions,
+        }
+
+
+class TrackedRenderCache(dict):
+    """Caché de renders de una ejecución que contabiliza sus imágenes en el presupuesto"""
+
+    def __init__(self, budget: MemoryBudget):
+        super().__init__()
+        self.budget = budget
+
+    def __setitem__(self, key, image):
+        previous = self.get(key)
+        if previous is not None:
+            self.budget.release(previous)
+        self.budget.hold(image)
+        super().__setitem__(key, image)
+
+    def pop(self, key, *default):
+        image = super().pop(key, *default)
+        if image is not None:
+            self.budget.release(image)
+        return image
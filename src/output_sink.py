@@ -0,0 +1,231 @@
+"""
+Destinos de salida para Flutter Icon Generator
+Carpeta (por defecto), proyecto Flutter, memoria y zip/tar en streaming
+"""
+
+import io
+import os
+import tarfile
+import threading
+import time
+import zipfile
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+# Carpeta generada -> carpeta dentro de un proyecto Flutter
+FLUTTER_PROJECT_DIRS = {
+    'android': 'android/app/src/main/res',
+    'ios/AppIcon.appiconset': 'ios/Runner/Assets.xcassets/AppIcon.appiconset',
+    'web': 'web/icons',
+    'windows': 'windows/runner/resources',
+    'macos/Runner/Assets.xcassets/AppIcon.appiconset': 'macos/Runner/Assets.xcassets/AppIcon.appiconset',
+}
+
+# Las salidas PNG/ICO ya van comprimidas: en el zip se guardan tal cual
+_STORED_EXTENSIONS = ('.png', '.ico')
+
+
+def replace_file(
+    path: str,
+    write: Callable,
+    mode: str = 'wb',
+    encoding: Optional[str] = None,
+    fsync: bool = False
+):
+    """
+    Escribe un archivo en un temporal de su carpeta y lo renombra encima (os.replace)
+
+    Nunca se escribe a través del archivo existente: si era un enlace duro
+    (link_duplicates) compartido con otra salida, esa otra no cambia.
+
+    Args:
+        path: Ruta destino
+        write: Función que escribe el contenido en el archivo temporal abierto
+        mode: Modo de apertura ('wb' o 'w')
+        encoding: Codificación en modo texto
+        fsync: Fuerza el contenido a disco antes del rename (un corte de
+            corriente no deja el archivo nuevo vacío o truncado)
+    """
+    tmp_path = f'{path}.tmp-{os.getpid()}-{threading.get_ident()}'
+    try:
+        with open(tmp_path, mode, encoding=encoding) as f:
+            write(f)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class OutputSink:
+    """
+    Destino de las salidas de IconGenerator
+
+    Recibe rutas relativas a output_dir (separadas por '/') y los bytes ya
+    codificados. Las escrituras pueden llegar desde varios hilos.
+    """
+
+    # True si las rutas bajo output_dir son archivos reales: IconGenerator
+    # escribe entonces directamente (y permite enlaces duros e incremental)
+    direct = False
+
+    def makedirs(self, relpath: str):
+        """Prepara una carpeta (no hace nada si el destino no tiene carpetas)"""
+
+    def write(self, relpath: str, data: bytes) -> bool:
+        """Guarda un archivo; devuelve False si el destino lo descarta"""
+        raise NotImplementedError
+
+    def close(self):
+        """Termina el destino (cierra archivos y flujos)"""
+
+    def __enter__(self) -> 'OutputSink':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DirectorySink(OutputSink):
+    """Carpeta en disco (comportamiento por defecto)"""
+
+    direct = True
+
+    def __init__(self, root: str, fsync: bool = False):
+        self.root = root
+        self.fsync = fsync
+
+    def _path(self, relpath: str) -> str:
+        return os.path.join(self.root, *relpath.split('/'))
+
+    def makedirs(self, relpath: str):
+        os.makedirs(self._path(relpath), exist_ok=True)
+
+    def write(self, relpath: str, data: bytes) -> bool:
+        path = self._path(relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        replace_file(path, lambda f: f.write(data), fsync=self.fsync)
+        return True
+
+
+class FlutterProjectSink(DirectorySink):
+    """
+    Escribe cada plataforma directamente en su carpeta de un proyecto Flutter
+
+    Usa las mismas carpetas que FlutterLauncherIconsIntegration.copy_icons_to_project
+    pero sin copia intermedia. Lo que no pertenece a ninguna plataforma (el YAML
+    de flutter_launcher_icons) se descarta.
+    """
+
+    direct = False
+
+    def __init__(self, project_dir: str, fsync: bool = False):
+        super().__init__(project_dir, fsync)
+
+    def _map(self, relpath: str) -> Optional[str]:
+        for prefix, target in FLUTTER_PROJECT_DIRS.items():
+            if relpath == prefix or relpath.startswith(prefix + '/'):
+                return target + relpath[len(prefix):]
+        return None
+
+    def makedirs(self, relpath: str):
+        target = self._map(relpath)
+        if target is not None:
+            super().makedirs(target)
+
+    def write(self, relpath: str, data: bytes) -> bool:
+        target = self._map(relpath)
+        if target is None:
+            return False
+        return super().write(target, data)
+
+
+class MemorySink(OutputSink):
+    """Guarda las salidas en memoria: files[ruta relativa] = bytes"""
+
+    def __init__(self):
+        self.files: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def write(self, relpath: str, data: bytes) -> bool:
+        with self._lock:
+            self.files[relpath] = data
+        return True
+
+    def drain(self) -> List[Tuple[str, bytes]]:
+        """Devuelve y vacía los archivos guardados"""
+        with self._lock:
+            files, self.files = list(self.files.items()), {}
+        return files
+
+
+class _ArchiveSink(OutputSink):
+    """Base de los archivos comprimidos: abre el destino (ruta u objeto archivo)"""
+
+    def __init__(self, target: Union[str, BinaryIO]):
+        self._own_file = isinstance(target, str)
+        self.fileobj = open(target, 'wb') if self._own_file else target
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self._close_archive()
+            if self._own_file:
+                self.fileobj.close()
+
+    def _close_archive(self):
+        raise NotImplementedError
+
+
+class ZipSink(_ArchiveSink):
+    """
+    Zip en streaming: cada archivo se añade en cuanto se escribe
+
+    El destino no necesita ser posicionable (socket, respuesta HTTP, stdout).
+    Los PNG/ICO se guardan sin recomprimir.
+    """
+
+    def __init__(self, target: Union[str, BinaryIO]):
+        super().__init__(target)
+        self.archive = zipfile.ZipFile(self.fileobj, 'w')
+
+    def write(self, relpath: str, data: bytes) -> bool:
+        compression = zipfile.ZIP_STORED if relpath.lower().endswith(_STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+        info = zipfile.ZipInfo(relpath, date_time=time.localtime()[:6])
+        info.compress_type = compression
+        with self._lock:
+            self.archive.writestr(info, data)
+        return True
+
+    def _close_archive(self):
+        self.archive.close()
+
+
+class TarSink(_ArchiveSink):
+    """
+    Tar en streaming (sin posicionar el destino)
+
+    Args:
+        target: Ruta u objeto archivo
+        compression: '' (sin comprimir), 'gz', 'bz2' o 'xz'
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], compression: str = ''):
+        super().__init__(target)
+        self.archive = tarfile.open(fileobj=self.fileobj, mode=f'w|{compression}')
+
+    def write(self, relpath: str, data: bytes) -> bool:
+        info = tarfile.TarInfo(relpath)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        with self._lock:
+            self.archive.addfile(info, io.BytesIO(data))
+        return True
+
+    def _close_archive(self):
+        self.archive.close()
@@ -0,0 +1,165 @@
+"""
+Optimización de tamaño PNG para Flutter Icon Generator
+Presets de velocidad/tamaño: nivel zlib, búsqueda de estrategia, paleta sin pérdida
+"""
+
+import io
+import time
+import zlib
+from PIL import Image, ImageChops
+from typing import Optional, Tuple
+
+# compress_type de Pillow = estrategia zlib (-1 = por defecto)
+_DEFAULT_STRATEGY = -1
+
+# Lado máximo para construir la paleta exacta en Python si el cuantizador no es exacto
+_EXACT_PALETTE_MAX_SIDE = 64
+
+PNG_PRESETS = {
+    # Lo más rápido: zlib nivel 1, sin búsqueda
+    'fast': {
+        'compress_level': 1,
+        'optimize': False,
+        'strategies': (_DEFAULT_STRATEGY,),
+        'palette_max_side': 0,
+        'baseline': False,
+    },
+    # Nivel 9 + paleta para iconos pequeños (16-48px)
+    'balanced': {
+        'compress_level': 9,
+        'optimize': False,
+        'strategies': (_DEFAULT_STRATEGY,),
+        'palette_max_side': 48,
+        'baseline': True,
+    },
+    # Búsqueda de estrategias zlib + paleta en cualquier tamaño
+    'max': {
+        'compress_level': 9,
+        'optimize': True,
+        'strategies': (_DEFAULT_STRATEGY, zlib.Z_FILTERED, zlib.Z_RLE),
+        'palette_max_side': None,
+        'baseline': True,
+    },
+}
+
+
+class PngOptimizer:
+    """Codificador PNG que elige la variante más pequeña según el preset"""
+
+    def __init__(self, preset: str = 'balanced'):
+        if preset not in PNG_PRESETS:
+            raise ValueError(
+                f"Preset de optimización desconocido: {preset} "
+                f"(opciones: {', '.join(PNG_PRESETS)})"
+            )
+        self.preset = preset
+        self.settings = PNG_PRESETS[preset]
+
+    def encode(self, image: Image.Image) -> Tuple[bytes, dict]:
+        """
+        Codifica la imagen como PNG optimizado
+
+        Returns:
+            Tupla (bytes, estadísticas) con 'bytes', 'baseline' (tamaño con el
+            codificador por defecto, None si el preset no lo calcula) y 'seconds'
+        """
+        start = time.perf_counter()
+        image = self._strip_metadata(image)
+
+        baseline = None
+        candidates = []
+        if self.settings['baseline']:
+            # Codificación por defecto de Pillow: referencia y candidata
+            baseline = self._encode(image)
+            candidates.append(baseline)
+
+        for strategy in self.settings['strategies']:
+            candidates.append(self._encode(
+                image,
+                compress_level=self.settings['compress_level'],
+                compress_type=strategy,
+                optimize=self.settings['optimize']
+            ))
+
+        palette = self._to_palette(image)
+        if palette is not None:
+            palette_img, transparency = palette
+            params = {'transparency': transparency} if transparency is not None else {}
+            candidates.append(self._encode(
+                palette_img,
+                compress_level=self.settings['compress_level'],
+                optimize=self.settings['optimize'],
+                **params
+            ))
+
+        best = min(candidates, key=len)
+        return best, {
+            'bytes': len(best),
+            'baseline': len(baseline) if baseline is not None else None,
+            'seconds': time.perf_counter() - start,
+        }
+
+    def _encode(self, image: Image.Image, **params) -> bytes:
+        """Codifica a PNG en memoria con los parámetros dados"""
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG', **params)
+        return buffer.getvalue()
+
+    def _strip_metadata(self, image: Image.Image) -> Image.Image:
+        """Quita metadatos (texto, ICC, dpi, exif) sin modificar la imagen original"""
+        if not image.info:
+            return image
+        stripped = image.copy()
+        stripped.info = {}
+        return stripped
+
+    def _to_palette(self, image: Image.Image) -> Optional[Tuple[Image.Image, Optional[bytes]]]:
+        """
+        Reducción a paleta sin pérdida si la imagen tiene 256 colores o menos
+
+        Returns:
+            (imagen P, tabla de alpha tRNS o None) o None si no aplica
+        """
+        max_side = self.settings['palette_max_side']
+        if max_side is not None and max(image.size) > max_side:
+            return None
+        if image.mode not in ('RGB', 'RGBA'):
+            return None
+
+        colors = image.getcolors(256)
+        if colors is None:
+            return None
+
+        # Cuantizador de Pillow (rápido); solo se acepta si es exacto
+        method = Image.Quantize.FASTOCTREE if image.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+        quantized = image.quantize(colors=len(colors), method=method, dither=Image.Dither.NONE)
+        if ImageChops.difference(quantized.convert(image.mode), image).getbbox() is None:
+            return quantized, None
+
+        if max(image.size) > _EXACT_PALETTE_MAX_SIDE:
+            return None
+        return self._exact_palette(image, colors)
+
+    def _exact_palette(self, image: Image.Image, colors: list) -> Tuple[Image.Image, Optional[bytes]]:
+        """Construye la paleta exacta píxel a píxel (solo para iconos pequeños)"""
+        # Colores más frecuentes primero
+        colors.sort(key=lambda c: c[0], reverse=True)
+        palette_colors = [color for _, color in colors]
+        index = {color: i for i, color in enumerate(palette_colors)}
+
+        bands = len(image.mode)
+        data = image.tobytes()
+        indices = bytes(
+            index[tuple(data[i:i + bands])]
+            for i in range(0, len(data), bands)
+        )
+
+        palette_img = Image.frombytes('P', image.size, indices)
+        palette_img.putpalette([channel for color in palette_colors for channel in color[:3]])
+
+        transparency = None
+        if image.mode == 'RGBA':
+            alphas = bytes(color[3] for color in palette_colors)
+            if any(alpha != 255 for alpha in alphas):
+                transparency = alphas
+        return palette_img, transparency
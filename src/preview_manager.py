@@ -8,16 +8,64 @@ from tkinter import ttk
 from PIL import Image, ImageDraw, ImageTk, ImageFont
 import io
 import base64
+import itertools
+import threading
+import weakref
+from typing import Callable
+
+from .lru_cache import LRUCache
+
+# Memoria máxima de la caché de vistas previas (suficiente para decenas de ajustes)
+PREVIEW_CACHE_BYTES = 32 * 1024 * 1024
 
 class IconPreviewGenerator:
-    """Generador de vistas previas de iconos"""
+    """
+    Generador de vistas previas de iconos
+    
+    Las vistas previas se memorizan en una caché LRU acotada por bytes con
+    clave (imagen origen, tipo, color de fondo, escala, tamaño): reabrir la
+    vista previa o volver a un ajuste anterior no vuelve a redimensionar.
+    Las imágenes devueltas se comparten y no deben modificarse.
+    """
+    
+    def __init__(self, max_bytes: int = PREVIEW_CACHE_BYTES):
+        self.preview_cache = LRUCache(max_bytes)
+        # id(imagen origen) -> (referencia débil, identificador único de la caché)
+        self._sources = {}
+        self._tokens = itertools.count()
+        # La vista previa en vivo la usa desde su hilo de fondo
+        self._lock = threading.Lock()
     
-    def __init__(self):
-        self.preview_cache = {}
+    def _source_token(self, source_img: Image.Image) -> int:
+        """Identificador de una imagen origen viva (no se reutiliza aunque su id sí)"""
+        with self._lock:
+            entry = self._sources.get(id(source_img))
+            if entry is not None and entry[0]() is source_img:
+                return entry[1]
+            token = next(self._tokens)
+            key = id(source_img)
+            self._sources[key] = (weakref.ref(source_img, lambda _: self._sources.pop(key, None)), token)
+            return token
+    
+    def _memoize(self, source_img: Image.Image, params: tuple, build: Callable[[], Image.Image]) -> Image.Image:
+        """Devuelve la vista previa en caché o la construye y la guarda"""
+        key = (self._source_token(source_img),) + params
+        preview = self.preview_cache.get(key)
+        if preview is None:
+            preview = build()
+            self.preview_cache.put(key, preview)
+        return preview
     
     def generate_android_preview(self, source_img: Image.Image, bg_color: str = "#FFFFFF", 
                                 scale: float = 0.8, size: int = 192) -> Image.Image:
         """Genera preview de icono Android"""
+        return self._memoize(
+            source_img, ('android', bg_color, scale, size),
+            lambda: self._render_android_preview(source_img, bg_color, scale, size)
+        )
+    
+    def _render_android_preview(self, source_img: Image.Image, bg_color: str,
+                                scale: float, size: int) -> Image.Image:
         # Crear canvas cuadrado
         canvas = Image.new("RGBA", (size, size), (255, 255, 255, 0))
         
@@ -62,6 +110,13 @@ class IconPreviewGenerator:
     def generate_ios_preview(self, source_img: Image.Image, bg_color: str = "#FFFFFF",
                             scale: float = 0.85, size: int = 180) -> Image.Image:
         """Genera preview de icono iOS"""
+        return self._memoize(
+            source_img, ('ios', bg_color, scale, size),
+            lambda: self._render_ios_preview(source_img, bg_color, scale, size)
+        )
+    
+    def _render_ios_preview(self, source_img: Image.Image, bg_color: str,
+                            scale: float, size: int) -> Image.Image:
         # Crear canvas cuadrado
         canvas = Image.new("RGBA", (size, size), (255, 255, 255, 0))
         
@@ -114,6 +169,13 @@ class IconPreviewGenerator:
     def generate_adaptive_preview(self, source_img: Image.Image, scale: float = 0.75, 
                                   size: int = 192) -> Image.Image:
         """Genera preview de icono adaptativo (foreground)"""
+        return self._memoize(
+            source_img, ('adaptive', scale, size),
+            lambda: self._render_adaptive_preview(source_img, scale, size)
+        )
+    
+    def _render_adaptive_preview(self, source_img: Image.Image, scale: float,
+                                 size: int) -> Image.Image:
         canvas = Image.new("RGBA", (size, size), (255, 255, 255, 0))
         
         # Calcular tamaño del contenido
@@ -146,6 +208,26 @@ class IconPreviewGenerator:
                                    android_scale: float = 0.8, ios_scale: float = 0.85,
                                    width: int = 600) -> Image.Image:
         """Genera una imagen comparativa de Android vs iOS"""
+        return self._memoize(
+            source_img, ('comparison', bg_color, android_scale, ios_scale, width),
+            lambda: self._render_comparison_preview(source_img, bg_color, android_scale, ios_scale, width)
+        )
+    
+    def generate_display_preview(self, source_img: Image.Image, bg_color: str = "#FFFFFF",
+                                 android_scale: float = 0.8, ios_scale: float = 0.85,
+                                 max_width: int = 550) -> Image.Image:
+        """Comparación redimensionada al ancho de la ventana de vista previa"""
+        def build():
+            preview_img = self.generate_comparison_preview(source_img, bg_color, android_scale, ios_scale)
+            ratio = max_width / preview_img.width
+            new_size = (max_width, int(preview_img.height * ratio))
+            return preview_img.resize(new_size, Image.Resampling.LANCZOS)
+        
+        return self._memoize(source_img, ('display', bg_color, android_scale, ios_scale, max_width), build)
+    
+    def _render_comparison_preview(self, source_img: Image.Image, bg_color: str,
+                                   android_scale: float, ios_scale: float,
+                                   width: int) -> Image.Image:
         # Tamaño de cada preview
         preview_size = 180
         padding = 40
@@ -201,7 +283,8 @@ class PreviewWindow:
     """Ventana de preview flotante"""
     
     def __init__(self, parent, source_img: Image.Image, bg_color: str = "#FFFFFF",
-                 android_scale: float = 0.8, ios_scale: float = 0.85):
+                 android_scale: float = 0.8, ios_scale: float = 0.85,
+                 generator: IconPreviewGenerator = None):
         self.window = tk.Toplevel(parent)
         self.window.title("Vista Previa de Iconos")
         self.window.geometry("650x500")
@@ -217,18 +300,13 @@ class PreviewWindow:
             font=('Helvetica', 16, 'bold')
         ).pack(pady=(0, 20))
         
-        # Generar preview
-        generator = IconPreviewGenerator()
-        preview_img = generator.generate_comparison_preview(
+        # Generar preview (redimensionada para mostrar); con el generador de la
+        # aplicación, reabrir la ventana con los mismos ajustes sale de su caché
+        generator = generator or IconPreviewGenerator()
+        preview_img = generator.generate_display_preview(
             source_img, bg_color, android_scale, ios_scale
         )
         
-        # Redimensionar para mostrar
-        max_width = 550
-        ratio = max_width / preview_img.width
-        new_size = (max_width, int(preview_img.height * ratio))
-        preview_img = preview_img.resize(new_size, Image.Resampling.LANCZOS)
-        
         # Convertir a PhotoImage
         self.preview_tk = ImageTk.PhotoImage(preview_img)
         
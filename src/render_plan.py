@@ -0,0 +1,441 @@
+"""
+Plan de render para Flutter Icon Generator
+generate_all compila primero un grafo declarativo (DAG) decodificación → nivel
+de pirámide → render → aplanado → codificación → escritura; el ejecutor lo
+ordena para liberar cada render tras su último uso y el modo de simulación
+estima bytes y tiempo sin tocar el disco
+"""
+
+import io
+import os
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from PIL import Image
+
+from .compositor import composite, flatten_alpha, fit_size
+from .image_pyramid import level_sizes, select_level
+from .source_loader import open_source
+from .svg_source import SvgSource, is_svg
+
+# Lado de la imagen sintética de calibración de costes
+_CALIBRATION_SIDE = 512
+
+# Costes medidos en esta máquina (ns por píxel), calculados una vez por proceso
+_costs: Optional[Dict[str, float]] = None
+
+
+class PlannedFile(NamedTuple):
+    """Una salida del plan"""
+    platform: Optional[str]          # None para el YAML de flutter_launcher_icons
+    kind: str                        # 'png', 'ico', 'json' o 'yaml'
+    path: str
+    index: int                       # Posición dentro de la lista de su plataforma
+    keys: tuple                      # Claves de render de sus capas (vacío en texto)
+    data: Optional[bytes] = None     # Contenido de los archivos de texto
+    encoding: Optional[str] = None   # Codificación con la que se escribe el texto
+
+    @property
+    def size(self) -> Optional[Tuple[int, int]]:
+        """Tamaño del icono (capa mayor en ICO; None en texto)"""
+        if not self.keys:
+            return None
+        return max((key[0] for key in self.keys), key=lambda size: size[0] * size[1])
+
+
+class PlanNode(NamedTuple):
+    """Un nodo del grafo: operación, dependencias y trabajo por tipo de coste"""
+    op: str                               # 'decode', 'pyramid', 'render', 'flatten', 'encode', 'write'
+    deps: Tuple[str, ...]
+    work: Tuple[Tuple[str, int], ...]     # (coste, píxeles) para la estimación de tiempo
+
+
+def base_key(key: tuple) -> tuple:
+    """Clave del render RGBA del que sale un render aplanado"""
+    return key[:3] + (None,)
+
+
+class RenderPlan:
+    """
+    Plan compilado de una ejecución de generate_all
+
+    files y directories salen de la planificación (sin decodificar la imagen
+    ni escribir); el grafo y las estimaciones se calculan solo si se piden.
+    """
+
+    def __init__(
+        self,
+        source_path: str,
+        files: List[PlannedFile],
+        directories: List[str],
+        decode_max_side: Optional[int] = None,
+        use_pyramid: bool = True
+    ):
+        self.source_path = source_path
+        self.files = files
+        self.directories = directories
+        self.decode_max_side = decode_max_side
+        self.use_pyramid = use_pyramid
+        self._nodes: Optional['OrderedDict[str, PlanNode]'] = None
+        self._geometry: Optional[tuple] = None
+
+    @property
+    def jobs(self) -> List[tuple]:
+        """Trabajos de render (kind, claves, ruta) en el orden de planificación"""
+        return [(f.kind, f.keys, f.path) for f in self.files if f.keys]
+
+    @property
+    def texts(self) -> List[PlannedFile]:
+        return [f for f in self.files if not f.keys]
+
+    def source_geometry(self) -> Tuple[Tuple[int, int], Tuple[int, int], bool]:
+        """
+        Tamaño original, tamaño decodificado y si es vectorial, leyendo solo la cabecera
+
+        Replica la reducción entera de load_source (sin el escalado DCT de JPEG).
+        """
+        if self._geometry is None:
+            if is_svg(self.source_path):
+                size = SvgSource.from_file(self.source_path).size
+                self._geometry = (size, size, True)
+            else:
+                img = open_source(self.source_path)
+                size = img.size
+                img.close()
+                decoded = size
+                if self.decode_max_side and max(size) > self.decode_max_side:
+                    factor = max(size) // self.decode_max_side
+                    if factor > 1:
+                        decoded = (math.ceil(size[0] / factor), math.ceil(size[1] / factor))
+                self._geometry = (size, decoded, False)
+        return self._geometry
+
+    @property
+    def nodes(self) -> 'OrderedDict[str, PlanNode]':
+        """Grafo del plan en orden topológico (cada render único aparece una vez)"""
+        if self._nodes is None:
+            self._nodes = self._compile()
+        return self._nodes
+
+    def _compile(self) -> 'OrderedDict[str, PlanNode]':
+        original, decoded, is_vector = self.source_geometry()
+        nodes: 'OrderedDict[str, PlanNode]' = OrderedDict()
+        nodes['decode'] = PlanNode('decode', (), (('decode', _pixels(original)),))
+
+        sizes = level_sizes(decoded) if self.use_pyramid and not is_vector else [decoded]
+
+        def level_node(index: int) -> str:
+            if index == 0:
+                return 'decode'
+            node_id = f'pyramid:{index}'
+            if node_id not in nodes:
+                # La pirámide se construye entera: cada nivel parte del anterior
+                previous = level_node(index - 1)
+                nodes[node_id] = PlanNode('pyramid', (previous,), (('reduce', _pixels(sizes[index - 1])),))
+            return node_id
+
+        def render_node(key: tuple) -> str:
+            base = base_key(key)
+            base_id = f'render:{base}'
+            if base_id not in nodes:
+                canvas, content_max = base[0], base[1]
+                content = fit_size(decoded, content_max, is_vector)
+                if is_vector:
+                    # Rasterizado directo al tamaño del contenido
+                    dep, resize = 'decode', (('resize', _pixels(content)),)
+                else:
+                    index = select_level(sizes, content) if self.use_pyramid else 0
+                    dep, resize = level_node(index), (('resize', _pixels(sizes[index])),)
+                nodes[base_id] = PlanNode('render', (dep,), resize + (('composite', _pixels(canvas)),))
+            if key[3] is None:
+                return base_id
+            flat_id = f'flatten:{key}'
+            if flat_id not in nodes:
+                nodes[flat_id] = PlanNode('flatten', (base_id,), (('flatten', _pixels(key[0])),))
+            return flat_id
+
+        for planned in self.files:
+            if planned.keys:
+                deps = tuple(render_node(key) for key in planned.keys)
+                work = tuple(('encode', _pixels(key[0])) for key in planned.keys
+                             if planned.kind == 'png' or max(key[0]) >= 256)
+                nodes[f'encode:{planned.path}'] = PlanNode('encode', deps, work)
+                nodes[f'write:{planned.path}'] = PlanNode('write', (f'encode:{planned.path}',), ())
+            else:
+                nodes[f'write:{planned.path}'] = PlanNode('write', (), ())
+        return nodes
+
+    @property
+    def unique_renders(self) -> int:
+        """Renders distintos que usan las salidas (cada uno se ejecuta una vez)"""
+        return len({key for f in self.files for key in f.keys})
+
+    @property
+    def intermediate_renders(self) -> int:
+        """Renders RGBA que solo sirven de base a un aplanado"""
+        used = {key for f in self.files for key in f.keys}
+        return len({base_key(key) for key in used} - used)
+
+    @property
+    def layers(self) -> int:
+        """Capas de render pedidas por las salidas (con repeticiones)"""
+        return sum(len(f.keys) for f in self.files)
+
+    def estimate(self, workers: int = 1, costs: Optional[Dict[str, float]] = None) -> dict:
+        """
+        Estima bytes y tiempo del plan
+
+        Los bytes de texto son exactos; los de PNG se extrapolan de la
+        compresión de miniaturas del propio origen. El tiempo usa costes por
+        píxel medidos en esta máquina y no incluye la E/S de disco.
+
+        Returns:
+            {'files', 'renders', 'intermediate', 'layers', 'bytes', 'seconds',
+            'file_bytes': {ruta: bytes}}
+        """
+        sampler = _CompressionSampler(self.source_path, self.source_geometry()[2])
+
+        file_bytes = {}
+        for planned in self.files:
+            if planned.data is not None:
+                file_bytes[planned.path] = len(planned.data)
+            elif planned.kind == 'ico':
+                file_bytes[planned.path] = 6 + sum(16 + _ico_layer_bytes(key, sampler) for key in planned.keys)
+            else:
+                file_bytes[planned.path] = sampler.png_bytes(planned.keys[0])
+
+        if costs is None:
+            # La codificación depende mucho del contenido: se usa la medida con el origen
+            costs = dict(calibrate())
+            if sampler.encode_cost is not None:
+                costs['encode'] = sampler.encode_cost
+
+        parallel = serial = 0.0
+        for node in self.nodes.values():
+            seconds = sum(costs.get(name, 0.0) * pixels for name, pixels in node.work) / 1e9
+            if node.op in ('decode', 'pyramid'):
+                serial += seconds
+            else:
+                parallel += seconds
+
+        return {
+            'files': len(self.files),
+            'renders': self.unique_renders,
+            'intermediate': self.intermediate_renders,
+            'layers': self.layers,
+            'bytes': sum(file_bytes.values()),
+            'seconds': round(serial + parallel / max(1, workers), 3),
+            'file_bytes': file_bytes,
+        }
+
+    def format_report(self, estimate: dict, root: Optional[str] = None) -> str:
+        """Informe de simulación: archivos planificados y totales estimados"""
+        lines = []
+        for planned in self.files:
+            path = os.path.relpath(planned.path, root) if root else planned.path
+            size = f'{planned.size[0]}x{planned.size[1]}' if planned.size else '-'
+            lines.append(
+                f"{path:<64} {planned.kind:<5} {size:>10} {_format_bytes(estimate['file_bytes'][planned.path]):>10}"
+            )
+        reused = estimate['layers'] - estimate['renders']
+        lines.extend([
+            '',
+            f"Archivos planificados: {estimate['files']}",
+            f"Renders únicos:        {estimate['renders']} ({estimate['layers']} capas, {reused} reutilizadas; "
+            f"{estimate['intermediate']} RGBA intermedios)",
+            f"Bytes estimados:       ~{_format_bytes(estimate['bytes'])}",
+            f"Tiempo estimado:       ~{estimate['seconds']:.2f} s (sin E/S de disco)",
+        ])
+        return '\n'.join(lines)
+
+
+def schedule_jobs(jobs: List[tuple]) -> List[tuple]:
+    """
+    Ordena los trabajos para el ejecutor secuencial
+
+    Los PNG que comparten render base quedan seguidos (primero el RGBA y luego
+    sus aplanados) y los ICO al final, así cada render se libera en cuanto
+    termina su último consumidor.
+    """
+    groups: 'OrderedDict[tuple, List[tuple]]' = OrderedDict()
+    icos = []
+    for job in jobs:
+        kind, keys, _ = job
+        if kind == 'ico':
+            icos.append(job)
+        else:
+            groups.setdefault(base_key(keys[0]), []).append(job)
+    ordered = []
+    for group in groups.values():
+        ordered.extend(sorted(group, key=lambda job: job[1][0][3] is not None))
+    return ordered + icos
+
+
+def release_points(jobs: List[tuple]) -> List[List[tuple]]:
+    """Para cada trabajo, las claves de render cuyo último uso es ese trabajo"""
+    last_use = {}
+    for index, (_, keys, _) in enumerate(jobs):
+        for key in keys:
+            last_use[key] = index
+            last_use[base_key(key)] = index
+    releases: List[List[tuple]] = [[] for _ in jobs]
+    for key, index in last_use.items():
+        releases[index].append(key)
+    return releases
+
+
+def calibrate() -> Dict[str, float]:
+    """Mide una vez el coste por píxel (ns) de cada operación del plan en esta máquina"""
+    global _costs
+    if _costs is not None:
+        return _costs
+
+    side = _CALIBRATION_SIDE
+    sample = _calibration_image(side)
+    pixels = side * side
+    encoded = io.BytesIO()
+
+    def best(operation, repeat: int = 3) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            operation()
+            timings.append(time.perf_counter_ns() - start)
+        return min(timings)
+
+    costs = {
+        'encode': best(lambda: (encoded.seek(0), encoded.truncate(), sample.save(encoded, 'PNG'))) / pixels,
+        'reduce': best(lambda: sample.reduce(2)) / pixels,
+        'resize': best(lambda: sample.resize((side // 3, side // 3), Image.Resampling.LANCZOS)) / pixels,
+        'composite': best(lambda: composite(sample, (side, side), (0, 0))) / pixels,
+        'flatten': best(lambda: flatten_alpha(sample, (255, 255, 255))) / pixels,
+    }
+    data = encoded.getvalue()
+    costs['decode'] = best(lambda: Image.open(io.BytesIO(data)).load()) / pixels
+    _costs = costs
+    return costs
+
+
+def _calibration_image(side: int) -> Image.Image:
+    """Imagen RGBA con degradados, ruido y alpha parcial (compresión realista)"""
+    gradient = Image.linear_gradient('L').resize((side, side))
+    noise = Image.effect_noise((side, side), 48)
+    radial = Image.radial_gradient('L').resize((side, side))
+    return Image.merge('RGBA', (gradient, noise, radial, gradient.transpose(Image.Transpose.ROTATE_90)))
+
+
+class _CompressionSampler:
+    """Extrapola los bytes PNG de cada render a partir de miniaturas del origen"""
+
+    SIDES = (64, 256)
+
+    def __init__(self, source_path: str, is_vector: bool):
+        self.source_path = source_path
+        self.is_vector = is_vector
+        self._thumbnail: Optional[Image.Image] = None
+        self._fits: Dict[tuple, Tuple[float, float]] = {}
+        # Tiempo de codificación PNG de las muestras grandes (contenido real)
+        self._encode_ns = 0
+        self._encode_pixels = 0
+
+    @property
+    def encode_cost(self) -> Optional[float]:
+        """ns por píxel de codificación PNG medidos con el propio origen"""
+        return self._encode_ns / self._encode_pixels if self._encode_pixels else None
+
+    def _source_thumbnail(self) -> Image.Image:
+        if self._thumbnail is None:
+            side = max(self.SIDES)
+            if self.is_vector:
+                svg = SvgSource.from_file(self.source_path)
+                thumbnail = svg.render(fit_size(svg.size, (side, side), True))
+            else:
+                img = open_source(self.source_path)
+                img.draft('RGB', (side, side))
+                thumbnail = img.convert('RGBA')
+                thumbnail.thumbnail((side, side), Image.Resampling.LANCZOS)
+            self._thumbnail = thumbnail
+        return self._thumbnail
+
+    def _bytes_per_pixel(self, key: tuple, side: int) -> float:
+        _, content_max, bg_color, flatten = key
+        ratio = content_max[0] / key[0][0] if key[0][0] else 1.0
+        content = self._source_thumbnail().copy()
+        content.thumbnail((max(1, int(side * ratio)),) * 2, Image.Resampling.LANCZOS)
+        position = ((side - content.width) // 2, (side - content.height) // 2)
+        canvas, flat = composite(content, (side, side), position, bg_color, flatten)
+        buffer = io.BytesIO()
+        start = time.perf_counter_ns()
+        (flat if flat is not None else canvas).save(buffer, 'PNG')
+        if side == max(self.SIDES):
+            self._encode_ns += time.perf_counter_ns() - start
+            self._encode_pixels += side * side
+        return len(buffer.getvalue()) / (side * side)
+
+    def png_bytes(self, key: tuple) -> int:
+        """Bytes PNG estimados de un render (ajuste potencial bytes/píxel según el lado)"""
+        # Misma proporción de contenido, fondo y aplanado: misma compresión por píxel
+        fit_key = (round(key[1][0] / key[0][0], 2), key[2], key[3])
+        if fit_key not in self._fits:
+            small, large = self.SIDES
+            bpp_small = self._bytes_per_pixel(key, small)
+            bpp_large = self._bytes_per_pixel(key, large)
+            # Las imágenes grandes comprimen mejor por píxel: exponente <= 0
+            exponent = min(0.0, math.log(bpp_large / bpp_small) / math.log(large / small))
+            self._fits[fit_key] = (bpp_large, exponent)
+        bpp, exponent = self._fits[fit_key]
+        width, height = key[0]
+        side = max(width, height)
+        return int(width * height * bpp * (side / max(self.SIDES)) ** exponent)
+
+
+def _ico_layer_bytes(key: tuple, sampler: _CompressionSampler) -> int:
+    width, height = key[0]
+    if max(width, height) >= 256:
+        return sampler.png_bytes(key)
+    # DIB de 32 bits + máscara AND de 1 bit (filas alineadas a 32 bits)
+    return 40 + width * height * 4 + ((width + 31) // 32) * 4 * height
+
+
+def _pixels(size: Tuple[int, int]) -> int:
+    return size[0] * size[1]
+
+
+def _format_bytes(nbytes: float) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if nbytes < 1024 or unit == 'MB':
+            return f'{nbytes:.0f} {unit}' if unit == 'B' else f'{nbytes:.1f} {unit}'
+        nbytes /= 1024
+    return f'{nbytes:.1f} MB'
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Simulación por línea de comandos: muestra el plan sin tocar el disco"""
+    import argparse
+    from .icon_generator import IconGenerator
+    from .batch import _parse_platforms
+
+    parser = argparse.ArgumentParser(
+        prog='flutter-icon-generator plan',
+        description='Compila el plan de render y estima archivos, renders, bytes y tiempo (sin escribir)'
+    )
+    parser.add_argument('input', help='Imagen origen')
+    parser.add_argument('--output', default='output', help='Carpeta de salida (solo para las rutas)')
+    parser.add_argument('--bg-color', default=None, help='Color de fondo (hex)')
+    parser.add_argument('--android-scale', type=float, default=0.8)
+    parser.add_argument('--ios-scale', type=float, default=0.85)
+    parser.add_argument('--platforms', default=None, help='Plataformas separadas por comas')
+    parser.add_argument('--workers', type=int, default=1, help='Procesos de la ejecución real')
+    args = parser.parse_args(argv)
+
+    plan = IconGenerator(args.output).compile_plan(
+        args.input,
+        bg_color=args.bg_color,
+        android_scale=args.android_scale,
+        ios_scale=args.ios_scale,
+        platforms=_parse_platforms(args.platforms)
+    )
+    print(plan.format_report(plan.estimate(workers=args.workers), root=args.output))
+    return 0
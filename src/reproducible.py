@@ -0,0 +1,180 @@
+"""
+Salida reproducible para Flutter Icon Generator
+PNG sin metadatos con parámetros de codificación fijos y autocomprobación de
+que las mismas entradas producen los mismos bytes (también entre máquinas)
+"""
+
+import io
+import json
+import struct
+import zlib
+from typing import Dict, List, Optional
+
+import PIL
+from PIL import Image, features
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Nivel zlib fijo (el valor por defecto de Pillow, explícito)
+PNG_COMPRESS_LEVEL = 6
+
+# Fragmentos que se conservan: los críticos y tRNS (transparencia de paleta);
+# el resto (tIME, tEXt, pHYs, iCCP, eXIf...) se descarta
+_KEPT_CHUNKS = (b'IHDR', b'PLTE', b'tRNS', b'IDAT', b'IEND')
+
+_CHUNK_HEADER = struct.Struct('>I4s')
+
+
+def encoder_id() -> str:
+    """Identidad del codificador: versiones de Pillow y de su zlib (cambian los bytes)"""
+    return f"Pillow {PIL.__version__}; zlib {features.version('zlib') or zlib.ZLIB_VERSION}"
+
+
+def strip_ancillary_chunks(data: bytes) -> bytes:
+    """
+    Quita de un PNG los fragmentos auxiliares (fechas, texto, dpi, perfiles)
+
+    Los datos de imagen no se recodifican: los fragmentos conservados se
+    copian tal cual, con su CRC.
+    """
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("No es un PNG")
+    parts = [PNG_SIGNATURE]
+    offset = len(PNG_SIGNATURE)
+    while offset < len(data):
+        length, chunk_type = _CHUNK_HEADER.unpack_from(data, offset)
+        end = offset + _CHUNK_HEADER.size + length + 4  # datos + CRC
+        if chunk_type in _KEPT_CHUNKS:
+            parts.append(data[offset:end])
+        offset = end
+        if chunk_type == b'IEND':
+            break
+    return b''.join(parts)
+
+
+def encode_png(image: Image.Image, compress_level: int = PNG_COMPRESS_LEVEL) -> bytes:
+    """PNG con parámetros fijos y sin metadatos (ni los que arrastre image.info)"""
+    buffer = io.BytesIO()
+    image.save(
+        buffer, 'PNG',
+        compress_level=compress_level,
+        compress_type=-1,  # estrategia zlib por defecto
+        optimize=False,
+        icc_profile=None
+    )
+    return strip_ancillary_chunks(buffer.getvalue())
+
+
+def verify_reproducible(
+    input_path: str,
+    options: Optional[dict] = None,
+    runs: int = 2,
+    expected: Optional[Dict[str, str]] = None,
+    **generate_kwargs
+) -> dict:
+    """
+    Autocomprobación de reproducibilidad
+
+    Genera `runs` veces en memoria con reproducible=True, alternando la ruta
+    secuencial y la de 2 procesos, y compara el SHA-256 de cada archivo.
+    Con expected (digests de otra máquina, ver save_digests) compara también
+    contra ellos.
+
+    Args:
+        input_path: Imagen origen
+        options: Argumentos de IconGenerator (quality, png_optimization...)
+        runs: Número de ejecuciones a comparar (al menos 2)
+        expected: {ruta relativa: sha256} de referencia
+        **generate_kwargs: Argumentos de generate_all (bg_color, platforms...)
+
+    Returns:
+        Diccionario con 'ok', 'encoder', 'digests' (de la primera ejecución),
+        'mismatches' (rutas que cambian entre ejecuciones) y 'unexpected'
+        (rutas que difieren de expected, incluidas las que faltan o sobran)
+    """
+    from .icon_generator import IconGenerator
+    from .output_sink import MemorySink
+    from .build_manifest import hash_bytes
+
+    options = dict(options or {}, reproducible=True)
+    digests: List[Dict[str, str]] = []
+    for run in range(max(runs, 2)):
+        sink = MemorySink()
+        workers = 1 if run % 2 == 0 else 2
+        IconGenerator(sink=sink, **dict(options, workers=workers)).generate_all(input_path, **generate_kwargs)
+        digests.append({path: hash_bytes(data) for path, data in sink.files.items()})
+
+    reference = digests[0]
+    mismatches = sorted({
+        path
+        for other in digests[1:]
+        for path in set(reference) | set(other)
+        if reference.get(path) != other.get(path)
+    })
+    unexpected = []
+    if expected is not None:
+        unexpected = sorted(
+            path for path in set(reference) | set(expected)
+            if reference.get(path) != expected.get(path)
+        )
+    return {
+        'ok': not mismatches and not unexpected,
+        'encoder': encoder_id(),
+        'digests': dict(sorted(reference.items())),
+        'mismatches': mismatches,
+        'unexpected': unexpected,
+    }
+
+
+def save_digests(report: dict, path: str):
+    """Guarda los digests de verify_reproducible para comparar en otra máquina"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'encoder': report['encoder'], 'files': report['digests']}, f, indent=2, sort_keys=True)
+
+
+def load_digests(path: str) -> Dict[str, str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['files']
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Autocomprobación por línea de comandos (código 1 si algún archivo difiere)"""
+    import argparse
+    from .batch import _parse_platforms
+
+    parser = argparse.ArgumentParser(
+        prog='flutter-icon-generator verify',
+        description='Genera varias veces en memoria y comprueba que los bytes no cambian'
+    )
+    parser.add_argument('input', help='Imagen origen')
+    parser.add_argument('--bg-color', default=None, help='Color de fondo (hex)')
+    parser.add_argument('--android-scale', type=float, default=0.8)
+    parser.add_argument('--ios-scale', type=float, default=0.85)
+    parser.add_argument('--platforms', default=None, help='Plataformas separadas por comas')
+    parser.add_argument('--quality', default='final', help="Calidad ('final' o 'draft')")
+    parser.add_argument('--runs', type=int, default=2, help='Ejecuciones a comparar')
+    parser.add_argument('--expect', default=None, help='Digests JSON de referencia (otra máquina)')
+    parser.add_argument('--save', default=None, help='Guarda los digests en este JSON')
+    args = parser.parse_args(argv)
+
+    report = verify_reproducible(
+        args.input,
+        options={'quality': args.quality},
+        runs=args.runs,
+        expected=load_digests(args.expect) if args.expect else None,
+        bg_color=args.bg_color,
+        android_scale=args.android_scale,
+        ios_scale=args.ios_scale,
+        platforms=_parse_platforms(args.platforms)
+    )
+    if args.save:
+        save_digests(report, args.save)
+
+    print(f"Codificador: {report['encoder']}")
+    print(f"Archivos: {len(report['digests'])}")
+    for path in report['mismatches']:
+        print(f"  distinto entre ejecuciones: {path}")
+    for path in report['unexpected']:
+        print(f"  distinto de la referencia: {path}")
+    print("Reproducible" if report['ok'] else "NO reproducible")
+    return 0 if report['ok'] else 1
@@ -0,0 +1,549 @@
+"""
+Servidor residente de Flutter Icon Generator
+Atiende peticiones de generación por HTTP local y por socket Unix con workers
+calientes, cachés LRU de imágenes decodificadas y renders, y unión de peticiones
+idénticas simultáneas en un único render
+"""
+
+import os
+import json
+import socket
+import shutil
+import hashlib
+import tempfile
+import argparse
+import threading
+import time
+import zipfile
+import http.client
+import socketserver
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from .icon_generator import IconGenerator
+from .lru_cache import LRUCache, KeyedView
+from .batch import ALL_PLATFORMS, _parse_platforms
+from .output_sink import _STORED_EXTENSIONS
+from .source_cache import source_key
+
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_MB = 256
+# Las carpetas de trabajo por petición sin usar durante este tiempo se borran
+DEFAULT_WORK_TTL = 3600
+
+
+class _WarmGenerator(IconGenerator):
+    """IconGenerator que reutiliza las cachés LRU del worker entre peticiones"""
+
+    def __init__(self, output_dir: str, key: Tuple[str, int, int], **options):
+        super().__init__(output_dir, **options)
+        self._source_key = key
+
+    def _load_source(self, input_path: str):
+        source = _worker_sources.get(self._source_key)
+        if source is None:
+            source = super()._load_source(input_path)
+            _worker_sources.put(self._source_key, source)
+        return source
+
+    def _new_render_cache(self):
+        # Los renders dependen de la imagen origen y de las opciones de render
+        options = tuple(sorted(self._render_options().items()))
+        return KeyedView(_worker_renders, (self._source_key, options))
+
+
+# Estado por proceso worker del servidor (se conserva entre peticiones)
+_worker_sources: Optional[LRUCache] = None
+_worker_renders: Optional[LRUCache] = None
+
+
+def _init_server_worker(cache_bytes: int):
+    """Inicializa un worker: la mitad de la caché para orígenes y la otra para renders"""
+    global _worker_sources, _worker_renders
+    _worker_sources = LRUCache(cache_bytes // 2)
+    _worker_renders = LRUCache(cache_bytes // 2)
+
+
+def _worker_ping() -> int:
+    return os.getpid()
+
+
+def _serve_request(request: dict) -> dict:
+    """Ejecuta una petición de generación en el worker"""
+    generator = _WarmGenerator(
+        request['output_dir'],
+        tuple(request['source_key']),
+        incremental=request['incremental'],
+        png_optimization=request['png_optimization'],
+    )
+    results = generator.generate_all(
+        input_path=request['source'],
+        bg_color=request['bg_color'],
+        android_scale=request['android_scale'],
+        ios_scale=request['ios_scale'],
+        platforms=request['platforms']
+    )
+    return {
+        'output_dir': request['output_dir'],
+        'results': results,
+        'cache': {'sources': _worker_sources.stats(), 'renders': _worker_renders.stats()},
+    }
+
+
+class IconServer:
+    """
+    Servidor de generación de iconos de larga duración
+
+    Cada worker es un proceso propio que se arranca una vez y conserva sus
+    cachés; las peticiones de una misma imagen origen van siempre al mismo
+    worker para aprovecharlas. Dos peticiones idénticas en vuelo a la vez
+    comparten un único render. Sin output_dir, las salidas van a una carpeta
+    del servidor por petición y se regeneran en modo incremental; las que no
+    se usan durante work_ttl segundos se borran.
+    """
+
+    def __init__(
+        self,
+        port: Optional[int] = DEFAULT_PORT,
+        socket_path: Optional[str] = None,
+        workers: int = 2,
+        cache_mb: int = DEFAULT_CACHE_MB,
+        work_dir: Optional[str] = None,
+        work_ttl: float = DEFAULT_WORK_TTL
+    ):
+        """
+        Args:
+            port: Puerto HTTP en 127.0.0.1 (0 = libre; None = sin HTTP)
+            socket_path: Ruta del socket Unix (None = sin socket)
+            workers: Procesos worker calientes
+            cache_mb: Memoria de caché por worker en MB
+            work_dir: Carpeta para las salidas sin output_dir (por defecto, temporal)
+            work_ttl: Segundos sin uso tras los que se borra la carpeta de una petición
+        """
+        if port is None and socket_path is None:
+            raise ValueError("Se necesita un puerto HTTP o un socket Unix")
+        self.workers = max(1, workers)
+        self.cache_bytes = cache_mb * 1024 * 1024
+        self._own_work_dir = work_dir is None
+        self.work_dir = os.path.abspath(work_dir or tempfile.mkdtemp(prefix='icon_server_'))
+        self.work_ttl = work_ttl
+
+        self._executors = [self._new_executor() for _ in range(self.workers)]
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'coalesced': 0, 'errors': 0, 'swept': 0}
+        self._worker_cache: Dict[int, dict] = {}
+
+        self._servers: List[socketserver.BaseServer] = []
+        if port is not None:
+            http_server = ThreadingHTTPServer(('127.0.0.1', port), _Handler)
+            http_server.daemon_threads = True
+            http_server.icon_server = self
+            self._servers.append(http_server)
+        self.socket_path = socket_path
+        if socket_path is not None:
+            if not hasattr(socket, 'AF_UNIX'):
+                raise OSError("Los sockets Unix no están disponibles en esta plataforma")
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            unix_server = _UnixHTTPServer(socket_path, _Handler)
+            unix_server.icon_server = self
+            self._servers.append(unix_server)
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def address(self) -> Optional[str]:
+        """Dirección HTTP real (útil con port=0)"""
+        for server in self._servers:
+            if isinstance(server, ThreadingHTTPServer):
+                host, port = server.server_address[:2]
+                return f'http://{host}:{port}'
+        return None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(
+            max_workers=1,
+            initializer=_init_server_worker,
+            initargs=(self.cache_bytes,)
+        )
+        # Arrancar el proceso ya: la primera petición no paga el arranque
+        executor.submit(_worker_ping)
+        return executor
+
+    def start(self) -> 'IconServer':
+        """Atiende las conexiones en hilos de fondo"""
+        for server in self._servers:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def serve_forever(self):
+        """Atiende hasta Ctrl+C"""
+        self.start()
+        try:
+            for thread in self._threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        """Detiene la escucha, los workers y borra la carpeta de trabajo propia"""
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        for thread in self._threads:
+            thread.join()
+        if self.socket_path is not None and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        for executor in self._executors:
+            executor.shutdown(wait=True)
+        if self._own_work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def __enter__(self) -> 'IconServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def normalize(self, params: dict) -> dict:
+        """
+        Valida una petición y la completa con los valores por defecto
+
+        Raises:
+            ValueError: Si falta la imagen origen o algún parámetro no es válido
+        """
+        if not isinstance(params, dict):
+            raise ValueError("La petición debe ser un objeto JSON")
+        source = params.get('source')
+        if not source:
+            raise ValueError("Falta 'source'")
+        if not os.path.isfile(source):
+            raise ValueError(f"No existe la imagen origen: {source}")
+        platforms = _parse_platforms(params.get('platforms')) or list(ALL_PLATFORMS)
+        request = {
+            'source': os.path.abspath(source),
+            'source_key': list(source_key(source)),
+            'bg_color': params.get('bg_color') or None,
+            'android_scale': float(params.get('android_scale', 0.8)),
+            'ios_scale': float(params.get('ios_scale', 0.85)),
+            'platforms': platforms,
+            'png_optimization': params.get('png_optimization') or None,
+            'incremental': bool(params.get('incremental', False)),
+            'output_dir': params.get('output_dir'),
+        }
+        if request['output_dir']:
+            request['output_dir'] = os.path.abspath(request['output_dir'])
+        else:
+            # Carpeta propia por petición: las repeticiones quedan al día sin reescribir
+            request['output_dir'] = os.path.join(self.work_dir, _fingerprint(request)[:16])
+            request['incremental'] = True
+        return request
+
+    def generate(self, params: dict) -> Tuple[dict, bool]:
+        """
+        Genera (o se une a una generación idéntica en curso)
+
+        Returns:
+            Tupla (respuesta del worker, si se unió a una petición en vuelo)
+        """
+        request = self.normalize(params)
+        key = _fingerprint(request)
+        with self._lock:
+            self._stats['requests'] += 1
+            future = self._inflight.get(key)
+            coalesced = future is not None
+            if coalesced:
+                self._stats['coalesced'] += 1
+            else:
+                future = self._submit(request)
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._forget(key))
+
+        try:
+            response = future.result()
+        except Exception:
+            with self._lock:
+                self._stats['errors'] += 1
+            raise
+        self._sweep_work_dir(request['output_dir'])
+        return response, coalesced
+
+    def _sweep_work_dir(self, used_dir: str):
+        """
+        Marca como usada la carpeta de la petición y borra las caducadas
+
+        Solo se tocan las carpetas por petición de work_dir (nunca un
+        output_dir del cliente) y nunca las de peticiones en vuelo. La fecha
+        de modificación de cada carpeta marca su último uso.
+        """
+        if os.path.dirname(used_dir) == self.work_dir:
+            try:
+                os.utime(used_dir)
+            except OSError:
+                pass
+        limit = time.time() - self.work_ttl
+        with self._lock:
+            busy = {key[:16] for key in self._inflight}
+            try:
+                entries = list(os.scandir(self.work_dir))
+            except OSError:
+                return
+            for entry in entries:
+                try:
+                    expired = entry.is_dir() and entry.stat().st_mtime < limit
+                except OSError:
+                    continue
+                if expired and _is_work_name(entry.name) and entry.name not in busy:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                    self._stats['swept'] += 1
+
+    def _submit(self, request: dict) -> Future:
+        """Envía la petición al worker de su imagen origen (mismo worker, caché caliente)"""
+        slot = hash(request['source']) % self.workers
+        try:
+            future = self._executors[slot].submit(_serve_request, request)
+        except BrokenProcessPool:
+            # El worker murió (p. ej. OOM): se sustituye por uno nuevo
+            self._executors[slot] = self._new_executor()
+            future = self._executors[slot].submit(_serve_request, request)
+        future.add_done_callback(lambda f: self._record_cache(slot, f))
+        return future
+
+    def _forget(self, key: str):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def _record_cache(self, slot: int, future: Future):
+        if not future.cancelled() and future.exception() is None:
+            with self._lock:
+                self._worker_cache[slot] = future.result()['cache']
+
+    def stats(self) -> dict:
+        """Contadores de peticiones y estado de caché de cada worker"""
+        with self._lock:
+            return dict(
+                self._stats,
+                in_flight=len(self._inflight),
+                workers={str(slot): cache for slot, cache in sorted(self._worker_cache.items())}
+            )
+
+
+def _fingerprint(request: dict) -> str:
+    """Huella de una petición normalizada (clave de unión de peticiones)"""
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _is_work_name(name: str) -> bool:
+    """True si el nombre es el de una carpeta por petición (16 hex de la huella)"""
+    return len(name) == 16 and all(c in '0123456789abcdef' for c in name)
+
+
+def result_paths(results: dict) -> List[str]:
+    """Rutas de un diccionario de resultados de generate_all (iconos y YAML)"""
+    paths = []
+    for platform in ALL_PLATFORMS:
+        paths.extend(results.get(platform, []))
+    if results.get('yaml'):
+        paths.append(results['yaml'])
+    return paths
+
+
+def write_zip(fp: BinaryIO, output_dir: str, paths: List[str]):
+    """Escribe las salidas como zip en un flujo (no necesita ser posicionable)"""
+    with zipfile.ZipFile(fp, 'w') as archive:
+        for path in paths:
+            compression = zipfile.ZIP_STORED if path.lower().endswith(_STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+            arcname = os.path.relpath(path, output_dir).replace(os.sep, '/')
+            archive.write(path, arcname, compress_type=compression)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Rutas: GET /health, GET /stats, POST /generate"""
+
+    server_version = 'FlutterIconServer/1.0'
+
+    def address_string(self) -> str:
+        # Las conexiones por socket Unix no tienen dirección remota
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return 'unix'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self._send_json(200, self.server.icon_server.stats())
+        else:
+            self._send_json(404, {'error': f'Ruta desconocida: {self.path}'})
+
+    def do_POST(self):
+        if self.path != '/generate':
+            self._send_json(404, {'error': f'Ruta desconocida: {self.path}'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            params = json.loads(self.rfile.read(length) or b'{}')
+            response, coalesced = self.server.icon_server.generate(params)
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+
+        if params.get('return', 'path') == 'zip':
+            # Sin Content-Length: el zip se transmite y el cierre marca el final
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/zip')
+            self.send_header('Content-Disposition', 'attachment; filename="icons.zip"')
+            self.send_header('X-Coalesced', '1' if coalesced else '0')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            write_zip(self.wfile, response['output_dir'], result_paths(response['results']))
+        else:
+            self._send_json(200, {
+                'output_dir': response['output_dir'],
+                'results': response['results'],
+                'coalesced': coalesced,
+            })
+
+    def _send_json(self, status: int, data: dict):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Mismo protocolo HTTP sobre un socket Unix"""
+        daemon_threads = True
+else:  # Windows
+    _UnixHTTPServer = None
+
+
+class IconServerError(Exception):
+    """Respuesta de error del servidor"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class IconServerClient:
+    """
+    Cliente local del servidor (para scripts y pruebas)
+
+    address: 'http://127.0.0.1:8765' o 'unix:/ruta/al/socket'
+    """
+
+    def __init__(self, address: str = f'http://127.0.0.1:{DEFAULT_PORT}', timeout: float = 300):
+        self.address = address
+        self.timeout = timeout
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self.address.startswith('unix:'):
+            return _UnixHTTPConnection(self.address[len('unix:'):], self.timeout)
+        host_port = self.address.split('://', 1)[-1].rstrip('/')
+        return http.client.HTTPConnection(host_port, timeout=self.timeout)
+
+    def _request(self, method: str, path: str, body: Optional[dict] = None, sink: Optional[BinaryIO] = None):
+        connection = self._connection()
+        try:
+            payload = json.dumps(body).encode('utf-8') if body is not None else None
+            headers = {'Content-Type': 'application/json'} if payload is not None else {}
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            if response.status != 200:
+                raise IconServerError(response.status, json.loads(response.read()).get('error', ''))
+            if sink is None:
+                return json.loads(response.read())
+            while True:
+                chunk = response.read(64 * 1024)
+                if not chunk:
+                    break
+                sink.write(chunk)
+            return {'coalesced': response.getheader('X-Coalesced') == '1'}
+        finally:
+            connection.close()
+
+    def health(self) -> dict:
+        return self._request('GET', '/health')
+
+    def stats(self) -> dict:
+        return self._request('GET', '/stats')
+
+    def generate(self, source: str, output_dir: Optional[str] = None, **params) -> dict:
+        """
+        Genera y devuelve las rutas en el servidor
+
+        Returns:
+            {'output_dir', 'results' (como generate_all), 'coalesced'}
+        """
+        body = dict(params, source=source, output_dir=output_dir, **{'return': 'path'})
+        return self._request('POST', '/generate', body)
+
+    def generate_zip(self, source: str, destination: str, **params) -> dict:
+        """Genera y guarda las salidas como zip en destination"""
+        body = dict(params, source=source, **{'return': 'zip'})
+        with open(destination, 'wb') as f:
+            info = self._request('POST', '/generate', body, sink=f)
+        return dict(info, path=destination)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos del servidor"""
+    parser = argparse.ArgumentParser(
+        prog='flutter-icon-generator serve',
+        description='Servidor residente de generación de iconos (HTTP local y socket Unix)'
+    )
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Puerto HTTP en 127.0.0.1 (-1 = sin HTTP)')
+    parser.add_argument('--socket', default=None, help='Ruta del socket Unix')
+    parser.add_argument('--workers', type=int, default=2, help='Procesos worker calientes')
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_MB, help='Caché por worker en MB')
+    parser.add_argument('--work-dir', default=None, help='Carpeta para salidas sin output_dir')
+    parser.add_argument(
+        '--work-ttl', type=float, default=DEFAULT_WORK_TTL,
+        help='Segundos sin uso tras los que se borran las salidas sin output_dir'
+    )
+    args = parser.parse_args(argv)
+
+    server = IconServer(
+        port=args.port if args.port >= 0 else None,
+        socket_path=args.socket,
+        workers=args.workers,
+        cache_mb=args.cache_mb,
+        work_dir=args.work_dir,
+        work_ttl=args.work_ttl
+    )
+    listening = [address for address in (server.address, args.socket and f'unix:{args.socket}') if address]
+    print(f"Servidor de iconos escuchando en {', '.join(listening)} (Ctrl+C para salir)", flush=True)
+    server.serve_forever()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
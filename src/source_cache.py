@@ -0,0 +1,130 @@
+"""
+Caché de imágenes origen decodificadas para Flutter Icon Generator
+Una sola decodificación por archivo compartida por la vista previa, la ventana
+de comparación y la generación; se recarga cuando el archivo cambia
+"""
+
+import os
+import threading
+from typing import Any, Optional, Tuple
+
+from PIL import Image
+
+from .lru_cache import LRUCache, image_nbytes
+from .image_pyramid import ImagePyramid
+from .source_loader import load_source, DECODE_MAX_SIDE, MAX_SOURCE_PIXELS
+from .svg_source import SvgSource, is_svg
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def source_key(path: str) -> Tuple[str, int, int]:
+    """Identidad de una imagen origen: (ruta absoluta, tamaño, mtime en ns)"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return (path, stat.st_size, stat.st_mtime_ns)
+
+
+def _entry_nbytes(value: Any) -> int:
+    """Bytes de una entrada: imagen, SvgSource o pirámide (sin contar su origen)"""
+    if isinstance(value, ImagePyramid):
+        return sum(image_nbytes(level) for level in value.levels[1:])
+    return image_nbytes(value)
+
+
+class SourceCache:
+    """
+    Caché LRU de orígenes decodificados y de sus derivados
+
+    Las entradas se identifican por source_key (ruta, tamaño y mtime), así que
+    un archivo modificado se vuelve a decodificar; las versiones viejas salen
+    por LRU. Los derivados son la pirámide de niveles x2 del origen (la usa la
+    generación) y los proxies de la vista previa, que son niveles de esa misma
+    pirámide: la vista previa y la generación comparten una sola decodificación.
+
+    Las imágenes devueltas se comparten: no deben modificarse.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._cache = LRUCache(max_bytes, sizeof=_entry_nbytes)
+        # Evita decodificar dos veces el mismo archivo desde hilos distintos
+        self._lock = threading.RLock()
+
+    def source(
+        self,
+        path: str,
+        max_side: Optional[int] = DECODE_MAX_SIDE,
+        max_pixels: int = MAX_SOURCE_PIXELS
+    ):
+        """
+        Origen para generar: RGBA acotado a max_side, o SvgSource si es SVG
+
+        Mismos argumentos y resultado que IconGenerator._load_source.
+        """
+        key = (source_key(path), max_side, max_pixels)
+        with self._lock:
+            source = self._cache.get(key)
+            if source is None:
+                if is_svg(path):
+                    source = SvgSource.from_file(path)
+                else:
+                    source = load_source(path, max_side, max_pixels)
+                self._cache.put(key, source)
+            return source
+
+    def pyramid(self, image: Image.Image) -> ImagePyramid:
+        """Pirámide de un origen devuelto por source() (se construye una vez)"""
+        key = ('pyramid', id(image))
+        with self._lock:
+            pyramid = self._cache.get(key)
+            # El id puede reutilizarse si el origen salió de la caché
+            if pyramid is None or pyramid.source is not image:
+                pyramid = ImagePyramid(image)
+                self._cache.put(key, pyramid)
+            return pyramid
+
+    def image(self, path: str, max_side: int) -> Image.Image:
+        """
+        Proxy RGBA para previsualizar con al menos max_side en su lado mayor
+
+        Es el nivel más pequeño de la pirámide del origen que cumple max_side
+        (un SVG se rasteriza a max_side). info['original_size'] guarda el
+        tamaño del archivo.
+        """
+        if is_svg(path):
+            key = (source_key(path), 'raster', max_side)
+            with self._lock:
+                image = self._cache.get(key)
+                if image is None:
+                    image = load_source(path, max_side)
+                    self._cache.put(key, image)
+                return image
+
+        source = self.source(path)
+        original_size = source.info['original_size']
+        if max(source.size) <= max_side:
+            return source
+        levels = [level for level in self.pyramid(source).levels if max(level.size) >= max_side]
+        proxy = levels[-1]
+        proxy.info['original_size'] = original_size
+        return proxy
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+_shared: Optional[SourceCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_source_cache() -> SourceCache:
+    """Caché de orígenes del proceso (la crea la primera vez)"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SourceCache()
+        return _shared
@@ -0,0 +1,129 @@
+"""
+Carga de imágenes origen con memoria acotada
+Evita materializar en RGBA fuentes enormes (o bombas de descompresión)
+"""
+
+import math
+import warnings
+from PIL import Image
+from typing import Optional
+
+from .svg_source import SvgSource, is_svg
+
+# Lado máximo necesario: icono de 1024px con margen de remuestreo x2 (pirámide)
+DECODE_MAX_SIDE = 2048
+
+# Límite de píxeles por defecto de la imagen origen (~150 MP)
+MAX_SOURCE_PIXELS = 150_000_000
+
+# Modos en los que Image.reduce funciona sin convertir antes
+_REDUCIBLE_MODES = ('L', 'LA', 'RGB', 'RGBA', 'CMYK', 'I', 'F')
+
+# Filas (aprox.) de cada franja al convertir y reducir modos no reducibles
+_STRIP_ROWS = 256
+
+
+class SourceImageTooLargeError(ValueError):
+    """La imagen origen supera el límite de píxeles configurado"""
+
+
+def _too_large(path: str, size, max_pixels: int) -> SourceImageTooLargeError:
+    """Construye el error con las dimensiones y el límite en megapíxeles"""
+    width, height = size
+    return SourceImageTooLargeError(
+        f"La imagen '{path}' ({width}x{height}, {width * height / 1e6:.1f} MP) "
+        f"supera el límite de {max_pixels / 1e6:.1f} MP"
+    )
+
+
+def open_source(path: str, max_pixels: int = MAX_SOURCE_PIXELS) -> Image.Image:
+    """
+    Abre la imagen sin decodificarla y valida su número de píxeles
+
+    Raises:
+        SourceImageTooLargeError: si supera max_pixels (o el límite de Pillow)
+    """
+    with warnings.catch_warnings():
+        # El límite propio sustituye al aviso de bomba de descompresión de Pillow
+        warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+        try:
+            img = Image.open(path)
+        except Image.DecompressionBombError as e:
+            raise SourceImageTooLargeError(f"La imagen '{path}' supera el límite de Pillow: {e}") from e
+
+    if max_pixels and img.width * img.height > max_pixels:
+        img.close()
+        raise _too_large(path, img.size, max_pixels)
+    return img
+
+
+def _reduce_in_strips(img: Image.Image, factor: int) -> Image.Image:
+    """
+    Convierte a RGBA y reduce por factor franja a franja
+
+    Las franjas son múltiplos de factor, así que el resultado es idéntico a
+    convertir toda la imagen y reducirla, pero solo existe el RGBA de una franja.
+    """
+    width, height = img.size
+    reduced = Image.new('RGBA', (math.ceil(width / factor), math.ceil(height / factor)))
+    step = factor * max(1, _STRIP_ROWS // factor)
+    for top in range(0, height, step):
+        strip = img.crop((0, top, width, min(top + step, height))).convert('RGBA')
+        reduced.paste(strip.reduce(factor), (0, top // factor))
+    return reduced
+
+
+def load_source(
+    path: str,
+    max_side: Optional[int] = DECODE_MAX_SIDE,
+    max_pixels: int = MAX_SOURCE_PIXELS
+) -> Image.Image:
+    """
+    Decodifica la imagen origen en RGBA sin pasar por el buffer RGBA completo
+
+    JPEG usa Image.draft (escalado DCT durante la decodificación); el resto de
+    formatos se decodifica en su modo nativo y se reduce por un factor entero
+    antes de convertir a RGBA. Los modos que Image.reduce no admite (paleta,
+    PA, 1, I;16) se convierten y reducen por franjas: de esos PNG sí se
+    decodifica el buffer nativo completo (1 byte por píxel en paleta, 2 en
+    PA/I;16), pero nunca el RGBA completo. El resultado conserva al menos
+    max_side en su lado mayor.
+
+    Los SVG se rasterizan directamente a max_side (o a su tamaño intrínseco).
+
+    Args:
+        path: Ruta a la imagen origen
+        max_side: Lado mayor máximo necesario (None = resolución completa)
+        max_pixels: Límite de píxeles de la imagen original
+
+    Returns:
+        Imagen RGBA; info['original_size'] guarda el tamaño original
+    """
+    if is_svg(path):
+        svg = SvgSource.from_file(path)
+        scale = max_side / max(svg.size) if max_side else 1.0
+        img = svg.render((max(1, round(svg.width * scale)), max(1, round(svg.height * scale))))
+        img.info['original_size'] = svg.size
+        return img
+
+    img = open_source(path, max_pixels)
+    original_size = img.size
+
+    if max_side and max(img.size) > max_side:
+        if img.format == 'JPEG':
+            scale = max_side / max(img.size)
+            img.draft(img.mode, (math.ceil(img.width * scale), math.ceil(img.height * scale)))
+
+        factor = max(img.size) // max_side
+        if factor > 1 and img.mode in _REDUCIBLE_MODES:
+            img = img.reduce(factor)
+        elif factor > 1:
+            img = _reduce_in_strips(img, factor)
+
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    else:
+        img.load()
+
+    img.info['original_size'] = original_size
+    return img
@@ -0,0 +1,107 @@
+"""
+Soporte de fuentes vectoriales (SVG) para Flutter Icon Generator
+Rasteriza directamente a cada tamaño de contenido, sin raster intermedio gigante
+Requiere el paquete opcional cairosvg
+"""
+
+import io
+import re
+import xml.etree.ElementTree as ET
+from PIL import Image
+from typing import Tuple
+
+# Tamaño supuesto cuando el SVG no declara width/height ni viewBox
+DEFAULT_SVG_SIZE = 1024
+
+
+def is_svg(path: str) -> bool:
+    """True si la ruta apunta a un SVG (por extensión)"""
+    return path.lower().endswith(('.svg', '.svgz'))
+
+
+def _parse_length(value: str) -> float:
+    """Convierte una longitud SVG ('512', '512px', '64.5') a número; 0 si no es válida"""
+    if not value or value.strip().endswith('%'):
+        return 0.0
+    match = re.match(r'\s*([0-9.]+)', value)
+    return float(match.group(1)) if match else 0.0
+
+
+class SvgSource:
+    """
+    Imagen origen vectorial
+
+    Expone width/height (tamaño intrínseco) como una imagen de Pillow para que
+    create_centered_image calcule el mismo encaje y centrado; render() rasteriza
+    al tamaño final exacto.
+    """
+
+    mode = 'RGBA'
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.width, self.height = self._intrinsic_size(data)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SvgSource':
+        """Lee un archivo SVG (o SVGZ)"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:2] == b'\x1f\x8b':
+            import gzip
+            data = gzip.decompress(data)
+        return cls(data)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+    def __reduce__(self):
+        return (SvgSource, (self.data,))
+
+    def _intrinsic_size(self, data: bytes) -> Tuple[int, int]:
+        """Tamaño declarado por width/height o, si no, por el viewBox"""
+        try:
+            root = ET.fromstring(data)
+        except ET.ParseError as e:
+            raise ValueError(f"SVG no válido: {e}") from e
+
+        width = _parse_length(root.get('width', ''))
+        height = _parse_length(root.get('height', ''))
+        view_box = root.get('viewBox', '').replace(',', ' ').split()
+
+        if (not width or not height) and len(view_box) == 4:
+            vb_width, vb_height = float(view_box[2]), float(view_box[3])
+            if width and vb_width:
+                height = width * vb_height / vb_width
+            elif height and vb_height:
+                width = height * vb_width / vb_height
+            else:
+                width, height = vb_width, vb_height
+
+        if not width or not height:
+            return (DEFAULT_SVG_SIZE, DEFAULT_SVG_SIZE)
+        return (max(1, round(width)), max(1, round(height)))
+
+    def render(self, size: Tuple[int, int]) -> Image.Image:
+        """
+        Rasteriza el SVG a exactamente size (ancho, alto) en RGBA
+
+        No se memoriza: el origen vive en cachés compartidas acotadas por los
+        bytes del SVG, y los renders repetidos ya los deduplica la caché de
+        renders de cada generación.
+        """
+        try:
+            import cairosvg
+        except ImportError as e:
+            raise ImportError(
+                "Para usar imágenes SVG instala el paquete opcional 'cairosvg' "
+                "(pip install cairosvg)"
+            ) from e
+
+        png_data = cairosvg.svg2png(
+            bytestring=self.data,
+            output_width=size[0],
+            output_height=size[1]
+        )
+        return Image.open(io.BytesIO(png_data)).convert('RGBA')
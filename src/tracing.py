@@ -0,0 +1,133 @@
+"""
+Trazado por etapas para Flutter Icon Generator
+Spans de decodificación, redimensionado, composición, codificación, ICO, JSON/YAML y E/S
+Exporta en formato Chrome trace-event (chrome://tracing, Perfetto) y como tabla resumen
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+# Span vacío reutilizable: es lo único que cuesta el trazado cuando está desactivado
+NO_SPAN = nullcontext()
+
+# Categorías de evento: 'stage' son las etapas medidas, 'phase' las agrupan
+STAGE = 'stage'
+PHASE = 'phase'
+
+
+class Tracer:
+    """Recolector de spans (seguro entre hilos; los workers envían sus eventos)"""
+
+    def __init__(self, origin_ns: Optional[int] = None):
+        # Origen común de tiempos: los workers reciben el del proceso principal
+        self.origin_ns = origin_ns if origin_ns is not None else time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.events: List[dict] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str = STAGE, **args):
+        """Mide el bloque y lo registra como evento completo ('X')"""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': (start - self.origin_ns) / 1000,
+                'dur': (end - start) / 1000,
+                'pid': self.pid,
+                'tid': threading.get_ident(),
+                'args': args,
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def extend(self, events: List[dict]):
+        """Añade eventos recogidos en otro proceso"""
+        with self._lock:
+            self.events.extend(events)
+
+    def drain(self) -> List[dict]:
+        """Devuelve y vacía los eventos (usado por los workers)"""
+        with self._lock:
+            events, self.events = self.events, []
+        return events
+
+    def clear(self):
+        with self._lock:
+            self.events = []
+
+    def to_chrome_trace(self) -> dict:
+        """Documento trace-event con nombres de proceso/hilo legibles"""
+        with self._lock:
+            events = list(self.events)
+
+        metadata = []
+        for pid in sorted({e['pid'] for e in events}):
+            name = 'generador' if pid == self.pid else f'worker {pid}'
+            metadata.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': name}})
+
+        return {'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path: str) -> str:
+        """Guarda la traza en JSON (abrir con chrome://tracing o ui.perfetto.dev)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+    def summary(self, group_by: str = 'name') -> List[dict]:
+        """
+        Totales por etapa (o por otro tag, p. ej. 'platform')
+
+        Returns:
+            Filas {'key', 'count', 'total_ms', 'mean_ms', 'max_ms'} ordenadas por total
+        """
+        with self._lock:
+            events = [e for e in self.events if e['cat'] == STAGE]
+
+        groups: Dict[str, List[float]] = {}
+        for event in events:
+            key = event['name'] if group_by == 'name' else event['args'].get(group_by)
+            groups.setdefault(str(key or '-'), []).append(event['dur'] / 1000)
+
+        rows = [
+            {
+                'key': key,
+                'count': len(durations),
+                'total_ms': round(sum(durations), 3),
+                'mean_ms': round(sum(durations) / len(durations), 3),
+                'max_ms': round(max(durations), 3),
+            }
+            for key, durations in groups.items()
+        ]
+        rows.sort(key=lambda row: row['total_ms'], reverse=True)
+        return rows
+
+    def format_summary(self) -> str:
+        """Tabla de texto por etapa y por plataforma"""
+        lines = []
+        for title, group_by in (('Etapa', 'name'), ('Plataforma', 'platform')):
+            rows = self.summary(group_by)
+            if not rows:
+                continue
+            grand_total = sum(row['total_ms'] for row in rows) or 1.0
+            lines.append(f"{title:<12} {'n':>5} {'total ms':>10} {'media ms':>9} {'máx ms':>9} {'%':>6}")
+            for row in rows:
+                lines.append(
+                    f"{row['key']:<12} {row['count']:>5} {row['total_ms']:>10.1f} "
+                    f"{row['mean_ms']:>9.2f} {row['max_ms']:>9.2f} "
+                    f"{row['total_ms'] / grand_total:>6.1%}"
+                )
+            lines.append('')
+        return '\n'.join(lines).rstrip()
@@ -0,0 +1,78 @@
+"""
+Pipeline de escritura para Flutter Icon Generator
+Codifica y escribe los iconos en un pool de hilos mientras se renderiza el siguiente
+
+El fsync es opcional (IconGenerator(fsync=True)) y está desactivado por
+defecto: las salidas se regeneran desde el origen y cada una se escribe en un
+temporal renombrado encima, así que una caída nunca deja un icono a medias
+junto a uno bueno, solo puede perder los últimos archivos. Activado, el fsync
+corre en estos mismos hilos (replace_file, antes del rename) y se solapa con
+la compresión y el render del siguiente icono.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict
+
+
+class IconWriteError(Exception):
+    """Error al escribir uno o más archivos de salida"""
+
+    def __init__(self, errors: Dict[str, Exception]):
+        self.errors = errors
+        details = "\n".join(f"  {path}: {error}" for path, error in errors.items())
+        super().__init__(f"No se pudieron escribir {len(errors)} archivo(s):\n{details}")
+
+
+class WritePipeline:
+    """
+    Cola acotada de trabajos de codificación/escritura servida por un pool de hilos
+
+    Pillow libera el GIL al comprimir PNG, así que la escritura de un tamaño
+    se solapa con el render del siguiente. submit() se bloquea cuando hay
+    max_pending trabajos en vuelo (backpressure) para acotar la memoria.
+    """
+
+    def __init__(self, threads: int = 2, max_pending: int = None):
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="icon-writer")
+        self._slots = threading.BoundedSemaphore(max_pending or threads * 2)
+        self._futures: Dict[str, Future] = {}
+        self.errors: Dict[str, Exception] = {}
+
+    def submit(self, output_path: str, write_fn: Callable[[], None]):
+        """Encola la escritura de un archivo (bloquea si la cola está llena)"""
+        self._slots.acquire()
+        try:
+            future = self.executor.submit(write_fn)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._on_done(output_path, f))
+        self._futures[output_path] = future
+
+    def _on_done(self, output_path: str, future: Future):
+        """Libera el hueco de la cola y registra el error del archivo si lo hubo"""
+        self._slots.release()
+        error = future.exception()
+        if error is not None:
+            self.errors[output_path] = error
+
+    def wait_for(self, output_path: str) -> bool:
+        """Espera a que termine la escritura de un archivo; True si se escribió bien"""
+        future = self._futures.get(output_path)
+        if future is None:
+            return True
+        return future.exception() is None
+
+    def wait_all(self) -> bool:
+        """Espera a que terminen las escrituras en vuelo; True si había alguna"""
+        pending = [future for future in self._futures.values() if not future.done()]
+        for future in pending:
+            future.exception()
+        return bool(pending)
+
+    def close(self, raise_errors: bool = True):
+        """Espera a todas las escrituras pendientes y lanza IconWriteError si alguna falló"""
+        self.executor.shutdown(wait=True)
+        if raise_errors and self.errors:
+            raise IconWriteError(dict(self.errors))
@@ -0,0 +1,74 @@
+"""
+Comprobaciones del modo batch: una fila no válida del manifiesto no aborta el batch
+Ejecutar con: python -m unittest discover -s tests
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from src.batch import BatchJob, ManifestError, load_manifest, run_batch
+
+
+class ManifestErrorRowsTest(unittest.TestCase):
+    """Manifiesto con filas correctas y defectuosas mezcladas"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        Image.new('RGBA', (64, 64), (200, 30, 30, 255)).save(os.path.join(self.dir, 'logo.png'))
+        self.manifest = os.path.join(self.dir, 'marcas.csv')
+        with open(self.manifest, 'w', encoding='utf-8', newline='') as f:
+            f.write(
+                "source,android_scale,platforms,output_dir\n"
+                "logo.png,0.8,android,out/ok1\n"
+                "logo.png,abc,android,out/bad_scale\n"
+                "logo.png,0.8,symbian,out/bad_platform\n"
+                ",0.8,android,out/no_source\n"
+                "logo.png,0.7,android,out/ok2\n"
+            )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_manifest_yields_errors_in_place(self):
+        rows = list(load_manifest(self.manifest))
+        self.assertEqual(len(rows), 5)
+        errors = [row for row in rows if isinstance(row, ManifestError)]
+        self.assertEqual([error.row for error in errors], [
+            'marcas.csv (línea 3)', 'marcas.csv (línea 4)', 'marcas.csv (línea 5)'
+        ])
+
+    def test_run_batch_reports_bad_rows_and_continues(self):
+        report_path = os.path.join(self.dir, 'report.jsonl')
+        summary = run_batch(load_manifest(self.manifest), report_path, workers=1)
+        self.assertEqual(summary, {'ok': 2, 'error': 3})
+
+        with open(report_path, encoding='utf-8') as f:
+            statuses = [json.loads(line) for line in f]
+        self.assertEqual(len(statuses), 5)
+        self.assertEqual(
+            sorted(s['row'] for s in statuses if s['status'] == 'error'),
+            ['marcas.csv (línea 3)', 'marcas.csv (línea 4)', 'marcas.csv (línea 5)']
+        )
+        self.assertTrue(os.path.exists(os.path.join(self.dir, 'out', 'ok2', 'flutter_launcher_icons.yaml')))
+
+    def test_json_manifest_non_object_entry(self):
+        manifest = os.path.join(self.dir, 'marcas.json')
+        with open(manifest, 'w', encoding='utf-8') as f:
+            json.dump([{'source': 'logo.png', 'output_dir': 'out/j1'}, 'logo.png', {'source': 5}], f)
+        rows = list(load_manifest(manifest))
+        self.assertIsInstance(rows[0], BatchJob)
+        self.assertEqual(
+            [row.row for row in rows if isinstance(row, ManifestError)],
+            ['marcas.json (entrada 2)', 'marcas.json (entrada 3)']
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()